@@ -12,9 +12,13 @@ from rez.resolved_context import ResolvedContext
 from rez.release_hook import create_release_hooks
 from rez.resolver import ResolverStatus
 from rez.config import config
+from rez.utils.filesystem import safe_makedirs
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from contextlib import contextmanager
+from itertools import count
 from enum import Enum
 from shlex import quote
+import multiprocessing
 import getpass
 import os.path
 import sys
@@ -57,6 +61,77 @@ def create_build_process(process_type, working_dir, build_system, package=None,
                quiet=quiet)
 
 
+class VariantVisit(object):
+    """The outcome of a call made by `BuildProcessHelper.visit_variants_parallel`.
+    """
+    def __init__(self, variant, log_filepath):
+        self.variant = variant
+        self.log_filepath = log_filepath
+        self.result = None
+        self.exception = None
+        self.cancelled = False
+
+    @property
+    def success(self):
+        return not (self.cancelled or self.exception)
+
+    def get_log(self):
+        """Get the output of the call."""
+        try:
+            with open(self.log_filepath) as f:
+                return f.read()
+        except (IOError, OSError):
+            return ''
+
+
+# func, variants and kwargs of each call to `visit_variants_parallel`. These
+# are inherited by forked worker processes, and so don't need pickling
+_parallel_visits = {}
+_visit_ids = count()
+
+
+def _set_visit_outcome(visit, future):
+    visit.cancelled = future.cancelled()
+    if visit.cancelled:
+        return
+
+    visit.exception = future.exception()
+    if visit.exception is None:
+        visit.result = future.result()
+
+
+def _visit_variant_in_subprocess(visit_id, index, log_filepath):
+    func, variants, kwargs = _parallel_visits[visit_id]
+
+    with open(log_filepath, 'w', buffering=1) as f:
+        with _redirected_output(f):
+            return func(variants[index], **kwargs)
+
+
+@contextmanager
+def _redirected_output(f):
+    sys.stdout.flush()
+    sys.stderr.flush()
+    stdout, stderr = sys.stdout, sys.stderr
+    saved_fds = [os.dup(1), os.dup(2)]
+
+    # redirect at the file descriptor level also, so that the output of any
+    # child processes is captured
+    os.dup2(f.fileno(), 1)
+    os.dup2(f.fileno(), 2)
+    sys.stdout = sys.stderr = f
+
+    try:
+        yield
+    finally:
+        f.flush()
+        sys.stdout, sys.stderr = stdout, stderr
+        os.dup2(saved_fds[0], 1)
+        os.dup2(saved_fds[1], 2)
+        for fd in saved_fds:
+            os.close(fd)
+
+
 class BuildType(Enum):
     """ Enum to represent the type of build."""
     local = 0
@@ -126,7 +201,8 @@ class BuildProcess(object):
     def working_dir(self):
         return self.build_system.working_dir
 
-    def build(self, install_path=None, clean=False, install=False, variants=None):
+    def build(self, install_path=None, clean=False, install=False, variants=None,
+              parallel_variants=None):
         """Perform the build process.
 
         Iterates over the package's variants, resolves the environment for
@@ -140,6 +216,8 @@ class BuildProcess(object):
                 rebuild over the top of a previous build.
             install (bool): If True, install the build.
             variants (list of int): Indexes of variants to build, all if None.
+            parallel_variants (int): Maximum number of variants to build
+                concurrently. Variants are built one at a time if None.
 
         Raises:
             `BuildError`: If the build failed.
@@ -149,7 +227,8 @@ class BuildProcess(object):
         """
         raise NotImplementedError
 
-    def release(self, release_message=None, variants=None):
+    def release(self, release_message=None, variants=None,
+                parallel_variants=None):
         """Perform the release process.
 
         Iterates over the package's variants, building and installing each into
@@ -158,6 +237,8 @@ class BuildProcess(object):
         Args:
             release_message (str): Message to associate with the release.
             variants (list of int): Indexes of variants to release, all if None.
+            parallel_variants (int): Maximum number of variants to build
+                concurrently. Variants are built one at a time if None.
 
         Raises:
             `ReleaseError`: If the release failed.
@@ -189,6 +270,111 @@ class BuildProcessHelper(BuildProcess):
 
     def visit_variants(self, func, variants=None, **kwargs):
         """Iterate over variants and call a function on each."""
+        results = []
+        num_visited = 0
+
+        for variant in self._iter_variants(variants):
+            # visit the variant
+            result = func(variant, **kwargs)
+            results.append(result)
+            num_visited += 1
+
+        return num_visited, results
+
+    def visit_variants_parallel(self, func, variants=None, max_workers=None,
+                                log_path=None, on_error=None, **kwargs):
+        """Call a function on variants concurrently.
+
+        Each call is made in a forked subprocess, and its output (including
+        that of any processes it runs) is written to a log file for that
+        variant, rather than to stdout. Once a call fails, calls for later
+        variants that have not yet started are cancelled.
+
+        Args:
+            func (callable): Function to call on each variant. Its return
+                value, and any exception it raises, must be picklable.
+            variants (list of int): Indexes of variants to visit, all if None.
+            max_workers (int): Maximum number of concurrent calls.
+            log_path (str): Directory to write log files to, defaults to
+                the build path.
+            on_error (callable): Called with the list of `VariantVisit` if an
+                exception (KeyboardInterrupt, for example) is raised while
+                waiting for the calls, once any running calls have finished.
+                This lets the caller undo the calls that succeeded, before the
+                exception is re-raised.
+
+        Returns:
+            List of `VariantVisit`, in variant order.
+        """
+        # package names cannot contain '-', so this never clashes with a
+        # variant's build subdirectory
+        log_path = log_path or os.path.join(self.build_path, "variant-logs")
+        safe_makedirs(log_path)
+
+        visits = []
+        for variant in self._iter_variants(variants):
+            filename = "%s.log" % (variant.index or 0)
+            log_filepath = os.path.join(log_path, filename)
+            visits.append(VariantVisit(variant, log_filepath))
+
+        if not visits:
+            return visits
+
+        visit_id = next(_visit_ids)
+        _parallel_visits[visit_id] = (func, [x.variant for x in visits], kwargs)
+
+        executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("fork")
+        )
+
+        futures = {}
+        try:
+            for i, visit in enumerate(visits):
+                future = executor.submit(
+                    _visit_variant_in_subprocess, visit_id, i,
+                    visit.log_filepath)
+                futures[future] = i
+
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    visit = visits[futures[future]]
+                    _set_visit_outcome(visit, future)
+                    if visit.exception is None:
+                        continue
+
+                    # cancel later variants that have not started
+                    for future_, i in futures.items():
+                        if i > futures[future]:
+                            future_.cancel()
+
+        except BaseException:
+            # eg KeyboardInterrupt. Running calls are left to finish
+            for future in futures:
+                future.cancel()
+
+            if on_error is not None:
+                executor.shutdown(wait=True)
+
+                for visit in visits:
+                    visit.cancelled = True
+                for future, i in futures.items():
+                    if future.done():
+                        _set_visit_outcome(visits[i], future)
+
+                on_error(visits)
+            raise
+
+        finally:
+            executor.shutdown(wait=True)
+            del _parallel_visits[visit_id]
+
+        return visits
+
+    def _iter_variants(self, variants=None):
         if variants:
             present_variants = range(self.package.num_variants)
             invalid_variants = set(variants) - set(present_variants)
@@ -197,10 +383,6 @@ class BuildProcessHelper(BuildProcess):
                     "The package does not contain the variants: %s"
                     % ", ".join(str(x) for x in sorted(invalid_variants)))
 
-        # iterate over variants
-        results = []
-        num_visited = 0
-
         for variant in self.package.iter_variants():
             if variants and variant.index not in variants:
                 self._print_header(
@@ -208,12 +390,7 @@ class BuildProcessHelper(BuildProcess):
                     % (variant.index, self._n_of_m(variant)))
                 continue
 
-            # visit the variant
-            result = func(variant, **kwargs)
-            results.append(result)
-            num_visited += 1
-
-        return num_visited, results
+            yield variant
 
     def get_package_install_path(self, path):
         """Return the installation path for a package (where its payload goes).
@@ -88,6 +88,12 @@ def run_rez_complete():
 @scriptname("_rez_fwd")
 def run_rez_fwd():
     check_production_install()
+
+    # run suite tools directly from the suite's launch manifest, if there is one
+    if len(sys.argv) > 1:
+        from rez.suite_launch import launch_suite_tool
+        launch_suite_tool(sys.argv[1], sys.argv[2:])
+
     from rez.cli._main import run
     return run("forward")
 
@@ -302,6 +308,20 @@ def run_rez_pkg_ignore():
     return run("pkg-ignore")
 
 
+@scriptname("rez-pkg-index")
+def run_rez_pkg_index():
+    check_production_install()
+    from rez.cli._main import run
+    return run("pkg-index")
+
+
+@scriptname("rez-resolve-server")
+def run_rez_resolve_server():
+    check_production_install()
+    from rez.cli._main import run
+    return run("resolve-server")
+
+
 @scriptname("rez-mv")
 def run_rez_mv():
     check_production_install()
@@ -8,7 +8,8 @@ The main command-line entry point.
 import sys
 import importlib
 from argparse import _StoreTrueAction, SUPPRESS
-from rez.cli._util import subcommands, LazyArgumentParser, _env_var_true
+from rez.cli._util import subcommands, load_plugin_cmds, LazyArgumentParser, \
+    _env_var_true
 from rez.utils.logging_ import print_error
 from rez.exceptions import RezError, RezSystemError, _NeverError
 from rez import __version__, module_root_path
@@ -137,6 +138,17 @@ def run(command=None):
         # like 'rez -i'
         args = sys.argv[1:]
 
+    # command plugins are only loaded if the command is not builtin, or if
+    # they may be listed in help output
+    if command not in subcommands:
+        if command or "-h" in args or "--help" in args \
+                or any(not x.startswith('-') for x in args):
+            load_plugin_cmds()
+
+        if command is None and args and args[0] in subcommands:
+            # like 'rez plugin_cmd arg1 arg2'
+            command = args[0]
+
     # parse args depending on subcommand behaviour
     if command:
         arg_mode = subcommands[command].get("arg_mode")
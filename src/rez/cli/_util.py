@@ -65,6 +65,8 @@ subcommands = {
     "bundle": {},
     "benchmark": {},
     "pkg-ignore": {},
+    "pkg-index": {},
+    "resolve-server": {},
     "mv": {},
     "rm": {}
 }
@@ -118,7 +120,25 @@ def load_plugin_cmd():
     return ext_plugins
 
 
-subcommands.update(load_plugin_cmd())
+_plugin_cmds_loaded = False
+
+
+def load_plugin_cmds():
+    """Add command plugins to `subcommands`.
+
+    This is deferred until needed, because it loads the config and every
+    command plugin, which slows down the startup of builtin commands.
+
+    Returns:
+        dict: `subcommands`, including command plugins.
+    """
+    global _plugin_cmds_loaded
+
+    if not _plugin_cmds_loaded:
+        subcommands.update(load_plugin_cmd())
+        _plugin_cmds_loaded = True
+
+    return subcommands
 
 
 class LazySubParsersAction(_SubParsersAction):
@@ -40,6 +40,11 @@ def setup_parser(parser, completions=False):
         "'mean_delta' is negative, then RESULTS_DIR resolves are faster on "
         "average than those in --out dir"
     )
+    parser.add_argument(
+        "--large-family", type=int, metavar="N",
+        help="Instead of resolving, time version range lookups within a "
+        "synthetic package family of N versions"
+    )
 
 
 def load_packages():
@@ -206,6 +211,17 @@ def do_resolves():
 
     stats.update(get_system_info())
 
+    # peak memory usage of the process (unix only)
+    try:
+        import resource
+    except ImportError:
+        pass
+    else:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        if sys.platform == "darwin":
+            max_rss //= 1024  # bytes on macos, KiB elsewhere
+        stats["max_rss_kb"] = max_rss
+
     if resolve_times:
         resolve_times = sorted(resolve_times)
         median_resolve_time = resolve_times[n_resolve_times // 2]
@@ -258,6 +274,72 @@ def run_benchmark():
     do_resolves()
 
 
+def do_large_family_lookups(num_versions):
+    """Time version range lookups within a large package family.
+
+    This measures `_PackageVariantList.get_intersection` in isolation, for
+    families with many versions (eg 'python').
+    """
+    from rez.package_repository import package_repository_manager
+    from rez.solver import Solver, _PackageVariantList
+    from rez.version import VersionRange
+
+    print("Creating family of %d versions..." % num_versions)
+
+    versions = [
+        "%d.%d.%d" % (i // 400, (i // 20) % 20, i % 20)
+        for i in range(num_versions)
+    ]
+    family_data = dict(
+        (x, {"name": "bench", "version": x})
+        for x in versions
+    )
+    repo_data = {"bench": family_data}
+
+    mem_path = "memory@%s" % hex(id(repo_data))
+    repo = package_repository_manager.get_repository(mem_path)
+    repo.data = repo_data
+
+    solver = Solver([], package_paths=[mem_path])
+
+    t = time.time()
+    variant_list = _PackageVariantList("bench", solver)
+    load_time = time.time() - t
+
+    # a mix of narrow, wide and disjoint ranges, typical of a solve
+    mid = versions[len(versions) // 2]
+    ranges = [
+        VersionRange(x) for x in (
+            "", versions[-1], mid, "%s+" % mid, "<%s" % mid,
+            "%s|%s" % (versions[0], versions[-1]),
+            "%s+<%s" % (versions[len(versions) // 4], mid)
+        )
+    ]
+
+    # first intersection per range expands packages into variants
+    for range_ in ranges:
+        variant_list.get_intersection(range_)
+
+    results = {
+        "num_versions": num_versions,
+        "load_time": load_time
+    }
+
+    for range_ in ranges:
+        secs = 0.0
+        for _ in range(_opts.iterations):
+            t = time.time()
+            entries = variant_list.get_intersection(range_)
+            secs += time.time() - t
+
+        results[str(range_) or "*"] = {
+            "num_entries": len(entries or []),
+            "time": secs / _opts.iterations
+        }
+
+    print(json.dumps(results, indent=2))
+
+
 def print_histogram():
     n_rows = 40
     n_columns = 40
@@ -365,7 +447,9 @@ def command(opts, parser, extra_arg_groups=None):
     out_dir = os.path.abspath(opts.out)
     pkg_repo_dir = os.path.join(out_dir, "packages")
 
-    if opts.histogram:
+    if opts.large_family:
+        do_large_family_lookups(opts.large_family)
+    elif opts.histogram:
         print_histogram()
     elif opts.compare:
         compare()
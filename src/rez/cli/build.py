@@ -65,6 +65,11 @@ def setup_parser_common(parser):
     parser.add_argument(
         "--variants", nargs='+', type=int, metavar="INDEX",
         help="select variants to build (zero-indexed).")
+    parser.add_argument(
+        "--parallel-variants", dest="parallel_variants", type=int, metavar="N",
+        help="build up to N variants concurrently. The output of each variant "
+        "build is written to a log file in the build directory, and printed "
+        "in variant order as each build completes.")
     parser.add_argument(
         "--ba", "--build-args", dest="build_args", metavar="ARGS",
         help="arguments to pass to the build system. Alternatively, list these "
@@ -152,11 +157,17 @@ def command(opts, parser, extra_arg_groups=None):
                                    build_system=buildsys,
                                    verbose=True)
 
+    # only passed if set, for compatibility with custom build processes
+    kwargs = {}
+    if opts.parallel_variants:
+        kwargs["parallel_variants"] = opts.parallel_variants
+
     try:
         builder.build(install_path=opts.prefix,
                       clean=opts.clean,
                       install=opts.install,
-                      variants=opts.variants)
+                      variants=opts.variants,
+                      **kwargs)
     except BuildContextResolveError as e:
         print(str(e), file=sys.stderr)
 
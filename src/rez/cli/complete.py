@@ -16,10 +16,12 @@ def setup_parser(parser, completions=False):
 
 
 def command(opts, parser, extra_arg_groups=None):
-    from rez.cli._util import subcommands
+    from rez.cli._util import load_plugin_cmds
     import os
     import re
 
+    subcommands = load_plugin_cmds()
+
     # get comp info from environment variables
     comp_line = os.getenv("COMP_LINE", "")
     comp_point = os.getenv("COMP_POINT", "")
@@ -19,6 +19,9 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "--source-list", dest="source_list", action="store_true",
         help="list the config files sourced")
+    parser.add_argument(
+        "--load-time", dest="load_time", action="store_true",
+        help="print the time taken to load the config files")
     FIELD_action = parser.add_argument(
         "FIELD", type=str, nargs='?',
         help="print the value of a specific setting")
@@ -43,6 +46,16 @@ def command(opts, parser, extra_arg_groups=None):
             print(filepath)
         return
 
+    if opts.load_time:
+        from rez.config import _config_file_cache as cache
+        _ = config.sourced_filepaths  # noqa; force a config load
+        print("%.2fms" % (config.load_time * 1000))
+
+        if cache.filepath:
+            print("%d files from cache, %d parsed (%s)"
+                  % (cache.hits, cache.misses, cache.filepath))
+        return
+
     data = config.data
     if opts.FIELD:
         keys = opts.FIELD.split('.')
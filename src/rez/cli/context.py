@@ -22,12 +22,11 @@ os.environ.update({
     "REZ_WRITE_PACKAGE_CACHE": "False"
 })
 
-from rez.rex import OutputStyle  # noqa
-
 
 def setup_parser(parser, completions=False):
     from rez.system import system
     from rez.shells import get_shell_types
+    from rez.rex import OutputStyle
 
     formats = get_shell_types() + ['dict', 'table']
     if json is not None:
@@ -113,6 +112,7 @@ def command(opts, parser, extra_arg_groups=None):
     from rez.utils.formatting import columnise, PackageRequest
     from rez.resolved_context import ResolvedContext
     from rez.utils.graph_utils import save_graph, view_graph, prune_graph
+    from rez.rex import OutputStyle
     from pprint import pformat
 
     rxt_file = opts.RXT if opts.RXT else status.context_file
@@ -36,6 +36,15 @@ def setup_parser(parser, completions=False):
         "--follow-symlinks", action="store_true",
         help="follow symlinks when copying package payload, rather than copying "
         "the symlinks themselves.")
+    parser.add_argument(
+        "--threads", type=int, metavar="N",
+        help="number of threads to copy package payload files with (default: "
+        "see 'package_copy_threads' config setting).")
+    parser.add_argument(
+        "--hardlink-duplicates", action="store_true", default=None,
+        help="hardlink payload files that are identical to those of other "
+        "versions of the package in the target repository, rather than "
+        "copying them.")
     parser.add_argument(
         "-k", "--keep-timestamp", action="store_true",
         help="keep timestamp of source package. Note that this is ignored if "
@@ -163,6 +172,9 @@ def command(opts, parser, extra_arg_groups=None):
         follow_symlinks=opts.follow_symlinks,
         keep_timestamp=opts.keep_timestamp,
         force=opts.force,
+        threads=opts.threads,
+        hardlink_duplicates=opts.hardlink_duplicates,
+        show_progress=(not opts.verbose),
         verbose=opts.verbose,
         dry_run=opts.dry_run
     )
@@ -20,6 +20,9 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-p", "--private-build-requires", action="store_true",
         help="Include private build requirements of PKG, if any")
+    parser.add_argument(
+        "--no-index", dest="no_index", action="store_true",
+        help="don't use package repository indexes, load every package instead")
     parser.add_argument(
         "-g", "--graph", action="store_true",
         help="display the dependency tree as an image")
@@ -63,7 +66,8 @@ def command(opts, parser, extra_arg_groups=None):
         depth=opts.depth,
         paths=pkg_paths,
         build_requires=opts.build_requires,
-        private_build_requires=opts.private_build_requires)
+        private_build_requires=opts.private_build_requires,
+        use_index=(not opts.no_index))
 
     if opts.graph or opts.print_graph or opts.write_graph:
         gstr = write_dot(g)
@@ -69,6 +69,20 @@ def setup_parser(parser, completions=False):
         "-i", "--input", type=str, metavar="FILE",
         help="use a previously saved context. Resolve settings, such as PKG, "
         "--ni etc are ignored in this case")
+    batch_action = parser.add_argument(
+        "--batch", type=str, metavar="FILE",
+        help="resolve every request in FILE, rather than PKG, and store the "
+        "contexts into rxt files in --out-dir. FILE lists one request per line "
+        "(such as 'foo-1 bah'). Requests are resolved in a pool of processes")
+    parser.add_argument(
+        "--out-dir", type=str, metavar="DIR",
+        help="directory to store the contexts from --batch into. The Nth "
+        "request in FILE is stored as N.rxt. Note that failed resolves are "
+        "also stored")
+    parser.add_argument(
+        "--workers", type=int, metavar="N",
+        help="number of processes to resolve --batch requests in (default: "
+        "the number of cpus)")
     parser.add_argument(
         "--exclude", type=str, nargs='+', metavar="RULE",
         help="add package exclusion filters, eg '*.beta'. Note that these are "
@@ -90,6 +104,10 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "--patch-rank", type=int, metavar="N", default=0,
         help="patch rank. Ignored if --patch is not present")
+    parser.add_argument(
+        "--incremental", action="store_true",
+        help="resolve incrementally, keeping the current context's resolved "
+        "packages where possible. Ignored if --patch is not present")
     parser.add_argument(
         "--no-cache", dest="no_cache", action="store_true",
         help="do not fetch cached resolves")
@@ -113,6 +131,12 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "--stats", action="store_true",
         help="print advanced solver stats")
+    parser.add_argument(
+        "--profile-solve", metavar="FILE",
+        help="profile the solve, and write a JSON report to FILE. This gives "
+        "time and counts per package family, operation and phase depth. The "
+        "report's 'folded_stacks' entry can be passed to flamegraph tools. "
+        "Cached resolves are not used when profiling")
     parser.add_argument(
         "--no-pkg-cache", action="store_true",
         help="Disable package caching")
@@ -130,6 +154,7 @@ def setup_parser(parser, completions=False):
             ExecutablesCompleter, AndCompleter, SequencedCompleter
         command_action.completer = AndCompleter(ExecutablesCompleter, FilesCompleter())
         input_action.completer = FilesCompleter(dirs=False, file_patterns=["*.rxt"])
+        batch_action.completer = FilesCompleter()
         PKG_action.completer = PackageCompleter
         extra_0_action.completer = SequencedCompleter(
             "extra_0", ExecutablesCompleter, FilesCompleter())
@@ -153,6 +178,7 @@ def command(opts, parser, extra_arg_groups=None):
         command = extra_arg_groups[0] or None
 
     context = None
+    seed_context = None
     request = opts.PKG
     t = get_epoch_time_from_str(opts.time) if opts.time else None
 
@@ -163,6 +189,12 @@ def command(opts, parser, extra_arg_groups=None):
         pkg_paths = opts.paths.split(os.pathsep)
         pkg_paths = [os.path.expanduser(x) for x in pkg_paths if x]
 
+    if opts.batch:
+        if opts.PKG or opts.input or opts.patch:
+            parser.error("Cannot use --batch with PKG(s), --input or --patch.")
+        if not opts.out_dir:
+            parser.error("--out-dir must be provided with --batch.")
+
     if opts.input:
         if opts.PKG and not opts.patch:
             parser.error("Cannot use --input and provide PKG(s), unless patching.")
@@ -181,6 +213,8 @@ def command(opts, parser, extra_arg_groups=None):
         request = context.get_patched_request(request,
                                               strict=opts.strict,
                                               rank=opts.patch_rank)
+        if opts.incremental:
+            seed_context = context
         context = None
 
     if context is None:
@@ -198,6 +232,21 @@ def command(opts, parser, extra_arg_groups=None):
             rule = Rule.parse_rule(rule_str)
             package_filter.add_inclusion(rule)
 
+        if opts.batch:
+            _resolve_batch(
+                opts,
+                timestamp=t,
+                package_paths=pkg_paths,
+                building=opts.build,
+                package_filter=package_filter,
+                add_implicit_packages=(not opts.no_implicit),
+                verbosity=opts.verbose,
+                max_fails=opts.max_fails,
+                time_limit=opts.time_limit,
+                caching=(not opts.no_cache),
+                package_caching=(not opts.no_pkg_cache)
+            )
+
         # perform the resolve
         context = ResolvedContext(
             package_requests=request,
@@ -212,9 +261,17 @@ def command(opts, parser, extra_arg_groups=None):
             caching=(not opts.no_cache),
             suppress_passive=opts.no_passive,
             print_stats=opts.stats,
-            package_caching=(not opts.no_pkg_cache)
+            package_caching=(not opts.no_pkg_cache),
+            seed_context=seed_context,
+            profile_solve=bool(opts.profile_solve)
         )
 
+        if context.solve_profile is not None:
+            import json
+
+            with open(opts.profile_solve, 'w') as f:
+                f.write(json.dumps(context.solve_profile.to_dict(), indent=2))
+
     success = (context.status == ResolverStatus.solved)
 
     if not success:
@@ -260,3 +317,50 @@ def command(opts, parser, extra_arg_groups=None):
         block=True)
 
     sys.exit(returncode)
+
+
+def _resolve_batch(opts, **kwargs):
+    from rez.resolved_context import ResolvedContext, resolve_many
+    import sys
+    import os
+    import os.path
+
+    requests = []
+    with open(opts.batch) as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                requests.append(line.split())
+
+    if not os.path.exists(opts.out_dir):
+        os.makedirs(opts.out_dir)
+
+    num_failed = [0]
+
+    def callback(i, result):
+        request_str = ' '.join(requests[i])
+
+        if isinstance(result, ResolvedContext):
+            filepath = os.path.join(opts.out_dir, "%d.rxt" % (i + 1))
+            result.save(filepath)
+            status = result.status.name
+            if not result.success:
+                num_failed[0] += 1
+        else:
+            filepath = None
+            status = "error: %s" % str(result)
+            num_failed[0] += 1
+
+        msg = "[%d/%d] %s: %s" % (i + 1, len(requests), request_str, status)
+        if filepath:
+            msg += " (%s)" % filepath
+
+        if status == "solved":
+            print(msg)
+        else:
+            print(msg, file=sys.stderr)
+
+    resolve_many(requests, max_workers=opts.workers, callback=callback,
+                 **kwargs)
+
+    sys.exit(1 if num_failed[0] else 0)
@@ -25,6 +25,10 @@ def setup_parser(parser, completions=False):
         "-a", "--add-variants", metavar="URI", nargs='+',
         help="Add variants to the cache"
     )
+    group.add_argument(
+        "--prefetch", metavar="REQUEST", nargs='+',
+        help="Resolve the request, and add all its variants to the cache"
+    )
     group.add_argument(
         "--logs", action="store_true",
         help="View logs"
@@ -33,6 +37,10 @@ def setup_parser(parser, completions=False):
         "-r", "--remove-variants", metavar="URI", nargs='+',
         help="Remove variants from cache"
     )
+    group.add_argument(
+        "--stats", action="store_true",
+        help="Show cache metrics, such as hit rate and amount of data copied"
+    )
     group.add_argument(
         "--clean", action="store_true",
         help="Remove unused variants and other cache files pending deletion"
@@ -49,7 +57,22 @@ def setup_parser(parser, completions=False):
     parser.add_argument(
         "-f", "--force", action="store_true",
         help="Force a package add, even if package is not cachable. Only "
-        "applicable with --add-variants"
+        "applicable with --add-variants and --prefetch"
+    )
+    parser.add_argument(
+        "--since", metavar="TIME",
+        help="Only include metrics since this time, such as '-2d' or an "
+        "epoch time. Only applicable with --stats"
+    )
+    parser.add_argument(
+        "--json", action="store_true",
+        help="Print metrics as JSON. Only applicable with --stats"
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, metavar="N",
+        help="Number of variants to copy at once (default: see "
+        "'package_cache_workers' config setting). Only applicable with "
+        "--prefetch"
     )
     parser.add_argument(
         "DIR", nargs='?',
@@ -80,6 +103,38 @@ def add_variant(pkgcache, uri, opts):
         print_info("Successfully cached to: %s", destpath)
 
 
+def prefetch(pkgcache, request, opts):
+    from rez.resolved_context import ResolvedContext
+    from rez.utils.logging_ import print_info, print_warning
+    from rez.package_cache import PackageCache
+
+    # package caching is disabled so that the context doesn't also start a
+    # caching daemon
+    context = ResolvedContext(request, package_caching=False)
+    if not context.success:
+        context.print_info(buf=sys.stderr)
+        sys.exit(1)
+
+    variants = context.resolved_packages
+    print_info("Prefetching %d variants into package cache at %s:",
+               len(variants), pkgcache.path)
+
+    results = pkgcache.add_variants(variants, force=opts.force,
+                                    workers=opts.workers)
+
+    for variant, destpath, status in results:
+        if status == PackageCache.VARIANT_FOUND:
+            print_info("%s already exists: %s", variant.uri, destpath)
+        elif status == PackageCache.VARIANT_COPYING:
+            print_warning("Another process is currently copying %s to: %s",
+                          variant.uri, destpath)
+        elif status == PackageCache.VARIANT_COPY_STALLED:
+            print_warning("%s is stalled copying to: %s",
+                          variant.uri, destpath)
+        elif status == PackageCache.VARIANT_CREATED:
+            print_info("Successfully cached %s to: %s", variant.uri, destpath)
+
+
 def remove_variant(pkgcache, uri, opts):
     from rez.packages import get_variant_from_uri
     from rez.utils.logging_ import print_info, print_warning, print_error
@@ -102,6 +157,88 @@ def remove_variant(pkgcache, uri, opts):
         print_info("Variant successfully removed")
 
 
+def view_stats(pkgcache, opts):
+    from rez.utils.formatting import columnise, get_epoch_time_from_str, \
+        readable_memory_size
+    import json
+    import time
+
+    since = None
+    if opts.since:
+        try:
+            since = get_epoch_time_from_str(opts.since)
+        except ValueError as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+
+    stats = pkgcache.get_stats(since=since)
+
+    if opts.json:
+        print(json.dumps(stats, indent=2, sort_keys=True))
+        return
+
+    def _rate(counts):
+        if counts["hit_rate"] is None:
+            return '-'
+        return "%.1f%%" % (counts["hit_rate"] * 100)
+
+    def _num_lookups(counts):
+        return sum(counts[x] for x in ("hit", "miss", "copying", "stalled"))
+
+    def _time(t):
+        return time.strftime("%Y-%m-%d %H:%M", time.localtime(t))
+
+    lookups = stats["lookups"]
+    copies = stats["copies"]
+    queue = stats["queue"]
+
+    print("Package cache at %s:\n" % pkgcache.path)
+
+    if stats["start_time"] is None:
+        print("No metrics recorded.")
+    else:
+        print("Metrics from %s to %s\n"
+              % (_time(stats["start_time"]), _time(stats["end_time"])))
+
+    rows = [
+        ("lookups:", "%d (%s hit rate)" % (_num_lookups(lookups), _rate(lookups))),
+        ("hits:", lookups["hit"]),
+        ("misses:", lookups["miss"]),
+        ("copying:", lookups["copying"]),
+        ("stalled:", lookups["stalled"]),
+        ("copies:", copies["count"]),
+        ("copied:", readable_memory_size(copies["bytes"])),
+        ("throughput:", (readable_memory_size(copies["throughput"]) + "/s"
+                         if copies["throughput"] else '-')),
+        ("queued:", "%d (max %d)" % (queue["length"], queue["max_length"]))
+    ]
+
+    for line in columnise(rows):
+        print(line)
+
+    families = stats["families"]
+    if not families:
+        return
+
+    rows = [
+        ("family", "lookups", "hit rate", "copies", "copied"),
+        ("------", "-------", "--------", "------", "------")
+    ]
+
+    for name, counts in sorted(families.items(), key=lambda x: x[0].lower()):
+        rows.append((
+            name,
+            _num_lookups(counts),
+            _rate(counts),
+            counts["copies"],
+            readable_memory_size(counts["bytes"])
+        ))
+
+    print('')
+    for line in columnise(rows):
+        print(line)
+
+
 def view_logs(pkgcache, opts):
     from rez.utils.logging_ import view_file_logs
 
@@ -140,6 +277,9 @@ def command(opts, parser, extra_arg_groups=None):
         for uri in opts.add_variants:
             add_variant(pkgcache, uri, opts)
 
+    elif opts.prefetch:
+        prefetch(pkgcache, opts.prefetch, opts)
+
     elif opts.remove_variants:
         for uri in opts.remove_variants:
             remove_variant(pkgcache, uri, opts)
@@ -150,6 +290,9 @@ def command(opts, parser, extra_arg_groups=None):
     elif opts.logs:
         view_logs(pkgcache, opts)
 
+    elif opts.stats:
+        view_stats(pkgcache, opts)
+
     else:
         tty = sys.stdout.isatty()
 
@@ -0,0 +1,42 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+'''
+Create or update the package index of a filesystem package repository.
+'''
+
+
+def setup_parser(parser, completions=False):
+    parser.add_argument(
+        "-f", "--family", dest="families", action="append", metavar="FAMILY",
+        help="Only update the index entry of the given package family. May be "
+        "used multiple times. If not specified, the whole index is rebuilt.")
+    parser.add_argument(
+        "-r", "--remove", action="store_true",
+        help="Remove the package index.")
+    parser.add_argument(
+        "PATH",
+        help="The repository to index.")
+
+
+def command(opts, parser, extra_arg_groups=None):
+    from rez.package_repository import package_repository_manager
+    import sys
+
+    repo = package_repository_manager.get_repository(opts.PATH)
+
+    if not hasattr(repo, "update_package_index"):
+        print("Package repository %s does not support indexing" % repo,
+              file=sys.stderr)
+        sys.exit(1)
+
+    if opts.remove:
+        if repo.remove_package_index():
+            print("Removed package index from %s" % repo)
+        else:
+            print("No action taken - %s has no package index" % repo)
+        return
+
+    num_families = repo.update_package_index(opts.families)
+    print("Indexed %d package families in %s" % (num_families, repo))
@@ -137,9 +137,15 @@ def command(opts, parser, extra_arg_groups=None):
                 print("Release aborted.")
                 sys.exit(1)
 
-    # perform the release
+    # perform the release. parallel_variants is only passed if set, for
+    # compatibility with custom build processes
+    kwargs = {}
+    if opts.parallel_variants:
+        kwargs["parallel_variants"] = opts.parallel_variants
+
     builder.release(release_message=release_msg or None,
-                    variants=opts.variants)
+                    variants=opts.variants,
+                    **kwargs)
 
     # remove the release message file
     if filepath:
@@ -0,0 +1,36 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+'''
+Run a local resolve server, which keeps package caches warm between resolves.
+'''
+
+
+def setup_parser(parser, completions=False):
+    parser.add_argument(
+        "-s", "--socket", metavar="PATH",
+        help="Path of the unix socket to listen on (default: the "
+        "'resolve_server' config setting)")
+
+
+def command(opts, parser, extra_arg_groups=None):
+    from rez.config import config
+    from rez.resolve_server import ResolveServer
+    import sys
+
+    socket_path = opts.socket or config.resolve_server
+    if not socket_path:
+        parser.error("--socket must be provided if the 'resolve_server' "
+                     "setting is not set.")
+
+    server = ResolveServer(socket_path, verbose=bool(opts.verbose))
+    print("Listening on %s..." % socket_path)
+
+    try:
+        server.serve_forever()
+    except RuntimeError as e:
+        print(str(e), file=sys.stderr)
+        sys.exit(1)
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+Compact binary format for context (.rxt) files.
+
+A compact context file contains the same fields as a json context file (see
+`ResolvedContext.to_dict`), but is serialized with `marshal`, which is much
+faster to read. It also contains a copy of the package definition of each
+resolved variant. Variants loaded from a compact file use this copy instead of
+reading their package definitions from the package repository, so that a
+context can be loaded and interpreted without touching the repository at all.
+Attributes that are not stored in the file (the package's family, for example)
+are still loaded from the repository, when first accessed.
+
+Files start with `magic`, followed by a single byte `format_version`.
+"""
+from rez.packages import get_variant
+from rez.utils.sourcecode import SourceCode
+import marshal
+import copy
+
+
+magic = b"\x00rez-rxt"
+
+# this version should be changed if and when the file format changes
+format_version = 1
+
+_header_size = len(magic) + 1
+
+# key of the dict that a `SourceCode` is encoded as
+_sourcecode_key = "__rez_sourcecode__"
+
+_plain_types = (str, int, float, bool, type(None))
+
+
+def is_compact(header):
+    """Determine if file content is in the compact format.
+
+    Args:
+        header (bytes): Start of the file content. Only the first
+            `len(magic)` bytes are needed.
+
+    Returns:
+        bool.
+    """
+    return header[:len(magic)] == magic
+
+
+def dumps(doc):
+    """Serialize a context.
+
+    Args:
+        doc (dict): Context data, as returned by `ResolvedContext.to_dict`,
+            plus optional 'variant_data' (see `get_variant_data`).
+
+    Returns:
+        bytes: Content of a compact context file.
+    """
+    return magic + bytes([format_version]) + marshal.dumps(doc)
+
+
+def loads(content):
+    """Deserialize a context.
+
+    Args:
+        content (bytes): Content of a compact context file.
+
+    Returns:
+        dict: Context data, as passed to `dumps`.
+    """
+    if not is_compact(content):
+        raise ValueError("Not a compact context file")
+
+    version = content[len(magic)]
+    if version > format_version:
+        raise ValueError(
+            "The context was written by a newer version of Rez (compact "
+            "format version %d > %d)" % (version, format_version))
+
+    return marshal.loads(content[_header_size:])
+
+
+def get_variant_data(variant):
+    """Get the data of a variant, to store in a compact context file.
+
+    Args:
+        variant (`Variant`): Variant to get data for.
+
+    Returns:
+        dict: Encoded package data, or None if the data contains values that
+        cannot be stored in the file. Such variants are loaded from their
+        package repository instead.
+    """
+    try:
+        return _encode(variant.parent.data)
+    except TypeError:
+        return None
+
+
+def get_variant_from_data(variant_handle, data):
+    """Create a variant from data stored in a compact context file.
+
+    The variant's resources are copies of those in the resource pool, so that
+    the stored data does not replace that of packages loaded by other means.
+
+    Args:
+        variant_handle (`ResourceHandle`): Variant handle.
+        data (dict): Encoded package data, as returned by `get_variant_data`.
+
+    Returns:
+        `Variant`: The variant.
+    """
+    variant = get_variant(variant_handle)
+
+    package_resource = copy.copy(variant.resource.parent)
+    package_resource._data = _decode(data)
+
+    resource = copy.copy(variant.resource)
+    try:
+        resource.parent = package_resource
+    except AttributeError:
+        # variant resource does not allow its parent to be replaced
+        return variant
+
+    variant.wrapped = resource
+    return variant
+
+
+def _encode(value):
+    if isinstance(value, _plain_types):
+        return value
+    elif isinstance(value, dict):
+        return dict((k, _encode(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        return [_encode(x) for x in value]
+    elif isinstance(value, tuple):
+        return tuple(_encode(x) for x in value)
+    elif isinstance(value, SourceCode):
+        return {_sourcecode_key: _encode(value.__getstate__())}
+    else:
+        raise TypeError("Cannot encode %r" % value)
+
+
+def _decode(value):
+    if isinstance(value, dict):
+        if _sourcecode_key in value:
+            sourcecode = SourceCode.__new__(SourceCode)
+            sourcecode.__setstate__(value[_sourcecode_key])
+            return sourcecode
+
+        return dict((k, _decode(v)) for k, v in value.items())
+    elif isinstance(value, list):
+        return [_decode(x) for x in value]
+    elif isinstance(value, tuple):
+        return tuple(_decode(x) for x in value)
+    else:
+        return value
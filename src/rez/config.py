@@ -9,19 +9,22 @@ from rez.utils.data_utils import AttrDictWrapper, RO_AttrDictWrapper, \
 from rez.utils.formatting import expandvars, expanduser
 from rez.utils.logging_ import get_debug_printer
 from rez.utils.scope import scoped_format
+from rez.utils.schema import dict_to_schema
 from rez.exceptions import ConfigurationError
 from rez import module_root_path
 from rez.system import system
 from rez.vendor.schema.schema import Schema, SchemaError, And, Or, Use
-from rez.vendor import yaml
-from rez.vendor.yaml.error import YAMLError
 from rez.backport.lru_cache import lru_cache
 import rez.deprecations
 from contextlib import contextmanager
 from inspect import ismodule
 import os
 import re
+import sys
 import copy
+import time
+import types
+import marshal
 
 
 class _Deprecation(object):
@@ -402,7 +405,11 @@ config_schema = Schema({
     "rez_tools_visibility":                         RezToolsVisibility_,
     "create_executable_script_mode":                ExecutableScriptMode_,
     "suite_alias_prefix_char":                      Char,
+    "suite_fast_launch":                            Bool,
     "cache_packages_path":                          OptionalStr,
+    "resolve_cache_path":                           OptionalStr,
+    "resolve_server":                               OptionalStr,
+    "plugin_cache_path":                            OptionalStr,
     "package_definition_python_path":               OptionalStr,
     "tmpdir":                                       OptionalStr,
     "context_tmpdir":                               OptionalStr,
@@ -441,20 +448,29 @@ config_schema = Schema({
     "resource_caching_maxsize":                     Int,
     "max_package_changelog_chars":                  Int,
     "max_package_changelog_revisions":              Int,
+    "package_scan_workers":                         Int,
     "memcached_package_file_min_compress_len":      Int,
     "memcached_context_file_min_compress_len":      Int,
     "memcached_listdir_min_compress_len":           Int,
     "memcached_resolve_min_compress_len":           Int,
+    "resolve_cache_max_size":                       Int,
     "shell_error_truncate_cap":                     Int,
     "package_cache_log_days":                       Int,
+    "package_cache_metrics_days":                   Int,
     "package_cache_max_variant_days":               Int,
     "package_cache_clean_limit":                    Float,
+    "resolve_server_timeout":                       Float,
+    "package_cache_workers":                        Int,
     "allow_unversioned_packages":                   Bool,
     "package_cache_during_build":                   Bool,
     "package_cache_local":                          Bool,
     "package_cache_same_device":                    Bool,
+    "package_cache_content_addressed":              Bool,
     "color_enabled":                                ForceOrBool,
     "resolve_caching":                              Bool,
+    "shared_variant_caching":                       Bool,
+    "compact_context_files":                        Bool,
+    "context_env_caching":                          Bool,
     "cache_package_files":                          Bool,
     "cache_listdir":                                Bool,
     "prune_failed_graph":                           Bool,
@@ -474,6 +490,7 @@ config_schema = Schema({
     "debug_package_exclusions":                     Bool,
     "debug_memcache":                               Bool,
     "debug_resolve_memcache":                       Bool,
+    "debug_resolve_server":                         Bool,
     "debug_context_tracking":                       Bool,
     "debug_all":                                    Bool,
     "debug_none":                                   Bool,
@@ -481,6 +498,8 @@ config_schema = Schema({
     "show_progress":                                Bool,
     "catch_rex_errors":                             Bool,
     "default_relocatable":                          Bool,
+    "package_copy_threads":                         Int,
+    "package_copy_hardlink_duplicates":             Bool,
     "set_prompt":                                   Bool,
     "prefix_prompt":                                Bool,
     # Note that if you want to remove a warn_* or debug_* config, you will
@@ -559,6 +578,7 @@ class Config(object, metaclass=LazyAttributeMeta):
         """
         self.filepaths = filepaths
         self._sourced_filepaths = None
+        self.load_time = None
         self.overrides = overrides or {}
         self.locked = locked
 
@@ -733,7 +753,9 @@ class Config(object, metaclass=LazyAttributeMeta):
 
     @cached_property
     def _data_without_overrides(self):
+        start = time.time()
         data, self._sourced_filepaths = _load_config_from_filepaths(self.filepaths)
+        self.load_time = time.time() - start
         return data
 
     @cached_property
@@ -821,21 +843,12 @@ class _PluginConfigs(object):
             config_data = plugin_manager.get_plugin_config_data(plugin_type)
             d = copy.deepcopy(config_data)
             deep_update(d, data.get(plugin_type, {}))
-
-            # validate
-            schema = plugin_manager.get_plugin_config_schema(plugin_type)
-            try:
-                d = schema.validate(d)
-            except SchemaError as e:
-                raise ConfigurationError(
-                    "Error in Rez configuration under plugins.%s: %s"
-                    % (plugin_type, str(e)))
+            d_ = _PluginTypeConfig(plugin_type, d)
         elif attr in data:
-            d = data[attr]
+            d_ = convert_dicts(data[attr], RO_AttrDictWrapper)
         else:
             raise AttributeError("No such configuration setting: 'plugins.%s'"
                                  % attr)
-        d_ = convert_dicts(d, RO_AttrDictWrapper)
         self.__dict__[attr] = d_
         return d_
 
@@ -886,6 +899,88 @@ class _PluginConfigs(object):
         return "%s(%s)" % (self.__class__.__name__, str(self))
 
 
+class _PluginTypeConfig(RO_AttrDictWrapper):
+    """Lazy config loading for the plugins of one type.
+
+    Settings of the plugin type itself are validated immediately. The settings
+    of each plugin are validated when first accessed, because that requires
+    the plugin's schema, and so loads the plugin.
+    """
+    def __init__(self, plugin_type, data):
+        from rez.plugin_managers import plugin_manager
+        plugin_names = plugin_manager.get_discovered_plugins(plugin_type)
+        pending = set(x for x in plugin_names if x in data)
+
+        type_data = dict((k, v) for k, v in data.items() if k not in pending)
+        schema = dict_to_schema(_plugin_config_dict.get(plugin_type, {}),
+                                required=True, modifier=expand_system_vars)
+        try:
+            type_data = schema.validate(type_data)
+        except SchemaError as e:
+            raise ConfigurationError(
+                "Error in Rez configuration under plugins.%s: %s"
+                % (plugin_type, str(e)))
+
+        d = convert_dicts(type_data, RO_AttrDictWrapper)._data
+        d.update((x, data[x]) for x in pending)
+
+        super(_PluginTypeConfig, self).__init__(d)
+        self.__dict__["_plugin_type"] = plugin_type
+        self.__dict__["_pending"] = pending
+
+    def __getattr__(self, attr):
+        if not (attr.startswith('__') and attr.endswith('__')):
+            self._validate(attr)
+        return super(_PluginTypeConfig, self).__getattr__(attr)
+
+    def __getitem__(self, key):
+        self._validate(key)
+        return self._data[key]
+
+    def __str__(self):
+        self._validate_all()
+        return super(_PluginTypeConfig, self).__str__()
+
+    def __repr__(self):
+        self._validate_all()
+        return super(_PluginTypeConfig, self).__repr__()
+
+    def copy(self):
+        self._validate_all()
+        return RO_AttrDictWrapper(self._data.copy())
+
+    def _validate(self, plugin_name):
+        pending = self.__dict__["_pending"]
+        if plugin_name not in pending:
+            return
+
+        from rez.plugin_managers import plugin_manager
+        plugin_type = self.__dict__["_plugin_type"]
+        schema = plugin_manager.get_plugin_config_schema(plugin_type,
+                                                         plugin_name)
+        value = self._data[plugin_name]
+
+        try:
+            if schema is None:
+                value = expand_system_vars(value)
+            else:
+                value = schema.validate(value)
+        except SchemaError as e:
+            raise ConfigurationError(
+                "Error in Rez configuration under plugins.%s.%s: %s"
+                % (plugin_type, plugin_name, str(e)))
+
+        if isinstance(value, dict):
+            value = convert_dicts(value, RO_AttrDictWrapper)
+
+        self._data[plugin_name] = value
+        pending.remove(plugin_name)
+
+    def _validate_all(self):
+        for plugin_name in list(self.__dict__["_pending"]):
+            self._validate(plugin_name)
+
+
 def expand_system_vars(data):
     """Expands any strings within `data` such as '{system.user}'."""
     def _expanded(value):
@@ -954,13 +1049,12 @@ def _load_config_py(filepath):
     g = reserved.copy()
     result = {}
 
-    with open(filepath) as f:
-        try:
-            code = compile(f.read(), filepath, 'exec')
-            exec(code, g)
-        except Exception as e:
-            raise ConfigurationError("Error loading configuration from %s: %s"
-                                     % (filepath, str(e)))
+    try:
+        code = _config_file_cache.get(filepath, _compile_config_py)
+        exec(code, g)
+    except Exception as e:
+        raise ConfigurationError("Error loading configuration from %s: %s"
+                                 % (filepath, str(e)))
 
     for k, v in g.items():
         if k != '__builtins__' \
@@ -971,20 +1065,154 @@ def _load_config_py(filepath):
     return result
 
 
+def _compile_config_py(filepath):
+    with open(filepath) as f:
+        return compile(f.read(), filepath, 'exec')
+
+
 @lru_cache()
 def _load_config_yaml(filepath):
+    doc = _config_file_cache.get(filepath, _parse_config_yaml)
+
+    if not isinstance(doc, dict):
+        raise ConfigurationError("Error loading configuration from %s: Expected "
+                                 "dict, got %s" % (filepath, type(doc).__name__))
+    return doc
+
+
+def _parse_config_yaml(filepath):
+    from rez.vendor import yaml
+    from rez.vendor.yaml.error import YAMLError
+
     with open(filepath) as f:
         content = f.read()
     try:
-        doc = yaml.load(content, Loader=yaml.FullLoader) or {}
+        return yaml.load(content, Loader=yaml.FullLoader) or {}
     except YAMLError as e:
         raise ConfigurationError("Error loading configuration from %s: %s"
                                  % (filepath, str(e)))
 
-    if not isinstance(doc, dict):
-        raise ConfigurationError("Error loading configuration from %s: Expected "
-                                 "dict, got %s" % (filepath, type(doc).__name__))
-    return doc
+
+class _ConfigFileCache(object):
+    """Cache of parsed config files.
+
+    The cache is a single file, at the path given by $REZ_CONFIG_CACHE_PATH,
+    so that every config file is loaded with a single read. It stores the
+    parsed content of yaml config files, and the compiled code of python
+    config files - python config files are still executed every time, since
+    they may depend on the environment. Entries are keyed on the config
+    file's path, modification time and size.
+
+    The cache is a pickle file, and so must not be writable by other users.
+    """
+
+    # this version should be changed if and when the file format changes
+    cache_version = 1
+
+    # entries for config files no longer in use are kept, up to this limit
+    max_entries = 64
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.hits = 0
+        self.misses = 0
+        self._entries = None
+        self._modified = False
+
+    def get(self, filepath, loader):
+        """Get the parsed content of a config file.
+
+        Args:
+            filepath (str): Config file.
+            loader (callable): Function that parses the file, given its path.
+                Its result must be picklable, or a code object.
+        """
+        if not self.filepath:
+            return loader(filepath)
+
+        st = os.stat(filepath)
+        key = [st.st_mtime_ns, st.st_size]
+        entries = self._get_entries()
+
+        entry = entries.get(filepath)
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            value = entry[1]
+            if isinstance(value, bytes):
+                value = marshal.loads(value)
+            return value
+
+        self.misses += 1
+        value = loader(filepath)
+
+        if isinstance(value, types.CodeType):
+            value_ = marshal.dumps(value)
+        else:
+            value_ = value
+
+        entries.pop(filepath, None)
+        entries[filepath] = (key, value_)
+        self._modified = True
+
+        # discard the oldest entries
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+        return value
+
+    def save(self):
+        """Write new entries to the cache file.
+
+        Errors, such as the cache path being unwritable, are ignored.
+        """
+        if not self._modified:
+            return
+
+        import pickle
+        from rez.utils.filesystem import make_tmp_name
+
+        data = {
+            "version": self.cache_version,
+            "python": sys.version,
+            "entries": self._entries
+        }
+
+        self._modified = False
+        try:
+            content = pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            return  # eg, yaml content that cannot be pickled
+
+        # write to a tmpfile and rename, so readers never see a partially
+        # written file
+        try:
+            with make_tmp_name(self.filepath) as tmp_filepath:
+                with open(tmp_filepath, "wb") as f:
+                    f.write(content)
+                os.replace(tmp_filepath, self.filepath)
+        except (IOError, OSError):
+            pass
+
+    def _get_entries(self):
+        if self._entries is not None:
+            return self._entries
+
+        import pickle
+        self._entries = {}
+
+        try:
+            with open(self.filepath, "rb") as f:
+                data = pickle.load(f)
+        except Exception:
+            return self._entries  # missing or corrupt
+
+        # marshalled code is specific to the python version
+        if isinstance(data, dict) \
+                and data.get("version") == self.cache_version \
+                and data.get("python") == sys.version:
+            self._entries = data.get("entries") or {}
+
+        return self._entries
 
 
 def _load_config_from_filepaths(filepaths):
@@ -1024,6 +1252,7 @@ def _load_config_from_filepaths(filepaths):
             sourced_filepaths.append(filepath_with_ext)
             break
 
+    _config_file_cache.save()
     return data, sourced_filepaths
 
 
@@ -1031,6 +1260,8 @@ def get_module_root_config():
     return os.path.join(module_root_path, "rezconfig.py")
 
 
+_config_file_cache = _ConfigFileCache(os.getenv("REZ_CONFIG_CACHE_PATH"))
+
 # singleton
 config = Config._create_main_config()
 
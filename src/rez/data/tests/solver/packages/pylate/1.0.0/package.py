@@ -0,0 +1,8 @@
+name = "pylate"
+version = "1.0.0"
+
+@late()
+def requires():
+    if in_context() and "nada" in request:
+        return ["python-2.6"]
+    return ["python-2.7"]
@@ -0,0 +1,344 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+Caching of the environment generated by a resolved context.
+
+Interpreting a context executes the commands of every resolved package through
+rex. The environment cache records the rex commands that result, so that a
+later interpretation of the same context can replay them directly instead.
+
+The cache is stored alongside the context's .rxt file. Commands are recorded
+before environment variable expansion, so a replay still applies correctly to
+a different parent environment. However, package commands that query their
+environment or the host (for example via ``getenv``, ``defined`` or an
+``import``) may generate different commands next time, so contexts containing
+such packages are never replayed.
+"""
+from rez import __version__
+from rez.config import config
+from rez.rex import Action, EscapedString
+from rez.system import system
+from rez.utils.sourcecode import SourceCode
+from rez.utils.filesystem import make_tmp_name
+from hashlib import sha1
+import types
+import json
+import dis
+import os
+import os.path
+
+
+# names that, if referenced by package code, indicate that the code depends
+# on state other than the context itself
+_nondeterministic_names = frozenset([
+    "__import__", "open", "eval", "exec", "input", "optionvars",
+
+    # host-specific attributes of the 'system' binding
+    "hostname", "fqdn", "domain", "user", "home", "shell", "num_cpus"
+])
+
+_package_command_attributes = ("pre_commands", "commands", "post_commands")
+
+
+class CachedEnvironment(object):
+    """An entry in a `ContextEnvironmentCache`."""
+    def __init__(self, calls=None, reason=None):
+        """
+        Args:
+            calls (list of tuple): `ActionRecording.calls`, or None if the
+                commands cannot be replayed.
+            reason (str): Why the commands cannot be replayed, if they can't.
+        """
+        self.calls = calls
+        self.reason = reason
+
+    @property
+    def replayable(self):
+        return (self.calls is not None)
+
+
+class ContextEnvironmentCache(object):
+    """Cache of the rex commands generated by interpreting a context.
+
+    Entries are keyed on everything that the commands depend on - the resolve,
+    the package commands themselves, the interpreter and the platform. See
+    `get_key`.
+    """
+
+    # this version should be changed if and when the file format changes
+    cache_version = 1
+
+    # entries for other interpreters, platforms etc are kept, up to this limit
+    max_entries = 16
+
+    def __init__(self, filepath):
+        """Create an environment cache.
+
+        Args:
+            filepath (str): File to store the cache in.
+        """
+        self.filepath = filepath
+
+    @classmethod
+    def for_context(cls, context):
+        """Get the environment cache for a context.
+
+        Args:
+            context (`ResolvedContext`): Context that was loaded from file.
+
+        Returns:
+            `ContextEnvironmentCache`, or None if caching is disabled, or the
+            context was not loaded from file.
+        """
+        if not config.context_env_caching or not context.load_path:
+            return None
+
+        filepath = os.path.splitext(context.load_path)[0] + ".envcache"
+        return cls(filepath)
+
+    @classmethod
+    def get_key(cls, context, interpreter, variant_bindings):
+        """Get the cache key for interpreting a context.
+
+        Args:
+            context (`ResolvedContext`): Context being interpreted.
+            interpreter (`ActionInterpreter`): Interpreter being used.
+            variant_bindings (dict): Variant bindings, keyed by package name.
+
+        Returns:
+            str: Cache key.
+        """
+        interp_cls = interpreter.__class__
+
+        packages = []
+        for pkg in (context.resolved_packages or []):
+            commands = []
+            for attr in _package_command_attributes:
+                value = getattr(pkg, attr)
+                commands.append(value.source if value is not None else None)
+
+            packages.append([
+                pkg.qualified_name,
+                pkg.uri,
+                pkg.base,
+                variant_bindings[pkg.name].root,
+                pkg.is_local,
+                commands
+            ])
+
+        data = [
+            cls.cache_version,
+            __version__,
+            "%s.%s" % (interp_cls.__module__, interp_cls.__name__),
+            [system.platform, system.arch, system.os],
+            [config.rez_1_environment_variables,
+             config.disable_rez_1_compatibility],
+            context.rez_version,
+            context.rez_path,
+            context.timestamp,
+            context.requested_timestamp,
+            context.building,
+            context.package_paths,
+            [str(x) for x in context.requested_packages(include_implicit=False)],
+            [str(x) for x in context.implicit_packages],
+            [str(x) for x in (context.resolved_ephemerals or [])],
+            packages
+        ]
+
+        txt = json.dumps(data, default=str)
+        return sha1(txt.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Get a cache entry.
+
+        Args:
+            key (str): Cache key, see `get_key`.
+
+        Returns:
+            `CachedEnvironment`, or None on a cache miss.
+        """
+        entry = self._read().get(key)
+        if entry is None:
+            return None
+
+        try:
+            if entry.get("calls") is None:
+                return CachedEnvironment(reason=entry.get("reason"))
+
+            calls = [self._decode_call(x) for x in entry["calls"]]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            return None
+
+        return CachedEnvironment(calls=calls)
+
+    def add(self, key, recording, variants):
+        """Add a recording to the cache.
+
+        The recording is stored as not replayable if it made environment
+        queries, or if any of the package code it may have run depends on
+        other state (see `get_nondeterminism`). Errors writing the cache are
+        ignored.
+
+        Args:
+            key (str): Cache key, see `get_key`.
+            recording (`ActionRecording`): Commands generated by the context.
+            variants (list of `Variant`): Resolved variants.
+
+        Returns:
+            `CachedEnvironment`: The added entry.
+        """
+        if recording.replayable:
+            reason = self.get_nondeterminism(variants)
+        else:
+            reason = "package commands query the environment (%s)" \
+                % ", ".join(sorted(set(recording.queries)))
+
+        if reason:
+            entry = CachedEnvironment(reason=reason)
+            data = {"calls": None, "reason": reason}
+        else:
+            entry = CachedEnvironment(calls=recording.calls)
+            data = {"calls": [self._encode_call(x) for x in recording.calls]}
+
+        entries = self._read()
+        entries.pop(key, None)
+        entries[key] = data
+
+        # discard the oldest entries
+        while len(entries) > self.max_entries:
+            del entries[next(iter(entries))]
+
+        try:
+            self._write(entries)
+        except (IOError, OSError):
+            pass  # eg, the context is in a read-only location
+
+        return entry
+
+    @classmethod
+    def get_nondeterminism(cls, variants):
+        """Find package code that depends on state other than the context.
+
+        This checks package commands, and late-bound package attributes (which
+        commands may access via the 'this' or 'resolve' bindings). Code that
+        imports modules, uses @include modules, or references builtins such
+        as 'open' is considered non-deterministic.
+
+        Args:
+            variants (list of `Variant`): Variants to check.
+
+        Returns:
+            str: Description of the first non-deterministic code found, or
+            None if there was none.
+        """
+        for variant in variants:
+            sourcecodes = []
+
+            for attr in _package_command_attributes:
+                value = getattr(variant, attr)
+                if value is not None:
+                    sourcecodes.append((attr, value))
+
+            for attr, value in (variant.data or {}).items():
+                if isinstance(value, SourceCode) and value.late_binding:
+                    sourcecodes.append((attr, value))
+
+            for attr, sourcecode in sourcecodes:
+                reason = cls._get_code_nondeterminism(sourcecode)
+                if reason:
+                    return "%s in package %s %s" \
+                        % (attr, variant.qualified_name, reason)
+
+        return None
+
+    @classmethod
+    def _get_code_nondeterminism(cls, sourcecode):
+        if sourcecode.includes:
+            return "uses @include modules"
+
+        try:
+            code = sourcecode.compiled
+        except Exception:
+            return "does not compile"
+
+        codes = [code]
+        while codes:
+            code = codes.pop()
+
+            for instr in dis.get_instructions(code):
+                if instr.opname == "IMPORT_NAME":
+                    return "imports %r" % instr.argval
+
+            names = _nondeterministic_names.intersection(code.co_names)
+            if names:
+                return "references %r" % sorted(names)[0]
+
+            codes.extend(
+                x for x in code.co_consts if isinstance(x, types.CodeType))
+
+        return None
+
+    @classmethod
+    def _encode_call(cls, call):
+        name, args = call
+
+        def _encode(value):
+            if isinstance(value, EscapedString):
+                return {"escaped": value.strings}
+            return value
+
+        return [name, [_encode(x) for x in args]]
+
+    @classmethod
+    def _decode_call(cls, data):
+        name, args = data
+
+        # don't trust the file to name arbitrary methods
+        if name not in _command_names:
+            raise ValueError("Unknown rex command: %r" % name)
+
+        def _decode(value):
+            if isinstance(value, dict):
+                value_ = EscapedString('')
+                value_.strings = [
+                    (bool(is_literal), str(s))
+                    for is_literal, s in value["escaped"]
+                ]
+                return value_
+            return value
+
+        return (name, tuple(_decode(x) for x in args))
+
+    def _read(self):
+        try:
+            with open(self.filepath) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+
+        if not isinstance(data, dict) \
+                or data.get("version") != self.cache_version:
+            return {}
+
+        return data.get("entries") or {}
+
+    def _write(self, entries):
+        data = {
+            "version": self.cache_version,
+            "entries": entries
+        }
+
+        # write to a tmpfile and rename, so readers never see a partially
+        # written file
+        with make_tmp_name(self.filepath) as tmp_filepath:
+            with open(tmp_filepath, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_filepath, self.filepath)
+
+
+_command_names = frozenset(
+    name for name, _ in Action.get_command_types()
+    if name != "stop"
+)
@@ -16,6 +16,7 @@ import time
 import logging
 import random
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 from rez.config import config
@@ -47,6 +48,10 @@ class PackageCache(object):
     A package cache is **not** a package repository. It just stores copies of
     variant payloads - no package definitions are stored.
 
+    If :data:`package_cache_content_addressed` is enabled, payload files are
+    instead stored once each by content hash (in '/<cache_dir>/.sys/blobs'),
+    and hardlinked into the cached variants that contain them.
+
     Payloads are stored into the following structure::
 
         /<cache_dir>/foo/1.0.0/af8d/a/<payload>
@@ -72,6 +77,7 @@ class PackageCache(object):
     _FILELOCK_TIMEOUT = 10
     _COPYING_TIME_INC = 0.2
     _COPYING_TIME_MAX = 5.0
+    _BLOB_TMP_TIME_MAX = 3600.0
 
     def __init__(self, path):
         """Create a package cache.
@@ -89,6 +95,8 @@ class PackageCache(object):
         safe_makedirs(self._pending_dir)
         safe_makedirs(self._remove_dir)
 
+        self.metrics = PackageCacheMetrics(self._metrics_dir)
+
     def get_cached_root(self, variant):
         """Get location of variant payload copy.
 
@@ -99,6 +107,8 @@ class PackageCache(object):
             str: Cached variant root path, or None if not found.
         """
         status, rootpath = self._get_cached_root(variant)
+        self.metrics.record_lookup(variant, status)
+
         if status != self.VARIANT_FOUND:
             return None
 
@@ -289,15 +299,34 @@ class PackageCache(object):
         th.daemon = True
         th.start()
 
+        if config.package_cache_content_addressed:
+            safe_makedirs(self._blobs_dir)
+            copy_file = self._copy_file_to_blob
+        else:
+            copy_file = shutil.copy2
+
+        num_bytes = [0]
+
+        def _copy_function(src, dest):
+            copy_file(src, dest)
+            num_bytes[0] += os.path.getsize(dest)
+            return dest
+
+        t = time.time()
+
         try:
-            shutil.copytree(variant_root, rootpath)
+            shutil.copytree(variant_root, rootpath,
+                            copy_function=_copy_function)
         finally:
             still_copying = False
+            secs = time.time() - t
 
         # 7.
         th.join()
         os.remove(copying_filepath)
 
+        self.metrics.record_copy(variant, num_bytes[0], secs)
+
         return (rootpath, self.VARIANT_CREATED)
 
     def remove_variant(self, variant):
@@ -366,6 +395,42 @@ class PackageCache(object):
 
         return self.VARIANT_REMOVED
 
+    def add_variants(self, variants, force=False, workers=None):
+        """Copy the payloads of several variants into the cache, in parallel.
+
+        Unlike `add_variants_async`, this returns once all the variants are
+        cached. Variants that cannot be cached (see `add_variant`) are skipped,
+        with a warning.
+
+        Args:
+            variants (list of `Variant`): Variants to copy into this cache.
+            force (bool): See `add_variant`.
+            workers (int): Number of variants to copy at once. Defaults to
+                :data:`package_cache_workers`.
+
+        Returns:
+            list of 3-tuple: For each variant:
+
+            - `Variant`: The variant
+            - str: Path to cached payload ('' if not cached)
+            - int: One of VARIANT_FOUND, VARIANT_CREATED, VARIANT_COPYING,
+              VARIANT_COPY_STALLED, or VARIANT_NOT_FOUND if not cached
+        """
+        if workers is None:
+            workers = config.package_cache_workers
+
+        def _add_variant(variant):
+            try:
+                rootpath, status = self.add_variant(variant, force=force)
+            except PackageCacheError as e:
+                print_warning(str(e))
+                return (variant, '', self.VARIANT_NOT_FOUND)
+
+            return (variant, rootpath, status)
+
+        with ThreadPoolExecutor(max(1, workers)) as executor:
+            return list(executor.map(_add_variant, variants))
+
     def add_variants_async(self, variants):
         """Update the package cache by adding some or all of the given variants.
 
@@ -543,6 +608,20 @@ class PackageCache(object):
 
         return results
 
+    def get_stats(self, since=None):
+        """Get usage metrics of the cache.
+
+        Args:
+            since (float): Only include metrics recorded since this epoch time.
+
+        Returns:
+            dict: See `PackageCacheMetrics.get_stats`. The current number of
+            variants pending caching is also included, as 'queue.length'.
+        """
+        stats = self.metrics.get_stats(since=since)
+        stats["queue"]["length"] = len(safe_listdir(self._pending_dir))
+        return stats
+
     def run_daemon(self):
         """Run as daemon and copy pending variants.
 
@@ -566,17 +645,27 @@ class PackageCache(object):
 
         logger = self._init_logging()
 
-        # somewhere for the daemon to store stateful info
+        # somewhere for the daemon to store stateful info, shared by workers
         state = {
-            "logger": logger
+            "logger": logger,
+            "lock": threading.Lock(),
+            "claimed": set()
         }
 
-        # copy variants into cache
+        def _run_worker():
+            while self._run_daemon_step(state):
+                pass
+
+        self.metrics.record_queue(len(safe_listdir(self._pending_dir)))
+
+        # copy variants into cache, several at a time
+        workers = max(1, config.package_cache_workers)
+
         try:
-            while True:
-                keep_running = self._run_daemon_step(state)
-                if not keep_running:
-                    break
+            with ThreadPoolExecutor(workers) as executor:
+                futures = [executor.submit(_run_worker) for _ in range(workers)]
+                for future in futures:
+                    future.result()
         except Exception:
             logger.exception("An error occurred while adding variants to the cache")
             raise
@@ -598,6 +687,8 @@ class PackageCache(object):
         - Variants that have not been used in more than 'config.package_cache_max_variant_days' days;
         - Variants that have stalled;
         - Variants that are already pending deletion (remove_variant() was used).
+        - Content-addressed blobs that are no longer part of any cached variant.
+        - Metrics older than 'config.package_cache_metrics_days' days.
 
         Args:
             time_limit (float): Perform cleaning operations only up until this
@@ -616,6 +707,8 @@ class PackageCache(object):
                 and (time.time() - now) > time_limit
             )
 
+        self.metrics.clean()
+
         # find variants to delete
         for variant, rootpath, status in self.get_variants():
             if status == self.VARIANT_FOUND:
@@ -674,6 +767,9 @@ class PackageCache(object):
             if should_exit():
                 return
 
+        # delete blobs that are no longer hardlinked into any variant
+        self._clean_blobs(logger, should_exit)
+
     @contextmanager
     def _lock(self):
         lock_filepath = os.path.join(self._sys_dir, ".lock")
@@ -688,17 +784,102 @@ class PackageCache(object):
             except NotLocked:
                 pass
 
+    def _copy_file_to_blob(self, src, dest):
+        # Copy a file into the blob store, then hardlink it into a variant.
+        # The file is hashed as it's copied, so the source is only read once.
+        #
+        tmp_filepath = os.path.join(self._blobs_dir, ".tmp-" + uuid4().hex)
+        h = sha1()
+
+        try:
+            with open(src, "rb") as fsrc, open(tmp_filepath, "wb") as fdest:
+                for chunk in iter(lambda: fsrc.read(1 << 20), b''):
+                    h.update(chunk)
+                    fdest.write(chunk)
+
+            shutil.copystat(src, tmp_filepath)
+
+            # hardlinks share their mode, so it's part of the blob's identity
+            mode = stat.S_IMODE(os.stat(tmp_filepath).st_mode)
+            blob_filepath = self._get_blob_path(h.hexdigest(), mode)
+
+            try:
+                os.link(blob_filepath, dest)
+            except OSError:
+                # The blob does not exist (it may also have just been removed
+                # by a clean), or has reached the filesystem's link limit. Our
+                # copy becomes the blob. Note that the variant links to the
+                # copy first, so that a concurrent clean never sees it unused.
+                #
+                os.link(tmp_filepath, dest)
+                safe_makedirs(os.path.dirname(blob_filepath))
+                os.replace(tmp_filepath, blob_filepath)
+        finally:
+            safe_remove(tmp_filepath)
+
+        return dest
+
+    def _clean_blobs(self, logger, should_exit):
+        now = time.time()
+        num_deleted = 0
+
+        for name in safe_listdir(self._blobs_dir):
+            path = os.path.join(self._blobs_dir, name)
+
+            if name.startswith(".tmp-"):
+                # left behind by an interrupted copy
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+
+                # Note that the mtime of an in-flight copy is that of its
+                # source (see `_copy_file_to_blob`), so the ctime is used
+                if (now - st.st_ctime) > self._BLOB_TMP_TIME_MAX:
+                    safe_remove(path)
+                continue
+
+            for blob_name in safe_listdir(path):
+                blob_filepath = os.path.join(path, blob_name)
+
+                try:
+                    st = os.stat(blob_filepath)
+                except OSError:
+                    continue
+
+                # the only remaining link is the blob itself
+                if st.st_nlink == 1:
+                    try:
+                        safe_remove(blob_filepath)
+                    except Exception as e:
+                        logger.warning("Could not delete %s: %s",
+                                       blob_filepath, e)
+                        continue
+
+                    num_deleted += 1
+
+            if should_exit():
+                break
+
+        if num_deleted:
+            logger.info("Deleted %d unused blobs", num_deleted)
+
     def _run_daemon_step(self, state):
         logger = state["logger"]
 
-        # pick a random pending variant to copy
-        pending_filenames = set(os.listdir(self._pending_dir))
-        pending_filenames -= set(state.get("copying", set()))
-        if not pending_filenames:
-            return False
+        # Pick a random pending variant to copy, that another worker has not
+        # already claimed. Pending files are never claimed twice - either they
+        # are removed once done, or they are ignored from then on.
+        #
+        with state["lock"]:
+            pending_filenames = set(os.listdir(self._pending_dir))
+            pending_filenames -= state["claimed"]
+            if not pending_filenames:
+                return False
+
+            filename = random.choice(sorted(pending_filenames))
+            state["claimed"].add(filename)
 
-        i = random.randint(0, len(pending_filenames) - 1)
-        filename = list(pending_filenames)[i]
         filepath = os.path.join(self._pending_dir, filename)
 
         try:
@@ -737,21 +918,23 @@ class PackageCache(object):
         secs = time.time() - t
 
         if status == self.VARIANT_FOUND:
-            logger.info("Variant was already cached at %s", rootpath)
+            logger.info("Variant %s was already cached at %s",
+                        variant.uri, rootpath)
         elif status == self.VARIANT_COPYING:
-            logger.info("Variant is already being copied to %s", rootpath)
+            logger.info("Variant %s is already being copied to %s",
+                        variant.uri, rootpath)
         elif status == self.VARIANT_COPY_STALLED:
-            logger.info("Variant is stalled copying to %s", rootpath)
+            logger.info("Variant %s is stalled copying to %s",
+                        variant.uri, rootpath)
         else:  # VARIANT_CREATED
-            logger.info("Cached variant to %s in %g seconds", rootpath, secs)
+            logger.info("Cached variant %s to %s in %g seconds",
+                        variant.uri, rootpath, secs)
 
-        if status == self.VARIANT_COPYING:
-            # we cannot delete the pending file (another proc is copying the
-            # variant, so it's responsible); but we also have to ignore this
-            # variant from now on.
-            #
-            state.setdefault("copying", set()).add(filename)
-        else:
+        # If another proc is copying the variant, we cannot delete the pending
+        # file (that proc is responsible for it). It stays claimed, so this
+        # variant is ignored from now on.
+        #
+        if status != self.VARIANT_COPYING:
             safe_remove(filepath)
 
         return True
@@ -809,6 +992,18 @@ class PackageCache(object):
     def _remove_dir(self):
         return os.path.join(self.path, ".sys", "to_delete")
 
+    @property
+    def _metrics_dir(self):
+        return os.path.join(self.path, ".sys", "metrics")
+
+    @property
+    def _blobs_dir(self):
+        return os.path.join(self.path, ".sys", "blobs")
+
+    def _get_blob_path(self, digest, mode):
+        return os.path.join(self._blobs_dir, digest[:2],
+                            "%s-%o" % (digest, mode))
+
     def _get_cached_root(self, variant):
         path = self._get_hash_path(variant)
         if not os.path.exists(path):
@@ -863,3 +1058,232 @@ class PackageCache(object):
         dirs.append(hash_dirname)
 
         return os.path.join(*dirs)
+
+
+class PackageCacheMetrics(object):
+    """Usage metrics of a package cache.
+
+    Metrics are appended as lines of JSON to a file per day, so that any
+    number of processes can record them at once without locking. Lookups are
+    counted in memory, and only written when `flush` is called, since a
+    lookup is done for every variant in a context.
+
+    Metrics are not recorded if :data:`package_cache_metrics_days` is zero.
+    Errors writing metrics are ignored.
+    """
+
+    # lookup result for each variant status
+    lookup_results = {
+        PackageCache.VARIANT_FOUND: "hit",
+        PackageCache.VARIANT_NOT_FOUND: "miss",
+        PackageCache.VARIANT_COPYING: "copying",
+        PackageCache.VARIANT_COPY_STALLED: "stalled"
+    }
+
+    def __init__(self, path):
+        """Create a metrics store.
+
+        Args:
+            path (str): Directory to store metrics in.
+        """
+        self.path = path
+        self._lookups = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return (config.package_cache_metrics_days > 0)
+
+    def record_lookup(self, variant, status):
+        """Count a lookup of a variant in the cache.
+
+        Args:
+            variant (`Variant`): Variant that was looked up.
+            status (int): Status of the variant in the cache.
+        """
+        result = self.lookup_results.get(status)
+        if result is None or not self.enabled:
+            return
+
+        with self._lock:
+            counts = self._lookups.setdefault(variant.name, {})
+            counts[result] = counts.get(result, 0) + 1
+
+    def record_copy(self, variant, num_bytes, secs):
+        """Record the copy of a variant into the cache.
+
+        Args:
+            variant (`Variant`): Variant that was copied.
+            num_bytes (int): Size of the variant's payload.
+            secs (float): Time taken to copy the payload.
+        """
+        self._write({
+            "event": "copy",
+            "family": variant.name,
+            "variant": variant.uri,
+            "bytes": num_bytes,
+            "secs": secs
+        })
+
+    def record_queue(self, length):
+        """Record the number of variants pending caching.
+
+        Args:
+            length (int): Number of pending variants.
+        """
+        self._write({
+            "event": "queue",
+            "length": length
+        })
+
+    def flush(self):
+        """Write lookups counted so far."""
+        with self._lock:
+            lookups = self._lookups
+            self._lookups = {}
+
+        if lookups:
+            self._write({
+                "event": "lookups",
+                "counts": lookups
+            })
+
+    def get_stats(self, since=None):
+        """Summarize recorded metrics.
+
+        Args:
+            since (float): Only include metrics recorded since this epoch time.
+
+        Returns:
+            dict: Containing:
+
+            - 'start_time', 'end_time': Epoch times of the first and last
+              metrics included (None if there are none);
+            - 'lookups': Counts of each lookup result ('hit', 'miss', 'copying',
+              'stalled'), and the 'hit_rate' (None if there were no lookups);
+            - 'families': The same, per package family, plus the 'copies' and
+              'bytes' copied;
+            - 'copies': The number ('count') of variants copied into the
+              cache, and their total 'bytes', 'secs' and 'throughput' (bytes
+              per second);
+            - 'queue': The 'max_length' of the caching daemon's queue.
+        """
+        def _lookup_counts():
+            counts = dict((x, 0) for x in self.lookup_results.values())
+            counts["hit_rate"] = None
+            return counts
+
+        lookups = _lookup_counts()
+        families = {}
+        copies = {"count": 0, "bytes": 0, "secs": 0.0, "throughput": None}
+        max_queue_length = 0
+        times = []
+
+        def _family(name):
+            if name not in families:
+                families[name] = _lookup_counts()
+                families[name].update(copies=0, bytes=0)
+            return families[name]
+
+        for record in self._iter_records():
+            t = record.get("time", 0)
+            if since is not None and t < since:
+                continue
+
+            event = record.get("event")
+
+            try:
+                if event == "lookups":
+                    for family_name, counts in record["counts"].items():
+                        family = _family(family_name)
+                        for result, count in counts.items():
+                            if result in lookups:
+                                family[result] += count
+                                lookups[result] += count
+
+                elif event == "copy":
+                    family = _family(record["family"])
+                    family["copies"] += 1
+                    family["bytes"] += record["bytes"]
+
+                    copies["count"] += 1
+                    copies["bytes"] += record["bytes"]
+                    copies["secs"] += record["secs"]
+
+                elif event == "queue":
+                    max_queue_length = max(max_queue_length, record["length"])
+
+                else:
+                    continue
+            except (AttributeError, KeyError, TypeError):
+                continue  # written by an incompatible rez version
+
+            times.append(t)
+
+        for counts in [lookups] + list(families.values()):
+            num_lookups = sum(counts[x] for x in self.lookup_results.values())
+            if num_lookups:
+                counts["hit_rate"] = counts["hit"] / float(num_lookups)
+
+        if copies["secs"]:
+            copies["throughput"] = copies["bytes"] / copies["secs"]
+
+        return {
+            "start_time": min(times) if times else None,
+            "end_time": max(times) if times else None,
+            "lookups": lookups,
+            "families": families,
+            "copies": copies,
+            "queue": {"max_length": max_queue_length}
+        }
+
+    def clean(self):
+        """Delete metrics older than :data:`package_cache_metrics_days`."""
+        max_secs = config.package_cache_metrics_days * 3600 * 24
+        now = time.time()
+
+        for name in safe_listdir(self.path):
+            filepath = os.path.join(self.path, name)
+
+            try:
+                if (now - os.stat(filepath).st_mtime) > max_secs:
+                    safe_remove(filepath)
+            except OSError:
+                pass
+
+    def _iter_records(self):
+        for name in sorted(safe_listdir(self.path)):
+            if not name.endswith(".jsonl"):
+                continue
+
+            try:
+                with open(os.path.join(self.path, name)) as f:
+                    lines = f.readlines()
+            except (IOError, OSError):
+                continue
+
+            for line in lines:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # eg, a line still being written
+
+                if isinstance(record, dict):
+                    yield record
+
+    def _write(self, record):
+        if not self.enabled:
+            return
+
+        record["time"] = time.time()
+        line = json.dumps(record, separators=(',', ':')) + '\n'
+        filepath = os.path.join(self.path, time.strftime("%Y-%m-%d.jsonl"))
+
+        # Lines are written with a single append, which does not interleave
+        # with those of other processes
+        try:
+            safe_makedirs(self.path)
+            with open(filepath, 'a') as f:
+                f.write(line)
+        except (IOError, OSError):
+            pass
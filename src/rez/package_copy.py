@@ -2,9 +2,15 @@
 # Copyright Contributors to the Rez Project
 
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
 from functools import partial
+from hashlib import sha1
+from threading import Lock
+import errno
 import os.path
 import shutil
+import stat
 import time
 
 from rez.config import config
@@ -12,18 +18,21 @@ from rez.exceptions import PackageCopyError
 from rez.package_repository import package_repository_manager
 from rez.packages import Variant
 from rez.serialise import FileFormat
+from rez.version import Version
 from rez.utils import with_noop
 from rez.utils.base26 import create_unique_base26_symlink
 from rez.utils.sourcecode import IncludeModuleManager
 from rez.utils.logging_ import print_info, print_warning
-from rez.utils.filesystem import replacing_symlink, replacing_copy, \
-    safe_makedirs, additive_copytree, make_path_writable, get_existing_path
+from rez.utils.filesystem import replacing_symlink, replace_file_or_dir, \
+    make_tmp_name, safe_makedirs, additive_copytree, make_path_writable, \
+    get_existing_path
 
 
 def copy_package(package, dest_repository, variants=None, shallow=False,
                  dest_name=None, dest_version=None, overwrite=False, force=False,
                  follow_symlinks=False, dry_run=False, keep_timestamp=False,
-                 skip_payload=False, overrides=None, verbose=False):
+                 skip_payload=False, overrides=None, threads=None,
+                 hardlink_duplicates=None, show_progress=False, verbose=False):
     """Copy a package from one package repository to another.
 
     This copies the package definition and payload. The package can also be
@@ -80,6 +89,13 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
             are copied into an existing package.
         skip_payload (bool): If True, do not copy the package payload.
         overrides (dict): See :meth:`.PackageRepository.install_variant`.
+        threads (int): Number of threads to copy payload files with. Defaults
+            to :data:`package_copy_threads`.
+        hardlink_duplicates (bool): Hardlink payload files that are identical
+            to those of other versions of the package in the destination
+            repository, rather than copying them. Defaults to
+            :data:`package_copy_hardlink_duplicates`.
+        show_progress (bool): Show a progress bar while copying payloads.
         verbose (bool): Verbose mode.
         dry_run (bool): Dry run mode. Dest variants in the result will be None
             in this case.
@@ -168,6 +184,28 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
 
     src_variants = new_src_variants
 
+    # Settings for copying payloads.
+    #
+    if threads is None:
+        threads = config.package_copy_threads
+
+    if hardlink_duplicates is None:
+        hardlink_duplicates = config.package_copy_hardlink_duplicates
+
+    copier_kwargs = dict(threads=threads)
+
+    if hardlink_duplicates and not (dry_run or skip_payload or shallow):
+        copier_kwargs["hardlink_roots"] = _get_hardlink_roots(
+            dest_pkg_repo,
+            package_name=(dest_name or package.name),
+            package_version=(dest_version or package.version)
+        )
+
+    if show_progress and src_variants and not (dry_run or skip_payload):
+        from rez.util import ProgressBar
+        copier_kwargs["progress"] = ProgressBar(
+            "Copying %s" % package.qualified_name, 0)
+
     # Install each variant and associated payload.
     #
     for i, src_variant in enumerate(src_variants):
@@ -201,6 +239,7 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
                     shallow=shallow,
                     follow_symlinks=follow_symlinks,
                     overrides=overrides,
+                    copier_kwargs=copier_kwargs,
                     verbose=verbose
                 )
 
@@ -224,11 +263,15 @@ def copy_package(package, dest_repository, variants=None, shallow=False,
 
         copied.append((src_variant, dest_variant))
 
+    if "progress" in copier_kwargs:
+        copier_kwargs["progress"].finish()
+
     return finalize()
 
 
 def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
-                          follow_symlinks=False, overrides=None, verbose=False):
+                          follow_symlinks=False, overrides=None,
+                          copier_kwargs=None, verbose=False):
     # Get payload path of source variant. For some types (eg from a "memory"
     # type repo) there may not be a root.
     #
@@ -267,13 +310,14 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
         variant_install_path = dest_pkg_payload_path
 
     # get ready for copy/symlinking
-    copy_func = partial(replacing_copy,
-                        follow_symlinks=follow_symlinks)
+    copier = _PayloadCopier(follow_symlinks=follow_symlinks,
+                            dest_root=dest_pkg_payload_path,
+                            **(copier_kwargs or {}))
 
     if shallow:
         maybe_symlink = replacing_symlink
     else:
-        maybe_symlink = copy_func
+        maybe_symlink = copier.copy
 
     # possibly make install path temporarily writable
     last_dir = get_existing_path(
@@ -313,26 +357,33 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
                     filename = name + '.' + fmt.extension
                     skip_files.append(filename)
 
-        # copy/link all topmost files within the variant root
-        for name in os.listdir(variant_root):
-            if name in skip_files:
-                filepath = os.path.join(variant_root, name)
+        # copy/link all topmost files within the variant root. Copies are
+        # completed when the copier exits
+        with copier:
+            for name in os.listdir(variant_root):
+                if name in skip_files:
+                    filepath = os.path.join(variant_root, name)
 
-                if verbose and is_varianted:
-                    print_info(
-                        "Did not copy %s - this is part of an overlapping "
-                        "variant's root path.", filepath
-                    )
+                    if verbose and is_varianted:
+                        print_info(
+                            "Did not copy %s - this is part of an overlapping "
+                            "variant's root path.", filepath
+                        )
 
-                continue
+                    continue
 
-            src_path = os.path.join(variant_root, name)
-            dest_path = os.path.join(variant_install_path, name)
+                src_path = os.path.join(variant_root, name)
+                dest_path = os.path.join(variant_install_path, name)
 
-            if os.path.islink(src_path):
-                copy_func(src_path, dest_path)
-            else:
-                maybe_symlink(src_path, dest_path)
+                if os.path.islink(src_path):
+                    copier.copy(src_path, dest_path)
+                else:
+                    maybe_symlink(src_path, dest_path)
+
+        if verbose and copier.num_hardlinked:
+            print_info("Hardlinked %d of %d payload files of %s",
+                       copier.num_hardlinked, copier.num_files,
+                       src_variant.uri)
 
     # copy permissions of source variant dirs onto dest
     src_package = src_variant.parent
@@ -381,6 +432,214 @@ def _copy_variant_payload(src_variant, dest_pkg_repo, shallow=False,
             )
 
 
+def _get_hardlink_roots(dest_pkg_repo, package_name, package_version,
+                        max_roots=3):
+    # Get the payload paths of other versions of a package in a repository.
+    # The nearest lower versions are listed first, since they are the most
+    # likely to contain files identical to the given version's.
+    #
+    family = dest_pkg_repo.get_package_family(package_name)
+    if family is None:
+        return []
+
+    version = Version(str(package_version))
+    versions = [
+        x.version for x in dest_pkg_repo.iter_packages(family)
+        if x.version != version
+    ]
+
+    lower = sorted((x for x in versions if x < version), reverse=True)
+    higher = sorted(x for x in versions if x > version)
+
+    roots = []
+    for version_ in (lower + higher)[:max_roots]:
+        path = dest_pkg_repo.get_package_payload_path(
+            package_name=package_name,
+            package_version=version_
+        )
+        if os.path.isdir(path):
+            roots.append(path)
+
+    return roots
+
+
+class _PayloadCopier(object):
+    """Copies files and directories, using a pool of threads.
+
+    Like `replacing_copy`, each copy is made to a temporary path, which then
+    replaces the destination - but only once all copies are complete, when
+    the copier exits. Files are copied concurrently, since copies over network
+    storage are usually bound by per-file latency rather than bandwidth.
+    Directories and symlinks are created in the calling thread.
+
+    If `hardlink_roots` is given, a file is hardlinked rather than copied if
+    the file at the same path relative to one of these roots has the same
+    content and permissions.
+    """
+    def __init__(self, threads=1, follow_symlinks=False, dest_root=None,
+                 hardlink_roots=None, progress=None):
+        """Create a copier.
+
+        Args:
+            threads (int): Number of threads to copy files with.
+            follow_symlinks (bool): Copy the targets of symlinks, rather than
+                the symlinks themselves.
+            dest_root (str): Root path of copy destinations, that
+                `hardlink_roots` correspond to.
+            hardlink_roots (list of str): Paths to find identical files in.
+            progress (`ProgressBar`): Progress bar to update.
+        """
+        self.follow_symlinks = follow_symlinks
+        self.dest_root = dest_root
+        self.hardlink_roots = hardlink_roots or []
+        self.progress = progress
+
+        self.num_files = 0
+        self.num_hardlinked = 0
+
+        self._executor = None
+        if threads and threads > 1:
+            self._executor = ThreadPoolExecutor(threads)
+
+        self._lock = Lock()
+        self._futures = []
+        self._dirs = []
+        self._replacements = []
+        self._tmp_names = ExitStack()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type is None:
+                self._complete()
+        finally:
+            if self._executor:
+                for future in self._futures:
+                    future.cancel()
+                self._executor.shutdown(wait=True)
+
+            # removes any tmp copies that did not replace their destination
+            self._tmp_names.close()
+
+    def copy(self, src, dest):
+        """Copy a file or directory, replacing `dest` if it exists."""
+        tmp_dest = self._tmp_names.enter_context(make_tmp_name(dest))
+        self._replacements.append((tmp_dest, dest))
+        self._copy(src, tmp_dest, dest)
+
+    def _copy(self, src, dest, final_dest):
+        if os.path.islink(src) and not self.follow_symlinks:
+            os.symlink(os.readlink(src), dest)
+
+        elif os.path.isdir(src):
+            os.mkdir(dest)
+            self._dirs.append((src, dest))
+
+            for name in os.listdir(src):
+                self._copy(os.path.join(src, name),
+                           os.path.join(dest, name),
+                           os.path.join(final_dest, name))
+        else:
+            with self._lock:
+                self.num_files += 1
+                if self.progress:
+                    self.progress.max += 1
+
+            if self._executor:
+                future = self._executor.submit(
+                    self._copy_file, src, dest, final_dest)
+                self._futures.append(future)
+            else:
+                self._copy_file(src, dest, final_dest)
+
+    def _copy_file(self, src, dest, final_dest):
+        hardlinked = (self.hardlink_roots
+                      and self._hardlink_file(src, dest, final_dest))
+
+        if not hardlinked:
+            _copy_file_contents(src, dest)
+            shutil.copystat(src, dest)
+
+        with self._lock:
+            if hardlinked:
+                self.num_hardlinked += 1
+            if self.progress:
+                self.progress.next()
+
+    def _hardlink_file(self, src, dest, final_dest):
+        relpath = os.path.relpath(final_dest, self.dest_root)
+        st = os.stat(src)
+        digest = None
+
+        for root in self.hardlink_roots:
+            filepath = os.path.join(root, relpath)
+
+            try:
+                st_ = os.stat(filepath)
+            except OSError:
+                continue
+
+            if not stat.S_ISREG(st_.st_mode) \
+                    or st_.st_size != st.st_size \
+                    or stat.S_IMODE(st_.st_mode) != stat.S_IMODE(st.st_mode):
+                continue
+
+            if digest is None:
+                digest = _get_file_digest(src)
+            if _get_file_digest(filepath) != digest:
+                continue
+
+            try:
+                os.link(filepath, dest)
+                return True
+            except OSError:
+                return False  # eg, on a different filesystem
+
+        return False
+
+    def _complete(self):
+        # raises the first copy error, if any
+        for future in self._futures:
+            future.result()
+
+        # directory permissions are copied last, since they may make the
+        # directory read-only
+        for src, dest in reversed(self._dirs):
+            shutil.copystat(src, dest)
+
+        for tmp_dest, dest in self._replacements:
+            replace_file_or_dir(dest, tmp_dest)
+
+
+def _copy_file_contents(src, dest):
+    # copy_file_range allows the copy to be done by the filesystem (for
+    # example, server-side on NFS 4.2), without the data passing through
+    # this process
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dest, "wb") as fdest:
+                while os.copy_file_range(fsrc.fileno(), fdest.fileno(),
+                                         1 << 30):
+                    pass
+            return
+        except OSError as e:
+            if e.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL,
+                               errno.EOPNOTSUPP, errno.EBADF, errno.EPERM):
+                raise
+
+    shutil.copyfile(src, dest)
+
+
+def _get_file_digest(filepath):
+    h = sha1()
+    with open(filepath, "rb") as f:
+        for chunk in iter(partial(f.read, 1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 def _get_overlapped_variant_dirs(src_variant):
     package = src_variant.parent
     dirs = set()
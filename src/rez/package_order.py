@@ -105,7 +105,7 @@ class SortedOrder(PackageOrder):
 
     def reorder(self, iterable, key=None):
         key = key or (lambda x: x)
-        return sorted(iterable, key=lambda x: key(x).version,
+        return sorted(iterable, key=lambda x: key(x).version.sort_key(),
                       reverse=self.descending)
 
     def __str__(self):
@@ -259,7 +259,7 @@ class VersionSplitPackageOrder(PackageOrder):
         key = key or (lambda x: x)
 
         # sort by version descending
-        descending = sorted(iterable, key=lambda x: key(x).version, reverse=True)
+        descending = sorted(iterable, key=lambda x: key(x).version.sort_key(), reverse=True)
 
         above = []
         below = []
@@ -362,7 +362,7 @@ class TimestampPackageOrder(PackageOrder):
         key = key or (lambda x: x)
 
         # sort by version descending
-        descending = sorted(iterable, key=lambda x: key(x).version, reverse=True)
+        descending = sorted(iterable, key=lambda x: key(x).version.sort_key(), reverse=True)
 
         for i, o in enumerate(descending):
             package = key(o)
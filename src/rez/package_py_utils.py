@@ -128,6 +128,7 @@ def expand_requirement(request, paths=None):
         return version_
 
     if req.range_ is not None:
+        req.range_ = req.range_.copy()
         req.range_.visit_versions(visit_version)
 
     result = str(req)
@@ -142,6 +142,19 @@ class PackageRepository(object):
         """
         raise NotImplementedError
 
+    def prefetch_package_families(self, names):
+        """Hint that the given package families are about to be loaded.
+
+        Repositories can use this to load data for many families at once (for
+        example, with a single round trip to a remote cache), rather than one
+        family at a time. The default implementation does nothing.
+
+        Args:
+            names (list of str): Package family names. These may include names
+                of families that do not exist in this repository.
+        """
+        pass
+
     def iter_package_families(self):
         """Iterate over the package families in the repository, in no
         particular order.
@@ -414,6 +427,30 @@ class PackageRepository(object):
         """
         return 0
 
+    def get_indexed_requires(self, name):
+        """Get the requirements of the latest package in a family, from an
+        index.
+
+        This is used for reverse dependency lookups (see
+        `rez.package_search.get_reverse_dependency_tree`), which otherwise
+        have to load the latest package of every family. Repositories that do
+        not maintain such an index can leave this as-is.
+
+        Args:
+            name (str): Package family name.
+
+        Returns:
+            dict: None if the family is not indexed (or its index entry is out
+            of date). Otherwise, a dict containing:
+
+            - 'version' (`Version`): Version of the latest package, or None
+              if the family contains no packages;
+            - 'requires', 'build_requires', 'private_build_requires' (list of
+              str): Names of the packages required by any variant of the latest
+              package. Conflict requirements are not included.
+        """
+        return None
+
     def make_resource_handle(self, resource_key, **variables):
         """Create a `ResourceHandle`
 
@@ -533,6 +570,8 @@ class PackageRepositoryManager(object):
 
         self.pool = resource_pool
         self.repositories = {}
+        self.clear_caches_callbacks = []
+        self._lock = threading.Lock()
 
     def get_repository(self, path):
         """Get a package repository.
@@ -566,10 +605,16 @@ class PackageRepositoryManager(object):
         # get possibly cached repo
         repository = self.repositories.get(normalised_path)
 
-        # create and cache if not already cached
+        # create and cache if not already cached. Note that the lock stops two
+        # threads creating the same repository, which would register its
+        # resource classes in the pool twice
         if repository is None:
-            repository = self._get_repository(normalised_path)
-            self.repositories[normalised_path] = repository
+            with self._lock:
+                repository = self.repositories.get(normalised_path)
+
+                if repository is None:
+                    repository = self._get_repository(normalised_path)
+                    self.repositories[normalised_path] = repository
 
         return repository
 
@@ -632,11 +677,25 @@ class PackageRepositoryManager(object):
         resource = repo.get_resource_from_handle(resource_handle)
         return resource
 
+    def add_clear_caches_callback(self, callback):
+        """Add a callback to be called when caches are cleared.
+
+        This allows caches of data derived from repositories (such as the
+        solver's shared variant cache) to be invalidated along with them.
+
+        Args:
+            callback (callable): Function taking no arguments.
+        """
+        self.clear_caches_callbacks.append(callback)
+
     def clear_caches(self):
         """Clear all cached data."""
         self.repositories.clear()
         self.pool.clear_caches()
 
+        for callback in self.clear_caches_callbacks:
+            callback()
+
     def _get_repository(self, path, **repo_args):
         repo_type, location = path.split('@', 1)
         cls = plugin_manager.get_plugin_class('package_repository', repo_type)
@@ -14,7 +14,9 @@ import fnmatch
 from collections import defaultdict
 import sys
 
-from rez.packages import iter_package_families, iter_packages, get_latest_package
+from rez.packages import iter_package_families, get_latest_package, \
+    scan_package_families
+from rez.package_repository import package_repository_manager
 from rez.exceptions import PackageFamilyNotFoundError, ResourceContentError
 from rez.util import ProgressBar
 from rez.utils.colorize import critical, info, error, Printer
@@ -28,7 +30,8 @@ from rez.version import Requirement
 
 def get_reverse_dependency_tree(package_name, depth=None, paths=None,
                                 build_requires=False,
-                                private_build_requires=False):
+                                private_build_requires=False,
+                                use_index=True):
     """Find packages that depend on the given package.
 
     This is a reverse dependency lookup. A tree is constructed, showing what
@@ -44,6 +47,10 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
         build_requires (bool): If True, includes packages' build_requires.
         private_build_requires (bool): If True, include `package_name`'s
             private_build_requires.
+        use_index (bool): If True, use the requirements recorded in package
+            repository indexes (see
+            `PackageRepository.get_indexed_requires`) where they are
+            available and up to date, rather than loading packages.
 
     Returns:
         tuple: A 2-tuple:
@@ -66,14 +73,9 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
     if depth == 0:
         return pkgs_list, g
 
-    bar = ProgressBar("Searching", len(package_names))
-    lookup = defaultdict(set)
-
-    for i, package_name_ in enumerate(package_names):
-        it = iter_packages(name=package_name_, paths=paths)
-        packages = list(it)
+    def _get_requires(package_name_, packages):
         if not packages:
-            continue
+            return []
 
         pkg = max(packages, key=lambda x: x.version)
         requires = []
@@ -86,13 +88,41 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
                 private_build_requires=pbr
             )
 
-        for req in requires:
-            if not req.conflict:
-                lookup[req.name].add(package_name_)
+        return requires
 
-        bar.next()
+    lookup = defaultdict(set)
+    unindexed_names = []
 
-    bar.finish()
+    for package_name_ in package_names:
+        indexed_requires = None
+        if use_index:
+            indexed_requires = _get_indexed_requires(package_name_, paths)
+
+        if indexed_requires is None:
+            unindexed_names.append(package_name_)
+            continue
+
+        requires = indexed_requires["requires"]
+        if build_requires:
+            requires = requires + indexed_requires["build_requires"]
+        if private_build_requires and package_name_ == package_name:
+            requires = requires + indexed_requires["private_build_requires"]
+
+        for name in requires:
+            lookup[name].add(package_name_)
+
+    if unindexed_names:
+        bar = ProgressBar("Searching", len(unindexed_names))
+        it = scan_package_families(_get_requires, unindexed_names, paths=paths)
+
+        for package_name_, requires in it:
+            for req in requires:
+                if not req.conflict:
+                    lookup[req.name].add(package_name_)
+
+            bar.next()
+
+        bar.finish()
 
     # perform traversal
     n = 0
@@ -126,6 +156,36 @@ def get_reverse_dependency_tree(package_name, depth=None, paths=None,
     return pkgs_list, g
 
 
+def _get_indexed_requires(name, paths=None):
+    # Combines the indexed requirements of a family across repositories, in
+    # the same way that the latest package is found across repositories.
+    # Returns None if the family is not indexed in every repository it is in
+    result = None
+
+    for path in (paths or config.packages_path):
+        repo = package_repository_manager.get_repository(path)
+        indexed_requires = repo.get_indexed_requires(name)
+
+        if indexed_requires is None:
+            if repo.get_package_family(name) is None:
+                continue
+            return None
+
+        version = indexed_requires["version"]
+        if version is None:
+            continue
+
+        if result is None or version > result["version"]:
+            result = indexed_requires
+
+    return result or {
+        "version": None,
+        "requires": [],
+        "build_requires": [],
+        "private_build_requires": []
+    }
+
+
 def get_plugins(package_name, paths=None):
     """Find packages that are plugins of the given package.
 
@@ -270,61 +330,75 @@ class ResourceSearcher(object):
             results = [ResourceSearchResult(x, "family") for x in family_names]
             return "family", results
 
-        results = []
-
         # iterate over packages/variants
-        for name in family_names:
-            it = iter_packages(name, version_range, paths=self.package_paths)
-            packages = sorted(it, key=lambda x: x.version)
+        def _search(name, packages):
+            return self._search_packages(packages, resource_type)
+
+        it = scan_package_families(
+            _search,
+            family_names,
+            range_=version_range,
+            paths=self.package_paths
+        )
 
-            if self.latest and packages:
-                packages = [packages[-1]]
+        results = []
+        for _, family_results in it:
+            results.extend(family_results)
 
-            for package in packages:
-                # validate and check time (accessing timestamp may cause
-                # validation fail)
-                try:
-                    if package.timestamp:
-                        if self.after_time and package.timestamp < self.after_time:
-                            continue
-                        if self.before_time and package.timestamp >= self.before_time:
-                            continue
+        return resource_type, results
 
-                    if self.validate:
-                        package.validate_data()
+    def _search_packages(self, packages, resource_type):
+        results = []
+        packages = sorted(packages, key=lambda x: x.version)
 
-                except ResourceContentError as e:
-                    if resource_type == "package":
-                        result = ResourceSearchResult(package, "package", str(e))
-                        results.append(result)
+        if self.latest and packages:
+            packages = [packages[-1]]
+
+        for package in packages:
+            # validate and check time (accessing timestamp may cause
+            # validation fail)
+            try:
+                if package.timestamp:
+                    if self.after_time and package.timestamp < self.after_time:
+                        continue
+                    if self.before_time and package.timestamp >= self.before_time:
+                        continue
 
-                    continue
+                if self.validate:
+                    package.validate_data()
 
+            except ResourceContentError as e:
                 if resource_type == "package":
-                    result = ResourceSearchResult(package, "package")
+                    result = ResourceSearchResult(package, "package", str(e))
                     results.append(result)
-                    continue
 
-                # iterate variants
-                try:
-                    for variant in package.iter_variants():
-                        if self.validate:
-                            try:
-                                variant.validate_data()
-                            except ResourceContentError as e:
-                                result = ResourceSearchResult(
-                                    variant, "variant", str(e))
-                                results.append(result)
-                                continue
-
-                        result = ResourceSearchResult(variant, "variant")
-                        results.append(result)
-
-                except ResourceContentError:
-                    # this may happen if 'variants' in package is malformed
-                    continue
+                continue
 
-        return resource_type, results
+            if resource_type == "package":
+                result = ResourceSearchResult(package, "package")
+                results.append(result)
+                continue
+
+            # iterate variants
+            try:
+                for variant in package.iter_variants():
+                    if self.validate:
+                        try:
+                            variant.validate_data()
+                        except ResourceContentError as e:
+                            result = ResourceSearchResult(
+                                variant, "variant", str(e))
+                            results.append(result)
+                            continue
+
+                    result = ResourceSearchResult(variant, "variant")
+                    results.append(result)
+
+            except ResourceContentError:
+                # this may happen if 'variants' in package is malformed
+                continue
+
+        return results
 
     @classmethod
     def _parse_request(cls, resources_request):
@@ -5,14 +5,18 @@
 """
 Manages loading of all types of Rez plugins.
 """
+from rez import __version__
 from rez.config import config, expand_system_vars, _load_config_from_filepaths
 from rez.utils.formatting import columnise
+from rez.utils.filesystem import make_tmp_name
 from rez.utils.schema import dict_to_schema
 from rez.utils.data_utils import LazySingleton, cached_property, deep_update
 from rez.utils.logging_ import print_debug, print_warning
 from rez.exceptions import RezPluginError
 from zipimport import zipimporter
+from hashlib import sha1
 import pkgutil
+import json
 import os.path
 import sys
 
@@ -84,9 +88,18 @@ class RezPluginType(object):
 
     'type_name' must correspond with one of the source directories found under
     the 'plugins' directory.
+
+    Plugins are found when the plugin type is created, but a plugin's module is
+    not imported until the plugin is first used. If :data:`plugin_cache_path`
+    is set, the plugins found (and their rezconfig settings) are also cached in
+    a manifest file, so that the plugin search paths are not searched again
+    until they change.
     """
     type_name = None
 
+    # this version should be changed if and when the manifest format changes
+    manifest_version = 1
+
     def __init__(self):
         if self.type_name is None:
             raise TypeError("Subclasses of RezPluginType must provide a "
@@ -95,11 +108,12 @@ class RezPluginType(object):
         self.plugin_classes = {}
         self.failed_plugins = {}
         self.plugin_modules = {}
+        self.plugin_paths = {}
         self.config_data = {}
         self.load_plugins()
 
     def __repr__(self):
-        return '%s(%s)' % (self.__class__.__name__, self.plugin_classes.keys())
+        return '%s(%s)' % (self.__class__.__name__, self.plugin_paths.keys())
 
     def register_plugin(self, plugin_name, plugin_class, plugin_module):
         # TODO: check plugin_class to ensure it is a sub-class of expected base-class?
@@ -109,7 +123,10 @@ class RezPluginType(object):
         self.plugin_modules[plugin_name] = plugin_module
 
     def load_plugins(self):
-        import pkgutil
+        """Find the plugins of this type, and load their config.
+
+        Plugin modules are not imported here, see `load_plugin`.
+        """
         from rez.backport.importlib import import_module
         type_module_name = 'rezplugins.' + self.type_name
         package = import_module(type_module_name)
@@ -124,7 +141,11 @@ class RezPluginType(object):
 
         # reverse plugin path order, so that custom plugins have a chance to
         # be found before the builtin plugins (from /rezplugins).
-        paths = reversed(paths)
+        paths = list(reversed(paths))
+
+        manifest_key = self._get_manifest_key(paths)
+        if self._load_manifest(manifest_key):
+            return
 
         for path in paths:
             if config.debug("plugins"):
@@ -140,73 +161,97 @@ class RezPluginType(object):
                 if plugin_name.startswith('_') or plugin_name == 'rezconfig':
                     continue
 
-                if plugin_name in self.plugin_modules:
+                if plugin_name in self.plugin_paths:
                     # same named plugins will have identical module name,
                     # which will just reuse previous imported module from
-                    # `sys.modules` below. skipping the rest of the process
-                    # for good.
+                    # `sys.modules`. skipping the rest of the process for good.
                     if config.debug("plugins"):
                         print_warning("skipped same named %s plugin at %s: %s"
                                       % (self.type_name, path, modname))
                     continue
 
-                if config.debug("plugins"):
-                    print_debug("loading %s plugin at %s: %s..."
-                                % (self.type_name, path, modname))
-                try:
-                    # https://github.com/AcademySoftwareFoundation/rez/pull/218
-                    # load_module will force reload the module if it's
-                    # already loaded, so check for that
-                    plugin_module = sys.modules.get(modname)
-                    if plugin_module is None:
-                        loader = importer.find_module(modname)
-                        plugin_module = loader.load_module(modname)
-
-                    elif os.path.dirname(plugin_module.__file__) != path:
-                        if config.debug("plugins"):
-                            # this should not happen but if it does, tell why.
-                            print_warning(
-                                "plugin module %s is not loaded from current "
-                                "load path but reused from previous imported "
-                                "path: %s" % (modname, plugin_module.__file__))
-
-                    if (hasattr(plugin_module, "register_plugin")
-                            and callable(plugin_module.register_plugin)):
-
-                        plugin_class = plugin_module.register_plugin()
-                        if plugin_class is not None:
-                            self.register_plugin(plugin_name,
-                                                 plugin_class,
-                                                 plugin_module)
-                        else:
-                            if config.debug("plugins"):
-                                print_warning(
-                                    "'register_plugin' function at %s: %s did "
-                                    "not return a class." % (path, modname))
-                    else:
-                        if config.debug("plugins"):
-                            print_warning(
-                                "no 'register_plugin' function at %s: %s"
-                                % (path, modname))
-
-                        # delete from sys.modules?
-
-                except Exception as e:
-                    nameish = modname.split('.')[-1]
-                    self.failed_plugins[nameish] = str(e)
-                    if config.debug("plugins"):
-                        import traceback
-                        from io import StringIO
-                        out = StringIO()
-                        traceback.print_exc(file=out)
-                        print_debug(out.getvalue())
+                self.plugin_paths[plugin_name] = (path, modname)
 
             # load config
             data, _ = _load_config_from_filepaths([os.path.join(path, "rezconfig")])
             deep_update(self.config_data, data)
 
+        self._save_manifest(manifest_key)
+
+    def load_plugin(self, plugin_name):
+        """Import the module of a plugin, and register the plugin.
+
+        Does nothing if the plugin is already loaded, or failed to load.
+
+        Args:
+            plugin_name (str): Name of the plugin.
+        """
+        if plugin_name in self.plugin_modules \
+                or plugin_name in self.failed_plugins \
+                or plugin_name not in self.plugin_paths:
+            return
+
+        path, modname = self.plugin_paths[plugin_name]
+
+        if config.debug("plugins"):
+            print_debug("loading %s plugin at %s: %s..."
+                        % (self.type_name, path, modname))
+        try:
+            # https://github.com/AcademySoftwareFoundation/rez/pull/218
+            # load_module will force reload the module if it's
+            # already loaded, so check for that
+            plugin_module = sys.modules.get(modname)
+            if plugin_module is None:
+                importer = pkgutil.get_importer(path)
+                loader = importer.find_module(modname)
+                plugin_module = loader.load_module(modname)
+
+            elif os.path.dirname(plugin_module.__file__) != path:
+                if config.debug("plugins"):
+                    # this should not happen but if it does, tell why.
+                    print_warning(
+                        "plugin module %s is not loaded from current "
+                        "load path but reused from previous imported "
+                        "path: %s" % (modname, plugin_module.__file__))
+
+            if (hasattr(plugin_module, "register_plugin")
+                    and callable(plugin_module.register_plugin)):
+
+                plugin_class = plugin_module.register_plugin()
+                if plugin_class is not None:
+                    self.register_plugin(plugin_name,
+                                         plugin_class,
+                                         plugin_module)
+                else:
+                    if config.debug("plugins"):
+                        print_warning(
+                            "'register_plugin' function at %s: %s did "
+                            "not return a class." % (path, modname))
+            else:
+                if config.debug("plugins"):
+                    print_warning(
+                        "no 'register_plugin' function at %s: %s"
+                        % (path, modname))
+
+                # delete from sys.modules?
+
+        except Exception as e:
+            self.failed_plugins[plugin_name] = str(e)
+            if config.debug("plugins"):
+                import traceback
+                from io import StringIO
+                out = StringIO()
+                traceback.print_exc(file=out)
+                print_debug(out.getvalue())
+
+    def load_all_plugins(self):
+        """Import the modules of all plugins of this type."""
+        for plugin_name in self.plugin_paths:
+            self.load_plugin(plugin_name)
+
     def get_plugin_class(self, plugin_name):
         """Returns the class registered under the given plugin name."""
+        self.load_plugin(plugin_name)
         try:
             return self.plugin_classes[plugin_name]
         except KeyError:
@@ -215,6 +260,7 @@ class RezPluginType(object):
 
     def get_plugin_module(self, plugin_name):
         """Returns the module containing the plugin of the given name."""
+        self.load_plugin(plugin_name)
         try:
             return self.plugin_modules[plugin_name]
         except KeyError:
@@ -228,6 +274,7 @@ class RezPluginType(object):
         from rez.config import _plugin_config_dict
         d = _plugin_config_dict.get(self.type_name, {})
 
+        self.load_all_plugins()
         for name, plugin_class in self.plugin_classes.items():
             if hasattr(plugin_class, "schema_dict") \
                     and plugin_class.schema_dict:
@@ -235,10 +282,131 @@ class RezPluginType(object):
                 deep_update(d, d_)
         return dict_to_schema(d, required=True, modifier=expand_system_vars)
 
+    def get_plugin_config_schema(self, plugin_name):
+        """Returns the configuration data schema of a single plugin.
+
+        Returns:
+            `Schema`: The schema, or None if the plugin has no settings schema
+            (or failed to load).
+        """
+        self.load_plugin(plugin_name)
+        plugin_class = self.plugin_classes.get(plugin_name)
+
+        schema_dict = getattr(plugin_class, "schema_dict", None)
+        if not schema_dict:
+            return None
+        return dict_to_schema(schema_dict, required=True,
+                              modifier=expand_system_vars)
+
     def create_instance(self, plugin, **instance_kwargs):
         """Create and return an instance of the given plugin."""
         return self.get_plugin_class(plugin)(**instance_kwargs)
 
+    def _get_manifest_key(self, paths):
+        # The manifest is invalidated by any change to the plugin paths, or to
+        # their rezconfig files. Changes to a plugin module's content do not
+        # affect the manifest, since plugin modules are imported as normal.
+        if not config.plugin_cache_path:
+            return None
+
+        mtimes = []
+        try:
+            for path in paths:
+                for filepath in (path,
+                                 os.path.join(path, "rezconfig"),
+                                 os.path.join(path, "rezconfig.py")):
+                    try:
+                        mtimes.append(os.stat(filepath).st_mtime_ns)
+                    except OSError:
+                        if filepath == path:
+                            raise  # eg a zipped plugin path
+                        mtimes.append(None)
+        except OSError:
+            return None
+
+        return [self.manifest_version, __version__, paths, mtimes]
+
+    def _get_manifest_filepath(self, manifest_key):
+        paths = manifest_key[2]
+        txt = json.dumps(paths)
+        digest = sha1(txt.encode("utf-8")).hexdigest()[:16]
+        filename = "%s-%s.json" % (self.type_name, digest)
+        return os.path.join(config.plugin_cache_path, filename)
+
+    def _load_manifest(self, manifest_key):
+        if manifest_key is None:
+            return False
+
+        filepath = self._get_manifest_filepath(manifest_key)
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return False
+
+        try:
+            if data["key"] != manifest_key:
+                return False
+
+            plugin_paths = dict(
+                (name, tuple(value))
+                for name, value in data["plugins"]
+            )
+            config_data = data["config_data"]
+        except (KeyError, TypeError, ValueError):
+            return False
+
+        if config_data is None:
+            # rezconfig data could not be stored as json, load it as normal
+            config_data = {}
+            for path in manifest_key[2]:
+                data_, _ = _load_config_from_filepaths(
+                    [os.path.join(path, "rezconfig")])
+                deep_update(config_data, data_)
+
+        if config.debug("plugins"):
+            print_debug("loaded %s plugins from manifest %s",
+                        self.type_name, filepath)
+
+        self.plugin_paths = plugin_paths
+        self.config_data = config_data
+        return True
+
+    def _save_manifest(self, manifest_key):
+        if manifest_key is None:
+            return
+
+        # plugin config may contain data that does not survive json encoding
+        try:
+            config_data = json.loads(json.dumps(self.config_data))
+        except (TypeError, ValueError):
+            config_data = None
+        else:
+            if config_data != self.config_data:
+                config_data = None
+
+        # a list, since plugin search order matters
+        data = {
+            "key": manifest_key,
+            "plugins": [[k, list(v)] for k, v in self.plugin_paths.items()],
+            "config_data": config_data
+        }
+
+        filepath = self._get_manifest_filepath(manifest_key)
+
+        # write to a tmpfile and rename, so readers never see a partially
+        # written file. Errors are ignored, eg if the cache dir is read-only
+        try:
+            if not os.path.isdir(config.plugin_cache_path):
+                os.makedirs(config.plugin_cache_path)
+
+            with make_tmp_name(filepath) as tmp_filepath:
+                with open(tmp_filepath, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_filepath, filepath)
+        except (IOError, OSError):
+            pass
+
 
 class RezPluginManager(object):
     """Primary interface for working with registered plugins.
@@ -353,7 +521,17 @@ class RezPluginManager(object):
     def get_plugins(self, plugin_type):
         """Return a list of the registered names available for the given plugin
         type."""
-        return self._get_plugin_type(plugin_type).plugin_classes.keys()
+        plugin = self._get_plugin_type(plugin_type)
+        plugin.load_all_plugins()
+        return plugin.plugin_classes.keys()
+
+    def get_discovered_plugins(self, plugin_type):
+        """Return the names of all plugins found for the given plugin type.
+
+        Unlike `get_plugins`, this does not load the plugins, so the names may
+        include plugins that fail to load.
+        """
+        return self._get_plugin_type(plugin_type).plugin_paths.keys()
 
     def get_plugin_class(self, plugin_type, plugin_name):
         """Return the class registered under the given plugin name."""
@@ -371,9 +549,17 @@ class RezPluginManager(object):
         plugin = self._get_plugin_type(plugin_type)
         return plugin.config_data
 
-    def get_plugin_config_schema(self, plugin_type):
+    def get_plugin_config_schema(self, plugin_type, plugin_name=None):
+        """Return the configuration data schema for the plugin type, or for
+        one plugin of that type.
+
+        Note that the schema of the whole plugin type requires all its plugins
+        to be loaded.
+        """
         plugin = self._get_plugin_type(plugin_type)
-        return plugin.config_schema
+        if plugin_name is None:
+            return plugin.config_schema
+        return plugin.get_plugin_config_schema(plugin_name)
 
     def get_failed_plugins(self, plugin_type):
         """Return a list of plugins for the given type that failed to load.
@@ -383,7 +569,9 @@ class RezPluginManager(object):
             name (str): Name of the plugin.
             reason (str): Error message.
         """
-        return self._get_plugin_type(plugin_type).failed_plugins.items()
+        plugin = self._get_plugin_type(plugin_type)
+        plugin.load_all_plugins()
+        return plugin.failed_plugins.items()
 
     def create_instance(self, plugin_type, plugin_name, **instance_kwargs):
         """Create and return an instance of the given plugin."""
@@ -0,0 +1,266 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+Resolve cache backends.
+
+A resolve cache stores the results of previous resolves, so that an identical
+request can skip the solve entirely. The `Resolver` decides what is stored and
+whether a cached entry is still valid - backends only store opaque values
+under string keys.
+"""
+from rez.config import config
+from rez.utils.memcached import memcached_client
+from rez.utils.filesystem import safe_makedirs
+from contextlib import contextmanager
+import os.path
+import pickle
+import sqlite3
+import time
+
+
+class ResolveCache(object):
+    """Abstract resolve cache backend."""
+
+    #: Name of the backend, as shown in debugging output.
+    name = None
+
+    def get(self, key):
+        """Get a cached entry.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            object: Cached value, or None on a cache miss.
+        """
+        raise NotImplementedError
+
+    def set(self, key, value):
+        """Store an entry.
+
+        Args:
+            key (str): Cache key.
+            value (object): Picklable value to store.
+        """
+        raise NotImplementedError
+
+    def delete(self, key):
+        """Delete an entry, if present.
+
+        Args:
+            key (str): Cache key.
+        """
+        raise NotImplementedError
+
+
+class MemcachedResolveCache(ResolveCache):
+    """Resolve cache that stores entries to memcached server(s)."""
+    name = "memcached"
+
+    def __init__(self, servers, debug=False, min_compress_len=0):
+        self.servers = servers
+        self.debug = debug
+        self.min_compress_len = min_compress_len
+
+    def get(self, key):
+        with self._client() as client:
+            value = client.get(key)
+        return None if value is client.miss else value
+
+    def set(self, key, value):
+        with self._client() as client:
+            client.set(key, value, min_compress_len=self.min_compress_len)
+
+    def delete(self, key):
+        with self._client() as client:
+            client.delete(key)
+
+    @contextmanager
+    def _client(self):
+        with memcached_client(self.servers, debug=self.debug) as client:
+            yield client
+
+
+class FileResolveCache(ResolveCache):
+    """Resolve cache that stores entries to a local sqlite database.
+
+    This is intended for hosts that have no access to a memcached server, such
+    as isolated render nodes or laptops. Entries are evicted least recently
+    used first once the total size of the cache exceeds `max_size`.
+
+    Sqlite handles locking, so a cache can be shared by concurrent processes.
+    However, sqlite locking is not reliable over network filesystems, so the
+    cache should be on local disk.
+
+    Any error accessing the cache is treated as a cache miss - a broken cache
+    must never cause a resolve to fail.
+    """
+    name = "file"
+
+    # this version should be changed if and when the database schema changes
+    schema_version = 1
+
+    # minimum secs between updates to an entry's access time, this avoids a
+    # database write on every cache hit
+    atime_resolution = 60
+
+    def __init__(self, path, max_size=0):
+        """Create a file resolve cache.
+
+        Args:
+            path (str): Directory to store the cache in. It is created if it
+                does not exist.
+            max_size (int): Maximum size of the cache in bytes. Zero means no
+                size limit.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.filepath = os.path.join(
+            path, "resolves-v%d.db" % self.schema_version)
+
+        self._conn = None
+        self._print = config.debug_printer("resolve_memcache")
+
+    def get(self, key):
+        now = time.time()
+
+        try:
+            with self._connection() as conn:
+                row = conn.execute(
+                    "SELECT value, atime FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                data, atime = row
+                if now - atime > self.atime_resolution:
+                    conn.execute(
+                        "UPDATE entries SET atime = ? WHERE key = ?", (now, key))
+        except (sqlite3.Error, OSError) as e:
+            self._print("Error reading from resolve cache %r: %s", self.filepath, e)
+            return None
+
+        try:
+            return pickle.loads(data)
+        except Exception as e:
+            # eg, an entry written by an incompatible rez version
+            self._print("Discarding unreadable resolve cache entry: %s", e)
+            self.delete(key)
+            return None
+
+    def set(self, key, value):
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, value, size, atime) "
+                    "VALUES (?, ?, ?, ?)", (key, data, len(data), time.time()))
+
+                if self.max_size:
+                    self._evict(conn)
+        except (sqlite3.Error, OSError) as e:
+            self._print("Error writing to resolve cache %r: %s", self.filepath, e)
+
+    def delete(self, key):
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+        except (sqlite3.Error, OSError) as e:
+            self._print("Error writing to resolve cache %r: %s", self.filepath, e)
+
+    def clear(self):
+        """Delete all entries."""
+        with self._connection() as conn:
+            conn.execute("DELETE FROM entries")
+
+    def get_stats(self):
+        """Get cache statistics.
+
+        Returns:
+            dict: Contains keys 'num_entries' and 'size' (in bytes).
+        """
+        with self._connection() as conn:
+            num_entries, size = conn.execute(
+                "SELECT COUNT(*), TOTAL(size) FROM entries").fetchone()
+
+        return {
+            "num_entries": num_entries,
+            "size": int(size)
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _evict(self, conn):
+        size = conn.execute("SELECT TOTAL(size) FROM entries").fetchone()[0]
+        if size <= self.max_size:
+            return
+
+        # delete least recently used entries until under the size limit
+        evicted_keys = []
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY atime")
+
+        for key, entry_size in rows:
+            if size <= self.max_size:
+                break
+            evicted_keys.append((key,))
+            size -= entry_size
+
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted_keys)
+        self._print("Evicted %d entries from resolve cache %r",
+                    len(evicted_keys), self.filepath)
+
+    @contextmanager
+    def _connection(self):
+        # the connection's context manager commits on success, and rolls
+        # back on error
+        if self._conn is None:
+            safe_makedirs(self.path)
+            conn = sqlite3.connect(self.filepath, timeout=10)
+
+            # allows readers to proceed concurrently with a writer
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB, size INTEGER, atime REAL)")
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS entries_atime ON entries (atime)")
+            conn.commit()
+            self._conn = conn
+
+        with self._conn:
+            yield self._conn
+
+
+def get_resolve_cache():
+    """Get the configured resolve cache backend.
+
+    Memcached is used if :data:`memcached_uri` is set, otherwise the file-based
+    cache is used if :data:`resolve_cache_path` is set.
+
+    Returns:
+        `ResolveCache`, or None if resolve caching is disabled.
+    """
+    if not config.resolve_caching:
+        return None
+
+    if config.memcached_uri:
+        return MemcachedResolveCache(
+            config.memcached_uri,
+            debug=config.debug_memcache,
+            min_compress_len=config.memcached_resolve_min_compress_len
+        )
+
+    if config.resolve_cache_path:
+        return FileResolveCache(
+            config.resolve_cache_path,
+            max_size=config.resolve_cache_max_size * 1024 * 1024
+        )
+
+    return None
@@ -0,0 +1,349 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+A local server that performs resolves with warm caches.
+
+Every rez process starts with cold caches - package repositories have to list
+families and read package definitions, and the solver has to wrap every
+package it visits. A resolve server is a long-running process that keeps
+these caches warm, and performs resolves on behalf of other rez processes on
+the same host. See :data:`resolve_server`.
+
+Requests and responses are single lines of JSON, sent over a unix socket.
+"""
+from rez.config import config
+from rez.package_repository import package_repository_manager
+from rez.solver import shared_package_variant_cache
+from contextlib import contextmanager
+import socketserver
+import socket
+import json
+import time
+import os
+import os.path
+
+
+# this version should be changed if and when the protocol changes
+protocol_version = 1
+
+# the context fields that a server returns. These are the results of the
+# resolve, the client provides everything else
+_result_fields = [
+    "status",
+    "failure_description",
+    "resolved_packages",
+    "resolved_ephemerals",
+    "graph",
+    "from_cache",
+    "solve_time",
+    "load_time",
+    "num_loaded_packages"
+]
+
+
+class ResolveServer(object):
+    """A server that performs resolves with warm caches.
+
+    Resolves share package variant lists (see `SharedPackageVariantCache`), as
+    well as the caches of the package repositories. Before each resolve, the
+    root directories of the repositories searched so far, the directories of
+    the package families loaded so far, and the definition files of the
+    packages loaded so far, are checked. All caches are cleared if any of
+    these have changed (for example, because a new family or version was
+    released, or a variant was added to an existing version).
+
+    Requests are handled one at a time.
+    """
+    def __init__(self, socket_path, verbose=False):
+        """Create a resolve server.
+
+        Args:
+            socket_path (str): Path of the unix socket to listen on.
+            verbose (bool): If True, print a line for every request.
+        """
+        self.socket_path = socket_path
+        self.verbose = verbose
+        self.num_resolves = 0
+
+        # {directory or file path: mtime}
+        self.path_states = {}
+
+    def serve_forever(self):
+        """Listen for requests, until interrupted."""
+        server = self.create_socket_server()
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            os.remove(self.socket_path)
+
+    def create_socket_server(self):
+        """Create the socket server that listens for requests.
+
+        Returns:
+            `socketserver.UnixStreamServer`: Server, bound to `socket_path`.
+        """
+        if os.path.exists(self.socket_path):
+            if self._is_running():
+                raise RuntimeError(
+                    "A resolve server is already listening on %s"
+                    % self.socket_path)
+            os.remove(self.socket_path)  # left by a server that died
+
+        # only the current user may connect
+        umask = os.umask(0o177)
+        try:
+            server = socketserver.UnixStreamServer(
+                self.socket_path, _RequestHandler)
+        finally:
+            os.umask(umask)
+
+        server.resolve_server = self
+        return server
+
+    def handle_request(self, data):
+        """Handle a request.
+
+        Args:
+            data (dict): Request, as sent by `resolve_with_server`.
+
+        Returns:
+            dict: Response. This contains either 'context', the results of the
+            resolve (see `ResolvedContext.to_dict`), or 'error'.
+        """
+        from rez.resolved_context import ResolvedContext
+        from rez.package_filter import PackageFilterList
+        from rez import package_order
+
+        if data.get("protocol_version") != protocol_version:
+            return {"error": "Unsupported protocol version: %r"
+                    % data.get("protocol_version")}
+
+        self._clear_caches_if_changed()
+
+        kwargs = data["kwargs"].copy()
+
+        # recorded whether or not the resolve succeeds, so that a family that
+        # was not found is seen once it is released
+        self._record_repository_states(
+            kwargs.get("package_paths") or config.packages_path)
+
+        kwargs["package_filter"] = PackageFilterList.from_pod(
+            kwargs["package_filter"])
+        kwargs["package_orderers"] = [
+            package_order.from_pod(x) for x in kwargs["package_orderers"]]
+
+        t = time.time()
+
+        # Resolves share variant lists, and the client tracks contexts and
+        # updates the package cache itself. The client's implicit packages are
+        # used, rather than this server's. Note that this server must not send
+        # resolves to itself
+        #
+        settings = dict(
+            shared_variant_caching=True,
+            context_tracking_host='',
+            resolve_server=None,
+            implicit_packages=data["implicit_packages"]
+        )
+
+        try:
+            with _config_overridden(settings):
+                context = ResolvedContext(
+                    data["package_requests"],
+                    package_caching=False,
+                    **kwargs)
+        except Exception as e:
+            return {"error": "%s: %s" % (e.__class__.__name__, str(e))}
+
+        self.num_resolves += 1
+        self._record_path_states()
+
+        if self.verbose:
+            print("[%d] %s (%.3f secs)" % (self.num_resolves, context,
+                                           time.time() - t))
+
+        return {"context": context.to_dict(fields=_result_fields)}
+
+    def _is_running(self):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect(self.socket_path)
+            return True
+        except OSError:
+            return False
+        finally:
+            sock.close()
+
+    def _iter_paths(self):
+        # The family directories of the families loaded so far (which change
+        # when a new version is added), and the root directories of their
+        # repositories (which change when a new family is added). Also the
+        # definition files of the packages whose variants have been loaded
+        # so far (which change when a variant is added to an existing version)
+        #
+        variant_lists = list(shared_package_variant_cache.variant_lists.items())
+
+        for (key, package_name), variant_list in variant_lists:
+            package_paths = key[0]
+
+            for path in package_paths:
+                repo = package_repository_manager.get_repository(path)
+                if repo.name() != "filesystem":
+                    continue
+
+                yield repo.location
+                yield os.path.join(repo.location, package_name)
+
+            for package, value in list(variant_list.entries):
+                if value is not False and package.repository.name() == "filesystem":
+                    filepath = _get_package_filepath(package)
+                    if filepath:
+                        yield filepath
+
+    def _record_path_states(self):
+        for path in self._iter_paths():
+            if path not in self.path_states:
+                self.path_states[path] = _get_mtime(path)
+
+    def _record_repository_states(self, package_paths):
+        for path in package_paths:
+            repo = package_repository_manager.get_repository(path)
+            if repo.name() == "filesystem" \
+                    and repo.location not in self.path_states:
+                self.path_states[repo.location] = _get_mtime(repo.location)
+
+    def _clear_caches_if_changed(self):
+        for path, mtime in self.path_states.items():
+            if _get_mtime(path) != mtime:
+                if self.verbose:
+                    print("%s has changed, clearing caches" % path)
+
+                package_repository_manager.clear_caches()
+                self.path_states = {}
+                return
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def setup(self):
+        # stops a client that never completes its request from blocking others
+        self.timeout = config.resolve_server_timeout
+        super(_RequestHandler, self).setup()
+
+    def handle(self):
+        try:
+            line = self.rfile.readline()
+        except OSError:  # includes timeouts
+            return
+
+        if not line:
+            return
+
+        try:
+            data = json.loads(line.decode("utf-8"))
+            response = self.server.resolve_server.handle_request(data)
+        except Exception as e:
+            response = {"error": "%s: %s" % (e.__class__.__name__, str(e))}
+
+        try:
+            self.wfile.write(json.dumps(response).encode("utf-8") + b'\n')
+        except OSError:
+            pass  # client has gone away, or timed out
+
+
+def resolve_with_server(socket_path, package_requests, implicit_packages,
+                        **kwargs):
+    """Perform a resolve with a resolve server.
+
+    Args:
+        socket_path (str): Path of the server's unix socket.
+        package_requests (list of `PackageRequest`): Request, not including
+            implicit packages.
+        implicit_packages (list of `PackageRequest`): Implicit packages.
+        kwargs: The timestamp, building, caching, package_paths,
+            package_filter, package_orderers, max_fails and time_limit
+            arguments of `ResolvedContext`.
+
+    Returns:
+        dict: The results of the resolve (see `ResolvedContext.to_dict`), or
+        None if the server could not be reached, did not respond within
+        :data:`resolve_server_timeout` seconds, or could not perform the
+        resolve. In these cases the caller should resolve locally.
+    """
+    from rez import package_order
+
+    kwargs = kwargs.copy()
+    kwargs["package_filter"] = kwargs["package_filter"].to_pod()
+    kwargs["package_orderers"] = [
+        package_order.to_pod(x) for x in (kwargs["package_orderers"] or [])]
+
+    data = {
+        "protocol_version": protocol_version,
+        "package_requests": [str(x) for x in package_requests],
+        "implicit_packages": [str(x) for x in implicit_packages],
+        "kwargs": kwargs
+    }
+
+    _print = config.debug_printer("resolve_server")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(config.resolve_server_timeout)
+
+    try:
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(data).encode("utf-8") + b'\n')
+
+        with sock.makefile("rb") as f:
+            line = f.readline()
+
+        response = json.loads(line.decode("utf-8"))
+    except (OSError, ValueError) as e:  # OSError includes timeouts
+        _print("Could not resolve with server %s: %s", socket_path, e)
+        return None
+    finally:
+        sock.close()
+
+    if "error" in response:
+        _print("Resolve server %s failed to resolve: %s", socket_path,
+               response["error"])
+        return None
+
+    return response["context"]
+
+
+@contextmanager
+def _config_overridden(settings):
+    saved = dict(
+        (k, config.overrides[k]) for k in settings
+        if k in config.overrides
+    )
+
+    for key, value in settings.items():
+        config.override(key, value)
+
+    try:
+        yield
+    finally:
+        for key in settings:
+            if key in saved:
+                config.override(key, saved[key])
+            else:
+                config.remove_override(key)
+
+
+def _get_package_filepath(package):
+    # the package.py of a package, or the family file of a 'combined' package
+    resource = package.resource
+    filepath = getattr(resource, "filepath", None)
+    if filepath is None:
+        filepath = getattr(resource.parent, "filepath", None)
+    return filepath
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
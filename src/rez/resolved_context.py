@@ -4,8 +4,9 @@
 
 from rez import __version__, module_root_path
 from rez.package_repository import package_repository_manager
-from rez.solver import SolverCallbackReturn
+from rez.solver import SolverCallbackReturn, SolverSeed
 from rez.resolver import Resolver, ResolverStatus
+from rez.resolve_server import resolve_with_server
 from rez.system import system
 from rez.config import config
 from rez.util import dedup, is_non_string_iterable
@@ -20,10 +21,13 @@ from rez.utils.memcached import pool_memcached_connections
 from rez.utils.logging_ import print_error, print_warning
 from rez.utils.which import which
 from rez.rex import RexExecutor, Python, OutputStyle
+from rez.env_cache import ContextEnvironmentCache
+from rez import compact_context
+from rez.suite_launch import ParentEnvironMarkers, suites_marker
 from rez.rex_bindings import VersionBinding, VariantBinding, \
     VariantsBinding, RequirementsBinding, EphemeralsBinding, intersects
 from rez import package_order
-from rez.packages import get_variant, iter_packages
+from rez.packages import get_variant, iter_packages, scan_package_families
 from rez.package_filter import PackageFilterList
 from rez.package_order import PackageOrderList
 from rez.package_cache import PackageCache
@@ -40,10 +44,14 @@ from rez.utils import json
 from rez.utils.yaml import dump_yaml
 from rez.utils.platform_ import platform_
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from contextlib import contextmanager
 from functools import wraps
 from enum import Enum
+from itertools import count
+import multiprocessing
 import getpass
+import io
 import socket
 import threading
 import time
@@ -52,6 +60,14 @@ import os
 import os.path
 
 
+# rex commands that a precomputed launch environ can represent. Others (such
+# as alias or source) need a shell
+_launchable_commands = frozenset([
+    "setenv", "unsetenv", "resetenv", "prependenv", "appendenv", "comment",
+    "shebang"
+])
+
+
 class RezToolsVisibility(Enum):
     """Determines if/how rez cli tools are added back to PATH within a
     resolved environment.
@@ -167,7 +183,8 @@ class ResolvedContext(object):
                  package_filter=None, package_orderers=None, max_fails=-1,
                  add_implicit_packages=True, time_limit=-1, callback=None,
                  package_load_callback=None, buf=None, suppress_passive=False,
-                 print_stats=False, package_caching=None):
+                 print_stats=False, package_caching=None, seed_context=None,
+                 profile_solve=False):
         """Perform a package resolve, and store the result.
 
         Args:
@@ -205,6 +222,13 @@ class ResolvedContext(object):
             package_caching (bool|None): If True, apply package caching settings
                 as per the config. If None, enable as determined by config
                 setting :data:`package_cache_during_build`.
+            seed_context (ResolvedContext): If provided, perform an incremental
+                resolve that keeps this context's resolved packages wherever
+                they are still valid. This is typically used to patch an
+                existing context. See :class:`.SolverSeed`.
+            profile_solve (bool): If True, gather detailed timing information
+                about the solve, and store it in :attr:`solve_profile`. The
+                resolve cache is not read from in this case.
         """
         self.load_path = None
 
@@ -271,11 +295,13 @@ class ResolvedContext(object):
         self.graph_string = None
         self.graph_ = None
         self.from_cache = None
+        self.from_resolve_server = False
 
         # stats
         self.solve_time = 0.0  # total solve time, inclusive of load time
         self.load_time = 0.0  # total time loading packages (disk or memcache)
         self.num_loaded_packages = 0  # num packages loaded (disk or memcache)
+        self.solve_profile = None  # SolverProfile, if profile_solve is True
 
         # the pre-resolve bindings. We store these because @late package.py
         # functions need them, and we cache them to avoid cost
@@ -298,38 +324,72 @@ class ResolvedContext(object):
 
         request = self.requested_packages(include_implicit=True)
 
-        resolver = Resolver(context=self,
-                            package_requests=request,
-                            package_paths=self.package_paths,
-                            package_filter=self.package_filter,
-                            package_orderers=self.package_orderers,
-                            timestamp=self.requested_timestamp,
-                            building=self.building,
-                            caching=self.caching,
-                            callback=callback_,
-                            package_load_callback=_package_load_callback,
-                            verbosity=verbosity,
-                            buf=buf,
-                            suppress_passive=suppress_passive,
-                            print_stats=print_stats)
-
-        resolver.solve()
-
-        # convert the results
-        self.status_ = resolver.status
-        self.solve_time = resolver.solve_time
-        self.load_time = resolver.load_time
-        self.failure_description = resolver.failure_description
-        self.graph_ = resolver.graph
-        self.from_cache = resolver.from_cache
+        seed = None
+        if seed_context is not None and seed_context.success:
+            seed = SolverSeed(
+                request=seed_context.requested_packages(include_implicit=True),
+                variants=seed_context.resolved_packages,
+                package_paths=seed_context.package_paths,
+                building=seed_context.building
+            )
 
-        if self.status_ == ResolverStatus.solved:
-            self._resolved_packages = []
-            for variant in resolver.resolved_packages:
-                variant.set_context(self)
-                self._resolved_packages.append(variant)
+        server_result = None
+        if config.resolve_server \
+                and callback is None \
+                and package_load_callback is None \
+                and seed is None \
+                and not (verbosity or print_stats or profile_solve):
+            server_result = resolve_with_server(
+                config.resolve_server,
+                self._package_requests,
+                self.implicit_packages,
+                timestamp=self.requested_timestamp,
+                building=self.building,
+                caching=self.caching,
+                package_paths=self.package_paths,
+                package_filter=self.package_filter,
+                package_orderers=self.package_orderers,
+                max_fails=max_fails,
+                time_limit=time_limit)
+
+        if server_result:
+            self._set_server_result(server_result)
+        else:
+            resolver = Resolver(context=self,
+                                package_requests=request,
+                                package_paths=self.package_paths,
+                                package_filter=self.package_filter,
+                                package_orderers=self.package_orderers,
+                                timestamp=self.requested_timestamp,
+                                building=self.building,
+                                caching=self.caching,
+                                callback=callback_,
+                                package_load_callback=_package_load_callback,
+                                verbosity=verbosity,
+                                buf=buf,
+                                suppress_passive=suppress_passive,
+                                print_stats=print_stats,
+                                seed=seed,
+                                profile=profile_solve)
+
+            resolver.solve()
+
+            # convert the results
+            self.status_ = resolver.status
+            self.solve_time = resolver.solve_time
+            self.load_time = resolver.load_time
+            self.failure_description = resolver.failure_description
+            self.graph_ = resolver.graph
+            self.from_cache = resolver.from_cache
+            self.solve_profile = resolver.solve_profile
 
-            self._resolved_ephemerals = resolver.resolved_ephemerals
+            if self.status_ == ResolverStatus.solved:
+                self._resolved_packages = []
+                for variant in resolver.resolved_packages:
+                    variant.set_context(self)
+                    self._resolved_packages.append(variant)
+
+                self._resolved_ephemerals = resolver.resolved_ephemerals
 
         # track context usage
         if config.context_tracking_host:
@@ -339,6 +399,27 @@ class ResolvedContext(object):
         # update package cache
         self._update_package_cache()
 
+    def _set_server_result(self, d):
+        # set the results of a resolve performed by a resolve server. See
+        # `resolve_with_server`
+        self.status_ = ResolverStatus[d["status"]]
+        self.failure_description = d["failure_description"]
+        self.solve_time = d["solve_time"]
+        self.load_time = d["load_time"]
+        self.num_loaded_packages = d["num_loaded_packages"]
+        self.from_cache = d["from_cache"]
+        self.graph_string = d["graph"]
+        self.from_resolve_server = True
+
+        if self.status_ == ResolverStatus.solved:
+            self._resolved_packages = []
+            for variant_handle in d["resolved_packages"]:
+                variant = get_variant(variant_handle, context=self)
+                self._resolved_packages.append(variant)
+
+            self._resolved_ephemerals = [
+                Requirement(x) for x in d["resolved_ephemerals"]]
+
     def __str__(self):
         request = self.requested_packages(include_implicit=True)
         req_str = " ".join(str(x) for x in request)
@@ -642,11 +723,25 @@ class ResolvedContext(object):
 
         return write_dot(self.graph_)
 
-    def save(self, path):
-        """Save the resolved context to file."""
+    def save(self, path, compact=None):
+        """Save the resolved context to file.
+
+        Args:
+            path (str): File to save to.
+            compact (bool): If True, save in the compact binary format (see
+                `rez.compact_context`). If None, :data:`compact_context_files`
+                is used.
+        """
+        if compact is None:
+            compact = config.compact_context_files
+
         with self._detect_bundle(path):
-            with open(path, 'w') as f:
-                self.write_to_buffer(f)
+            if compact:
+                with open(path, 'wb') as f:
+                    self._write_compact(f)
+            else:
+                with open(path, 'w') as f:
+                    self.write_to_buffer(f)
 
     def write_to_buffer(self, buf):
         """Save the context to a buffer."""
@@ -685,10 +780,19 @@ class ResolvedContext(object):
 
     @classmethod
     def load(cls, path):
-        """Load a resolved context from file."""
+        """Load a resolved context from file.
+
+        The file may be in either json or compact format.
+        """
         with cls._detect_bundle(path):
-            with open(path) as f:
-                context = cls.read_from_buffer(f, path)
+            with open(path, 'rb') as f:
+                content = f.read()
+
+            if compact_context.is_compact(content):
+                context = cls._read_compact(content, path)
+            else:
+                buf = io.TextIOWrapper(io.BytesIO(content))
+                context = cls.read_from_buffer(buf, path)
 
         context.set_load_path(path)
         return context
@@ -1120,6 +1224,44 @@ class ResolvedContext(object):
         self._execute(executor)
         return executor.get_output()
 
+    @_on_success
+    def get_launch_environ(self):
+        """Get the environ dict of this context, for launching tools directly.
+
+        Unlike `get_environ`, the result does not depend on the parent
+        environment. References to parent variables are left as markers, which
+        are substituted when a tool is launched (see `rez.suite_launch`). This
+        is only possible if the package commands do nothing other than set
+        environment variables, and do not depend on their environment.
+
+        Returns:
+            2-tuple: The environ dict, and a list of the variables that are
+            unset; or None if the context cannot be launched without a shell.
+        """
+        interp = Python(target_environ={}, passive=True)
+        executor = self._create_executor(interp, ParentEnvironMarkers())
+
+        # package cache roots are host-specific, and may be evicted, so the
+        # result never refers to them
+        with executor.manager.record() as recording:
+            self._execute(executor, suite_paths_marker=suites_marker,
+                          package_caching=False)
+
+        if not recording.replayable:
+            return None
+        if any(name not in _launchable_commands for name, _ in recording.calls):
+            return None
+        if ContextEnvironmentCache.get_nondeterminism(self.resolved_packages):
+            return None
+
+        environ = executor.get_output()
+        unset = [
+            args[0] for name, args in recording.calls
+            if name == "unsetenv" and args[0] not in environ
+        ]
+
+        return environ, unset
+
     @_on_success
     def get_key(self, key, request_only=False):
         """Get a data key value for each resolved package.
@@ -1617,6 +1759,7 @@ class ResolvedContext(object):
         r = ResolvedContext.__new__(ResolvedContext)
         r.load_path = None
         r.pre_resolve_bindings = None
+        r.solve_profile = None
 
         r.timestamp = d["timestamp"]
         r.building = d["building"]
@@ -1644,8 +1787,11 @@ class ResolvedContext(object):
         r.graph_string = d["graph"]
         r.graph_ = None
 
+        # only present in compact context files
+        variant_data = d.get("variant_data") or []
+
         r._resolved_packages = []
-        for d_ in d["resolved_packages"]:
+        for i, d_ in enumerate(d["resolved_packages"]):
             variant_handle = d_
             if load_ver < (4, 0):
                 # -- SINCE SERIALIZE VERSION 4.0
@@ -1655,7 +1801,13 @@ class ResolvedContext(object):
             # -- SINCE SERIALIZE VERSION 4.7
             cls._adjust_variant_for_bundling(variant_handle, out=False)
 
-            variant = get_variant(variant_handle)
+            data = variant_data[i] if i < len(variant_data) else None
+            if data is None:
+                variant = get_variant(variant_handle)
+            else:
+                variant = compact_context.get_variant_from_data(
+                    variant_handle, data)
+
             variant.set_context(r)
             r._resolved_packages.append(variant)
 
@@ -1677,6 +1829,7 @@ class ResolvedContext(object):
         # -- SINCE SERIALIZE VERSION 4.0
 
         r.from_cache = d.get("from_cache", False)
+        r.from_resolve_server = False
 
         # -- SINCE SERIALIZE VERSION 4.1
 
@@ -1920,6 +2073,23 @@ class ResolvedContext(object):
         context = cls.from_dict(doc, identifier_str)
         return context
 
+    def _write_compact(self, buf):
+        doc = self.to_dict()
+        doc["variant_data"] = [
+            compact_context.get_variant_data(variant)
+            for variant in (self._resolved_packages or [])
+        ]
+
+        buf.write(compact_context.dumps(doc))
+
+    @classmethod
+    def _read_compact(cls, content, identifier_str=None):
+        try:
+            doc = compact_context.loads(content)
+            return cls.from_dict(doc, identifier_str)
+        except Exception as e:
+            cls._load_error(e, identifier_str)
+
     @classmethod
     def _load_error(cls, e, path=None):
         exc_name = e.__class__.__name__
@@ -1953,8 +2123,91 @@ class ResolvedContext(object):
         return self.pre_resolve_bindings
 
     @pool_memcached_connections
-    def _execute(self, executor):
+    def _execute(self, executor, suite_paths_marker=None, package_caching=True):
         """Bind various info to the execution context
+
+        If `package_caching` is False, variant roots are never remapped to the
+        package cache, regardless of `self.package_caching`.
+        """
+        resolved_pkgs = self.resolved_packages or []
+        ephemerals = self.resolved_ephemerals or []
+
+        # create variant bindings. Note that here we remap root for cases where
+        # the variant has been cached into the package cache
+        #
+        variant_bindings = {}
+
+        if package_caching and \
+                self.package_caching and \
+                config.cache_packages_path and \
+                config.read_package_cache:
+            pkgcache = self._get_package_cache()
+        else:
+            pkgcache = None
+
+        for pkg in resolved_pkgs:
+            if pkgcache:
+                cached_root = pkgcache.get_cached_root(pkg)
+            else:
+                cached_root = None
+
+            variant_binding = VariantBinding(
+                pkg, cached_root=cached_root, interpreter=executor.interpreter
+            )
+            variant_bindings[pkg.name] = variant_binding
+
+        if pkgcache:
+            pkgcache.metrics.flush()
+
+        # binds objects such as 'request', which are accessible before a resolve
+        pre_resolve_bindings = self._get_pre_resolve_bindings()
+        for k, v in pre_resolve_bindings.items():
+            executor.bind(k, v)
+
+        executor.bind("resolve", VariantsBinding(variant_bindings))
+        executor.bind("ephemerals", EphemeralsBinding(ephemerals))
+
+        # replay the package commands from the environment cache if possible
+        env_cache = ContextEnvironmentCache.for_context(self)
+
+        if env_cache is None:
+            self._execute_commands(executor, variant_bindings)
+        else:
+            key = env_cache.get_key(self, executor.interpreter, variant_bindings)
+            entry = env_cache.get(key)
+
+            if entry is None:
+                with executor.manager.record() as recording:
+                    self._execute_commands(executor, variant_bindings)
+                env_cache.add(key, recording, resolved_pkgs)
+            elif entry.replayable:
+                executor.manager.replay(entry.calls)
+            else:
+                self._execute_commands(executor, variant_bindings)
+
+        header_comment(executor, "post system setup")
+
+        # append suite paths based on suite visibility setting. These are left
+        # to launch time when precomputing a launch environ
+        if suite_paths_marker is None:
+            self._append_suite_paths(executor)
+        elif config.suite_visibility != SuiteVisibility.never.name:
+            executor.env.PATH.append(suite_paths_marker)
+
+        # append system paths
+        if self.append_sys_path:
+            executor.append_system_paths()
+
+        # add rez path so that rez commandline tools are still available within
+        # the resolved environment
+        mode = RezToolsVisibility[config.rez_tools_visibility]
+        if mode == RezToolsVisibility.append:
+            executor.append_rez_path()
+        elif mode == RezToolsVisibility.prepend:
+            executor.prepend_rez_path()
+
+    def _execute_commands(self, executor, variant_bindings):
+        """Apply the context variables, and each resolved package's commands.
         """
         def normalized(path):
             return executor.normalize_path(path)
@@ -2003,37 +2256,6 @@ class ResolvedContext(object):
             executor.setenv("REZ_RAW_REQUEST", request_str_)
             executor.setenv("REZ_RESOLVE_MODE", "latest")
 
-        # create variant bindings. Note that here we remap root for cases where
-        # the variant has been cached into the package cache
-        #
-        variant_bindings = {}
-
-        if self.package_caching and \
-                config.cache_packages_path and \
-                config.read_package_cache:
-            pkgcache = self._get_package_cache()
-        else:
-            pkgcache = None
-
-        for pkg in resolved_pkgs:
-            if pkgcache:
-                cached_root = pkgcache.get_cached_root(pkg)
-            else:
-                cached_root = None
-
-            variant_binding = VariantBinding(
-                pkg, cached_root=cached_root, interpreter=executor.interpreter
-            )
-            variant_bindings[pkg.name] = variant_binding
-
-        # binds objects such as 'request', which are accessible before a resolve
-        pre_resolve_bindings = self._get_pre_resolve_bindings()
-        for k, v in pre_resolve_bindings.items():
-            executor.bind(k, v)
-
-        executor.bind("resolve", VariantsBinding(variant_bindings))
-        executor.bind("ephemerals", EphemeralsBinding(ephemerals))
-
         #
         # -- apply each resolved package to the execution context
         #
@@ -2122,23 +2344,6 @@ class ResolvedContext(object):
                 varname = "REZ_EPH_" + uname + "_REQUEST"
                 executor.setenv(varname, str(eph_req.range))
 
-        header_comment(executor, "post system setup")
-
-        # append suite paths based on suite visibility setting
-        self._append_suite_paths(executor)
-
-        # append system paths
-        if self.append_sys_path:
-            executor.append_system_paths()
-
-        # add rez path so that rez commandline tools are still available within
-        # the resolved environment
-        mode = RezToolsVisibility[config.rez_tools_visibility]
-        if mode == RezToolsVisibility.append:
-            executor.append_rez_path()
-        elif mode == RezToolsVisibility.prepend:
-            executor.prepend_rez_path()
-
     def _append_suite_paths(self, executor):
         from rez.suite import Suite
 
@@ -2168,3 +2373,164 @@ class ResolvedContext(object):
         for path in suite_paths:
             tools_path = os.path.join(path, "bin")
             executor.env.PATH.append(tools_path)
+
+
+def resolve_many(package_requests_list, max_workers=None, callback=None,
+                 **kwargs):
+    """Resolve many requests, in a pool of processes.
+
+    Before the pool is created, the packages of the requested families (and of
+    the families they require) are loaded, so that every worker process is
+    forked with them already cached. Each worker also shares variant lists
+    between the resolves it performs (see :data:`shared_variant_caching`).
+
+    Where processes cannot be forked (such as on Windows), requests are
+    resolved one at a time instead.
+
+    Args:
+        package_requests_list (list[list[typing.Union[str, PackageRequest]]]):
+            Requests to resolve.
+        max_workers (int): Maximum number of worker processes. Defaults to
+            the number of cpus.
+        callback (typing.Callable): If not None, called with arguments (index,
+            result) as each resolve completes, where ``result`` is as in the
+            returned list.
+        kwargs: Arguments passed to :class:`ResolvedContext` for every
+            request, such as ``package_paths`` or ``timestamp``.
+
+    Returns:
+        list[typing.Union[ResolvedContext, Exception]]: Contexts, in the same
+        order as ``package_requests_list``. Note that a failed resolve gives a
+        context also. If resolving a request raised an error (for example,
+        because it was malformed), the exception is given instead.
+    """
+    package_requests_list = list(package_requests_list)
+    results = [None] * len(package_requests_list)
+
+    def _set_result(index, result):
+        results[index] = result
+        if callback:
+            callback(index, result)
+
+    if not package_requests_list:
+        return results
+
+    if max_workers == 1 \
+            or len(package_requests_list) == 1 \
+            or "fork" not in multiprocessing.get_all_start_methods():
+        for i, package_requests in enumerate(package_requests_list):
+            try:
+                result = ResolvedContext(package_requests, **kwargs)
+            except Exception as e:
+                result = e
+            _set_result(i, result)
+
+        return results
+
+    _load_requested_package_families(package_requests_list, **kwargs)
+
+    batch_id = next(_batch_ids)
+    _batch_resolves[batch_id] = (package_requests_list, kwargs)
+
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("fork")
+    )
+
+    futures = {}
+    try:
+        for i in range(len(package_requests_list)):
+            future = executor.submit(_resolve_in_subprocess, batch_id, i)
+            futures[future] = i
+
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                result = ResolvedContext.from_dict(future.result())
+            except Exception as e:
+                result = e
+            _set_result(i, result)
+
+    except BaseException:
+        # eg KeyboardInterrupt. Running resolves are left to finish
+        for future in futures:
+            future.cancel()
+        raise
+
+    finally:
+        executor.shutdown(wait=True)
+        del _batch_resolves[batch_id]
+
+    return results
+
+
+# requests and kwargs of each call to `resolve_many`. These are inherited by
+# forked worker processes, and so don't need pickling
+_batch_resolves = {}
+_batch_ids = count()
+
+
+def _resolve_in_subprocess(batch_id, index):
+    package_requests_list, kwargs = _batch_resolves[batch_id]
+
+    # this only affects the worker process
+    config.override("shared_variant_caching", True)
+
+    context = ResolvedContext(package_requests_list[index], **kwargs)
+    return context.to_dict()
+
+
+def _load_requested_package_families(package_requests_list, package_paths=None,
+                                     building=False, add_implicit_packages=True,
+                                     **kwargs):
+    # Load the packages of requested families, and of the families they
+    # require, transitively. Requirements are taken from all versions, so this
+    # loads every family that the resolves could visit.
+    #
+    if package_paths is None:
+        package_paths = config.packages_path
+
+    names = set()
+    for package_requests in package_requests_list:
+        for req in package_requests:
+            if isinstance(req, str):
+                try:
+                    req = PackageRequest(req)
+                except Exception:
+                    continue  # the error is given by the request's resolve
+            names.add(req.name)
+
+    if add_implicit_packages:
+        names.update(PackageRequest(x).name for x in config.implicit_packages)
+
+    def _get_required_names(name, packages):
+        names_ = set()
+
+        for package in packages:
+            for variant in package.iter_variants():
+                try:
+                    requires = variant.get_requires(build_requires=building)
+                except Exception:
+                    # eg, a late bound requires that expects a context. The
+                    # family is still loaded by the solve that needs it
+                    continue
+
+                names_.update(x.name for x in requires)
+
+        return names_
+
+    loaded_names = set()
+    names = set(x for x in names if not x.startswith('.'))
+
+    while names:
+        loaded_names.update(names)
+        required_names = set()
+
+        for _, names_ in scan_package_families(_get_required_names, names,
+                                               paths=package_paths):
+            required_names.update(names_)
+
+        names = set(
+            x for x in required_names
+            if not x.startswith('.') and x not in loaded_names
+        )
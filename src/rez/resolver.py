@@ -6,11 +6,11 @@ from rez.solver import Solver, SolverStatus
 from rez.package_repository import package_repository_manager
 from rez.packages import get_variant, get_last_release_time
 from rez.package_filter import PackageFilterList, TimestampRule
-from rez.utils.memcached import memcached_client, pool_memcached_connections
+from rez.resolve_cache import get_resolve_cache
+from rez.utils.memcached import pool_memcached_connections
 from rez.utils.logging_ import log_duration
 from rez.config import config
 from rez.version import Requirement
-from contextlib import contextmanager
 from enum import Enum
 from hashlib import sha1
 
@@ -38,7 +38,7 @@ class Resolver(object):
     def __init__(self, context, package_requests, package_paths, package_filter=None,
                  package_orderers=None, timestamp=0, callback=None, building=False,
                  verbosity=False, buf=None, package_load_callback=None, caching=True,
-                 suppress_passive=False, print_stats=False):
+                 suppress_passive=False, print_stats=False, seed=None, profile=False):
         """Create a Resolver.
 
         Args:
@@ -53,8 +53,15 @@ class Resolver(object):
                 `Package` object.
             building: True if we're resolving for a build.
             caching: If True, cache(s) may be used to speed the resolve. If
-                False, caches will not be used.
+                False, caches will not be used. See `get_resolve_cache` for
+                the cache backend that is used.
             print_stats (bool): If true, print advanced solver stats at the end.
+            seed (`SolverSeed`): If provided, perform an incremental solve based
+                on a previous solve. Seeded solves are never cached, since
+                their result depends on the seed as well as the request.
+            profile (bool): If True, profile the solve (see `SolverProfile`).
+                The resolve cache is not read from in this case, since a cached
+                resolve would not run the solver.
         """
         self.context = context
         self.package_requests = package_requests
@@ -69,6 +76,8 @@ class Resolver(object):
         self.buf = buf
         self.suppress_passive = suppress_passive
         self.print_stats = print_stats
+        self.seed = seed
+        self.profile = profile
 
         # store hash of package orderers. This is used in the memcached key
         if package_orderers:
@@ -101,10 +110,11 @@ class Resolver(object):
         self.failure_description = None
         self.graph_ = None
         self.from_cache = False
-        self.memcached_servers = config.memcached_uri if config.resolve_caching else None
+        self.cache = get_resolve_cache() if caching else None
 
         self.solve_time = 0.0  # time spent solving
         self.load_time = 0.0   # time spent loading package resources
+        self.solve_profile = None  # `SolverProfile`, if profiling
 
         self._print = config.debug_printer("resolve_memcache")
 
@@ -112,8 +122,11 @@ class Resolver(object):
     def solve(self):
         """Perform the solve.
         """
-        with log_duration(self._print, "memcache get (resolve) took %s"):
-            solver_dict = self._get_cached_solve()
+        if self.profile:
+            solver_dict = None
+        else:
+            with log_duration(self._print, "cache get (resolve) took %s"):
+                solver_dict = self._get_cached_solve()
 
         if solver_dict:
             self.from_cache = True
@@ -121,10 +134,11 @@ class Resolver(object):
         else:
             self.from_cache = False
             solver = self._solve()
+            self.solve_profile = solver.profile
             solver_dict = self._solver_to_dict(solver)
             self._set_result(solver_dict)
 
-            with log_duration(self._print, "memcache set (resolve) took %s"):
+            with log_duration(self._print, "cache set (resolve) took %s"):
                 self._set_cached_solve(solver_dict)
 
     @property
@@ -171,10 +185,10 @@ class Resolver(object):
         return get_variant(variant_handle, context=self.context)
 
     def _get_cached_solve(self):
-        """Find a memcached resolve.
+        """Find a cached resolve.
 
         If there is NOT a resolve timestamp:
-            - fetch a non-timestamped memcache entry;
+            - fetch a non-timestamped cache entry;
             - if no entry, then fail;
             - if packages have changed, then:
               - delete the entry;
@@ -186,7 +200,7 @@ class Resolver(object):
               - fail.
 
         If there IS a resolve timestamp (let us call this T):
-            - fetch a non-timestamped memcache entry;
+            - fetch a non-timestamped cache entry;
             - if entry then:
               - if no packages have changed, then:
                 - if no packages in the entry have been released since:
@@ -196,7 +210,7 @@ class Resolver(object):
                   - delete the entry;
               - else:
                 - delete the entry;
-            - fetch a timestamped (T) memcache entry;
+            - fetch a timestamped (T) cache entry;
             - if no entry, then fail;
             - if packages have changed, then:
               - delete the entry;
@@ -211,7 +225,7 @@ class Resolver(object):
         consider a workflow where a work area is tied down to a particular
         timestamp in order to 'lock' it from any further software releases).
         """
-        if not (self.caching and self.memcached_servers):
+        if not (self.caching and self.cache) or self.seed:
             return None
 
         # these caches avoids some potentially repeated file stats
@@ -227,15 +241,13 @@ class Resolver(object):
             return None
 
         def _delete_cache_entry(key):
-            with self._memcached_client() as client:
-                client.delete(key)
+            self.cache.delete(key)
             self._print("Discarded entry: %r", key)
 
         def _retrieve(timestamped):
             key = self._memcache_key(timestamped=timestamped)
-            self._print("Retrieving memcache key: %r", key)
-            with self._memcached_client() as client:
-                data = client.get(key)
+            self._print("Retrieving %s cache key: %r", self.cache.name, key)
+            data = self.cache.get(key)
             return key, data
 
         def _packages_changed(key, data):
@@ -316,14 +328,8 @@ class Resolver(object):
             else:
                 return _hit(data)
 
-    @contextmanager
-    def _memcached_client(self):
-        with memcached_client(self.memcached_servers,
-                              debug=config.debug_memcache) as client:
-            yield client
-
     def _set_cached_solve(self, solver_dict):
-        """Store a solve to memcached.
+        """Store a solve to the cache.
 
         If there is NOT a resolve timestamp:
             - store the solve to a non-timestamped entry.
@@ -337,7 +343,7 @@ class Resolver(object):
         if self.status_ != ResolverStatus.solved:
             return  # don't cache failed solves
 
-        if not (self.caching and self.memcached_servers):
+        if not (self.caching and self.cache) or self.seed:
             return
 
         # most recent release times get stored with solve result in the cache
@@ -350,7 +356,7 @@ class Resolver(object):
 
             # don't cache if a release time isn't known
             if time_ == 0:
-                self._print("Did not send memcache key: a repository could "
+                self._print("Did not store cache key: a repository could "
                             "not provide a most recent release time for %r",
                             variant.name)
                 return
@@ -366,12 +372,11 @@ class Resolver(object):
         timestamped = (self.timestamp and releases_since_solve)
         key = self._memcache_key(timestamped=timestamped)
         data = (solver_dict, release_times_dict, variant_states_dict)
-        with self._memcached_client() as client:
-            client.set(key, data)
-        self._print("Sent memcache key: %r", key)
+        self.cache.set(key, data)
+        self._print("Stored %s cache key: %r", self.cache.name, key)
 
     def _memcache_key(self, timestamped=False):
-        """Makes a key suitable as a memcache entry."""
+        """Makes a key suitable as a resolve cache entry."""
         request = tuple(map(str, self.package_requests))
         repo_ids = []
         for path in self.package_paths:
@@ -404,7 +409,9 @@ class Resolver(object):
                         prune_unfailed=config.prune_failed_graph,
                         buf=self.buf,
                         suppress_passive=self.suppress_passive,
-                        print_stats=self.print_stats)
+                        print_stats=self.print_stats,
+                        seed=self.seed,
+                        profile=self.profile)
         solver.solve()
 
         return solver
@@ -169,6 +169,25 @@ class OutputStyle(Enum):
     eval = ("Code in a form that can be evaluated.", )
 
 
+class ActionRecording(object):
+    """Commands run on an `ActionManager`, recorded so they can be replayed.
+
+    Values are recorded after formatting, but before environment variable
+    expansion - expansion happens again when the recording is replayed. Code
+    that queries the environment (via `getenv`, `defined` etc) cannot be
+    replayed safely, since the queries may give different results next time.
+    These queries are recorded in `queries`.
+    """
+    def __init__(self):
+        self.calls = []  # list of (command name, args) tuples
+        self.queries = []  # names of environment queries that were made
+
+    @property
+    def replayable(self):
+        """True if no environment queries were made."""
+        return not self.queries
+
+
 class ActionManager(object):
     """Handles the execution book-keeping.  Tracks env variable values, and
     triggers the callbacks of the `ActionInterpreter`.
@@ -198,6 +217,7 @@ class ActionManager(object):
         self.environ = {}
         self.formatter = formatter or str
         self.actions = []
+        self.recording = None
 
         self._env_sep_map = env_sep_map if env_sep_map is not None \
             else config.env_var_separators
@@ -221,6 +241,52 @@ class ActionManager(object):
             ('defined', self.defined),
             ('undefined', self.undefined)]
 
+    @contextmanager
+    def record(self):
+        """Record the commands run within this context.
+
+        Recordings may be nested, in which case the outer recording also
+        contains everything recorded by the inner one.
+
+        Yields:
+            `ActionRecording`: The recording.
+        """
+        prev_recording = self.recording
+        recording = ActionRecording()
+        self.recording = recording
+
+        try:
+            yield recording
+        finally:
+            self.recording = prev_recording
+            if prev_recording is not None:
+                prev_recording.calls.extend(recording.calls)
+                prev_recording.queries.extend(recording.queries)
+
+    def replay(self, calls):
+        """Run commands previously recorded with `record`.
+
+        Args:
+            calls (list of tuple): `ActionRecording.calls`.
+        """
+        # values were formatted when they were recorded
+        formatter = self.formatter
+        self.formatter = str
+
+        try:
+            for name, args in calls:
+                getattr(self, name)(*args)
+        finally:
+            self.formatter = formatter
+
+    def _record(self, name, *args):
+        if self.recording is not None:
+            self.recording.calls.append((name, args))
+
+    def _record_query(self, name):
+        if self.recording is not None:
+            self.recording.queries.append(name)
+
     def _env_sep(self, name):
         return self._env_sep_map.get(name, self.interpreter.pathsep)
 
@@ -271,6 +337,7 @@ class ActionManager(object):
     # -- Commands
 
     def undefined(self, key):
+        self._record_query("undefined")
         _, expanded_key = self._key(key)
         return (
             expanded_key not in self.environ
@@ -281,11 +348,13 @@ class ActionManager(object):
         return not self.undefined(key)
 
     def expandvars(self, value, format=True):
+        self._record_query("expandvars")
         if format:
             value = str(self._format(value))
         return str(self._expand(value))
 
     def getenv(self, key):
+        self._record_query("getenv")
         _, expanded_key = self._key(key)
         try:
             return self.environ[expanded_key] if expanded_key in self.environ \
@@ -299,6 +368,7 @@ class ActionManager(object):
         unexpanded_value, expanded_value = self._value(value)
 
         # TODO: check if value has already been set by another package
+        self._record("setenv", unexpanded_key, unexpanded_value)
         self.actions.append(Setenv(unexpanded_key, unexpanded_value))
         self.environ[expanded_key] = str(expanded_value)
 
@@ -310,6 +380,7 @@ class ActionManager(object):
 
     def unsetenv(self, key):
         unexpanded_key, expanded_key = self._key(key)
+        self._record("unsetenv", unexpanded_key)
         self.actions.append(Unsetenv(unexpanded_key))
 
         if expanded_key in self.environ:
@@ -324,6 +395,7 @@ class ActionManager(object):
         unexpanded_key, expanded_key = self._key(key)
         unexpanded_value, expanded_value = self._value(value)
 
+        self._record("resetenv", unexpanded_key, unexpanded_value, friends)
         action = Resetenv(unexpanded_key, unexpanded_value, friends)
         self.actions.append(action)
         self.environ[expanded_key] = str(expanded_value)
@@ -337,6 +409,7 @@ class ActionManager(object):
     def _pendenv(self, key, value, action, interpfunc, addfunc):
         unexpanded_key, expanded_key = self._key(key)
         unexpanded_value, expanded_value = self._value(value)
+        self._record(action.name, unexpanded_key, unexpanded_value)
 
         # expose env-vars from parent env if explicitly told to do so
         if (expanded_key not in self.environ) and \
@@ -399,16 +472,19 @@ class ActionManager(object):
     def alias(self, key, value):
         key = str(self._format(key))
         value = str(self._format(value))
+        self._record("alias", key, value)
         self.actions.append(Alias(key, value))
         self.interpreter.alias(key, value)
 
     def info(self, value=''):
         value = self._format(value)
+        self._record("info", value)
         self.actions.append(Info(value))
         self.interpreter.info(value)
 
     def error(self, value):
         value = self._format(value)
+        self._record("error", value)
         self.actions.append(Error(value))
         self.interpreter.error(value)
 
@@ -418,20 +494,24 @@ class ActionManager(object):
 
     def command(self, value):
         # Note: Value is deliberately not formatted in commands
+        self._record("command", value)
         self.actions.append(Command(value))
         self.interpreter.command(value)
 
     def comment(self, value):
         value = str(self._format(value))
+        self._record("comment", value)
         self.actions.append(Comment(value))
         self.interpreter.comment(value)
 
     def source(self, value):
         value = str(self._format(value))
+        self._record("source", value)
         self.actions.append(Source(value))
         self.interpreter.source(value)
 
     def shebang(self):
+        self._record("shebang")
         self.actions.append(Shebang())
         self.interpreter.shebang()
 
@@ -1104,6 +1184,7 @@ class EnvironmentDict(MutableMapping):
                                for k in manager.parent_environ.keys())
 
     def keys(self):
+        self.manager._record_query("keys")
         return self._var_cache.keys()
 
     def __repr__(self):
@@ -1118,16 +1199,19 @@ class EnvironmentDict(MutableMapping):
         self[key].set(value)
 
     def __contains__(self, key):
+        self.manager._record_query("contains")
         return (key in self._var_cache)
 
     def __delitem__(self, key):
         del self._var_cache[key]
 
     def __iter__(self):
+        self.manager._record_query("iter")
         for key in self._var_cache.keys():
             yield key
 
     def __len__(self):
+        self.manager._record_query("len")
         return len(self._var_cache)
 
 
@@ -161,6 +161,15 @@ cache_listdir = True
 # of unlimited size. The size refers to the number of entries, not byte count.
 resource_caching_maxsize = -1
 
+# Share the solver's lists of package variants between resolves in the same
+# process. Normally every resolve loads the packages of each family it visits,
+# and wraps their variants for the solver. When enabled, this is done once per
+# family, for all resolves that use the same package paths, package filter and
+# build mode. This is useful for tools that perform many resolves in one process.
+# Note that packages released after a family is first loaded are not seen until
+# the package repository caches are cleared.
+shared_variant_caching = False
+
 # Uris of running memcached server(s) to use as a file and resolve cache. For
 # example, the URI ``127.0.0.1:11211`` points to memcached running on localhost on
 # its default port. Must be either None, or a list of strings.
@@ -182,6 +191,61 @@ memcached_listdir_min_compress_len = 16384
 # means never compress.
 memcached_resolve_min_compress_len = 1
 
+# Path of a local, file-based resolve cache. This is used to cache resolves when
+# no memcached server is configured (see :data:`memcached_uri`), for example on
+# render nodes or laptops that cannot reach a memcached server. Cached resolves
+# are invalidated in exactly the same way as memcached resolves. The cache is a
+# single sqlite database, and can be shared by concurrent processes on the same
+# host. It should not be placed on shared network storage.
+resolve_cache_path = None
+
+# Maximum size of the file-based resolve cache, in megabytes. When this size is
+# exceeded, the least recently used resolves are evicted. Zero means no limit.
+resolve_cache_max_size = 100
+
+# Path of the unix socket of a local resolve server (see :ref:`rez-resolve-server`).
+# When set, resolves are sent to the server, which keeps package repository and
+# solver caches warm between resolves, and so resolves much faster than a new rez
+# process can. If the server cannot be reached, the resolve is performed locally.
+# Resolves that use callbacks, verbosity, profiling or an incremental seed are
+# always performed locally. Note that the server resolves with its own config,
+# other than the request, implicit packages, package paths, filters and orderers.
+# This is typically set via the ``REZ_RESOLVE_SERVER`` environment variable.
+resolve_server = None
+
+# Timeout, in seconds, of communication with a resolve server. This includes
+# waiting for the server to perform the resolve, and for it to finish any other
+# resolves that it is busy with (a server performs one resolve at a time). If the
+# timeout expires, the resolve is performed locally, so this should be kept short.
+# The server uses the same timeout when reading requests from clients.
+resolve_server_timeout = 3.0
+
+# Cache the environment generated by contexts that are loaded from file (such
+# as suite contexts, or those given to ``rez-env --input``). The rex commands
+# that the context's packages generate are stored in a ``.envcache`` file next
+# to the ``.rxt`` file, and replayed rather than re-executed next time the
+# context is used. Packages whose commands query the environment or the host
+# (for example via ``getenv``, ``defined`` or an ``import``) are detected, and
+# contexts containing them are never replayed. Errors writing the cache file
+# (for example, if the context is read-only) are ignored.
+context_env_caching = False
+
+# Save context (``.rxt``) files in a compact binary format, rather than as json.
+# Compact files are much faster to load, and contain a copy of the definition of
+# every resolved package, so that the context's environment can be configured
+# without reading package definitions from the package repositories. Compact
+# files are always readable, regardless of this setting. Note that they are not
+# human readable, and can only be read by rez itself.
+compact_context_files = False
+
+# Path of a directory in which to cache plugin manifests. Rez normally searches
+# every plugin path for plugins, and loads their rezconfig files, on every
+# invocation. A manifest records the plugins found (and their settings), and is
+# used instead until a plugin path or rezconfig file changes. Either way, a
+# plugin's module is only imported when the plugin is first used. Errors writing
+# the manifest (for example, if the directory is read-only) are ignored.
+plugin_cache_path = None
+
 
 ###############################################################################
 # Package Copy
@@ -218,6 +282,19 @@ default_relocatable_per_package = None
 #    }
 default_relocatable_per_repository = None
 
+# Number of threads used to copy the files of a package payload, when copying
+# a package (for example with :ref:`rez-cp`, or when bundling a context).
+# Copying files concurrently is much faster over network storage, where each
+# file copy is usually bound by latency rather than bandwidth.
+package_copy_threads = 8
+
+# If True, a package payload file that is identical to the same file in
+# another version of the package in the destination repository is hardlinked
+# to that file, rather than copied. This saves space in repositories with many
+# versions of large packages whose files rarely change. Note that hardlinked
+# files share permissions and timestamps.
+package_copy_hardlink_duplicates = False
+
 
 ###############################################################################
 # Package Caching
@@ -287,11 +364,31 @@ package_cache_local = False
 # purposes.
 package_cache_same_device = False
 
+# If True, the package cache stores each payload file once only, by content
+# hash, and hardlinks it into every cached variant that contains it. This saves
+# a lot of disk space when many versions of large packages are cached, whose
+# files are mostly unchanged between versions. Files that are no longer part of
+# any cached variant are deleted when the cache is cleaned. Note that hardlinked
+# files share their timestamps, so a cached file's mtime may differ from the
+# original's. Changing this setting does not affect variants already cached.
+package_cache_content_addressed = False
+
 # If > 0, spend up to this many seconds cleaning the cache every time the cache
 # is updated. This is a way to keep the cache size under control without having
 # to periodically run :option:`rez-pkg-cache --clean`. Set to -1 to disable.
 package_cache_clean_limit = 0.5
 
+# Number of variants that are copied into the package cache at once, both by
+# the process that updates the cache after a resolve, and by
+# :option:`rez-pkg-cache --prefetch`.
+package_cache_workers = 4
+
+# Number of days of package cache metrics to keep. Metrics include cache hits
+# and misses, and the amount of data copied into the cache. They are written
+# to :file:`{pkg-cache-root}/.sys/metrics`, and are shown by
+# :option:`rez-pkg-cache --stats`. Set to zero to disable metrics.
+package_cache_metrics_days = 30
+
 # Number of days of package cache logs to keep.
 # Logs are written to :file:`{pkg-cache-root}/.sys/log/{filename}.log`
 package_cache_log_days = 7
@@ -776,6 +873,9 @@ debug_package_exclusions = False
 # Print debugging info related to use of memcached during a resolve
 debug_resolve_memcache = False
 
+# Print debugging info related to use of a resolve server (see :data:`resolve_server`)
+debug_resolve_server = False
+
 # Debug memcache usage. As well as printing debugging info to stdout, it also
 # sends human-readable strings as memcached keys (that you can read by running
 # ``memcached -vv`` as the server)
@@ -858,6 +958,17 @@ use_variant_shortlinks = True
 # clash with the wrapped tools" own commandline arguments.
 suite_alias_prefix_char = "+"
 
+# If True, saving a suite also writes a launch manifest, containing the
+# precomputed environment of each context. Suite tools are then launched
+# directly from the manifest, which is much faster than loading the suite and
+# running the tool in a shell. Note that package commands are executed only
+# once, when the suite is saved - changes to the resolved packages are not
+# picked up until the suite is saved again. Contexts whose package commands
+# need a shell (for example, they create aliases) or query the environment are
+# left out of the manifest, and their tools are launched as normal. Tools are
+# also launched as normal if any rez arguments (such as ``+i``) are given.
+suite_fast_launch = False
+
 
 ###############################################################################
 # Appearance
@@ -916,6 +1027,13 @@ max_package_changelog_chars = 65536
 # If not zero, truncates all package changelogs to only show the last N commits
 max_package_changelog_revisions = 0
 
+# Number of threads used to load packages when scanning many package families,
+# such as in :ref:`rez-depends` and :ref:`rez-search`. This work is dominated by
+# filesystem latency, so it benefits from more threads than there are cores,
+# especially when packages are on network storage. Set to 1 to load packages
+# serially.
+package_scan_workers = 8
+
 # Default option on how to create scripts with :func:`~rez.utils.execution.create_executable_script`.
 # In order to support both windows and other OS it is recommended to set this
 # to ``both``.
@@ -180,6 +180,8 @@ def _load_file(filepath, format_, update_data_callback, original_filepath=None):
 
 _set_objects = threading.local()
 
+_sys_path_lock = threading.RLock()
+
 
 # Default variables to avoid not-defined errors in early-bound attribs
 default_objects = {
@@ -227,9 +229,16 @@ def load_py(stream, filepath=None):
     Returns:
         dict:
     """
-    with add_sys_paths(config.package_definition_build_python_paths):
+    paths = config.package_definition_build_python_paths
+    if not paths:
         return _load_py(stream, filepath=filepath)
 
+    # sys.path is process-wide, so concurrent loads (see
+    # `rez.packages.scan_package_families`) must not interleave their changes
+    with _sys_path_lock:
+        with add_sys_paths(paths):
+            return _load_py(stream, filepath=filepath)
+
 
 def _load_py(stream, filepath=None):
     scopes = ScopeContext()
@@ -12,10 +12,11 @@ with a faster resolve.
 See SOLVER.md for an in-depth description of how this module works.
 """
 from rez.config import config
-from rez.packages import iter_packages
-from rez.package_repository import package_repo_stats
+from rez.packages import Package, iter_packages, prefetch_package_families
+from rez.package_repository import package_repository_manager, \
+    package_repo_stats
+from rez.utils.sourcecode import SourceCode
 from rez.utils.logging_ import print_debug
-from rez.utils.data_utils import cached_property
 from rez.vendor.pygraph.classes.digraph import digraph
 from rez.vendor.pygraph.algorithms.cycles import find_cycle
 from rez.vendor.pygraph.algorithms.accessibility import accessibility
@@ -23,9 +24,11 @@ from rez.exceptions import PackageNotFoundError, ResolveError, \
     PackageFamilyNotFoundError, RezSystemError
 from rez.version import VersionRange
 from rez.version import VersionedObject, Requirement, RequirementList
-from contextlib import contextmanager
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager, nullcontext
 from enum import Enum
-from itertools import product, chain
+import heapq
+import threading
 import copy
 import time
 import sys
@@ -38,6 +41,10 @@ import os
 _force_unoptimised_solver = (os.getenv("_FORCE_REZ_UNOPTIMISED_SOLVER") == "1")
 
 
+# returned by `Solver.profiled` when profiling is disabled
+_null_context = nullcontext()
+
+
 # the 'solver version' is an internal version number that changes if the
 # behaviour of the solver changes in a way that potentially changes the result
 # of a solve.
@@ -154,7 +161,134 @@ class SolverState(object):
                 % (self.num_solves, self.num_fails, str(self.phase)))
 
 
+class SolverProfile(object):
+    """Detailed timing information about a solve.
+
+    A profile is gathered when a `Solver` is created with `profile=True`. Time
+    and counts are recorded per solver operation (such as 'reduce' or
+    'intersect'), per package family, and per phase depth. Time spent loading
+    packages from their repositories during each operation is recorded
+    separately as 'load_time'.
+
+    Operations can nest (for example, an intersection may need to list a
+    package family), so the times recorded for an operation are inclusive.
+    """
+    def __init__(self):
+        self.depth = 0
+        self.total_time = 0.0
+        self.load_time = 0.0
+        self.operations = {}  # {operation: [count, time, load_time]}
+        self.families = {}  # {family: {operation: [count, time, load_time]}}
+        self.depths = {}  # {depth: {operation: [count, time, load_time]}}
+        self.stacks = {}  # {stack: exclusive time}
+        self._frames = []
+
+    @contextmanager
+    def record(self, operation, family=None):
+        """Record a solver operation.
+
+        Args:
+            operation (str): Name of the operation.
+            family (str): Package family the operation applies to, if any.
+        """
+        frame = [operation, family, 0.0, 0.0]  # last two are child times
+        self._frames.append(frame)
+        t1 = time.time()
+        lt1 = package_repo_stats.package_load_time
+
+        try:
+            yield
+        finally:
+            secs = time.time() - t1
+            load_secs = package_repo_stats.package_load_time - lt1
+            self._frames.pop()
+            self._add(frame, secs, load_secs)
+
+    def to_dict(self):
+        """Get the profile as a JSON-compatible dict.
+
+        The 'folded_stacks' entry lists exclusive times in microseconds, in the
+        'folded' format read by flamegraph tools (such as flamegraph.pl and
+        speedscope), eg "depth 2;reduce;foo 1530".
+
+        Returns:
+            dict: Profile data.
+        """
+        def _entries(d):
+            return dict(
+                (k, {"count": v[0], "time": v[1], "load_time": v[2]})
+                for k, v in d.items()
+            )
+
+        return {
+            "total_time": self.total_time,
+            "load_time": self.load_time,
+            "operations": _entries(self.operations),
+            "families": dict(
+                (k, _entries(v)) for k, v in sorted(self.families.items())),
+            "depths": dict(
+                (str(k), _entries(v)) for k, v in sorted(self.depths.items())),
+            "folded_stacks": self.get_folded_stacks()
+        }
+
+    def get_folded_stacks(self):
+        """Get exclusive times in flamegraph 'folded' format.
+
+        Returns:
+            list of str: Lines of the form "frame;frame;... microseconds".
+        """
+        lines = []
+        for stack, secs in sorted(self.stacks.items()):
+            usecs = int(secs * 1000000)
+            if usecs:
+                lines.append("%s %d" % (stack, usecs))
+        return lines
+
+    def _add(self, frame, secs, load_secs):
+        operation, family, child_secs, child_load_secs = frame
+
+        def _update(d):
+            entry = d.get(operation)
+            if entry is None:
+                d[operation] = [1, secs, load_secs]
+            else:
+                entry[0] += 1
+                entry[1] += secs
+                entry[2] += load_secs
+
+        _update(self.operations)
+        _update(self.depths.setdefault(self.depth, {}))
+        if family is not None:
+            _update(self.families.setdefault(family, {}))
+
+        if self._frames:
+            parent = self._frames[-1]
+            parent[2] += secs
+            parent[3] += load_secs
+        else:
+            self.total_time += secs
+            self.load_time += load_secs
+
+        # exclusive times, with package loads as a leaf frame
+        labels = ["depth %d" % self.depth]
+        for frame_ in (self._frames + [frame]):
+            labels.append(frame_[0])
+            if frame_[1] is not None:
+                labels.append(frame_[1])
+
+        stack = ';'.join(labels)
+        own_load_secs = load_secs - child_load_secs
+        own_secs = secs - child_secs - own_load_secs
+        self.stacks[stack] = self.stacks.get(stack, 0.0) + own_secs
+
+        if own_load_secs:
+            stack += ";package_load"
+            self.stacks[stack] = self.stacks.get(stack, 0.0) + own_load_secs
+
+
 class _Common(object):
+    __slots__ = ()
+
     def __repr__(self):
         return "%s(%s)" % (self.__class__.__name__, str(self))
 
@@ -162,6 +296,9 @@ class _Common(object):
 class Reduction(_Common):
     """A variant was removed because its dependencies conflicted with another
     scope in the current phase."""
+    __slots__ = ("name", "version", "variant_index", "dependency",
+                 "conflicting_request")
+
     def __init__(self, name, version, variant_index, dependency,
                  conflicting_request):
         self.name = name
@@ -196,6 +333,8 @@ class Reduction(_Common):
 class DependencyConflict(_Common):
     """A common dependency shared by all variants in a scope, conflicted with
     another scope in the current phase."""
+    __slots__ = ("dependency", "conflicting_request")
+
     def __init__(self, dependency, conflicting_request):
         """
         Args:
@@ -293,6 +432,8 @@ class Cycle(FailureReason):
 class PackageVariant(_Common):
     """A variant of a package.
     """
+    __slots__ = ("variant", "building", "_requires_list")
+
     def __init__(self, variant, building):
         """Create a package variant.
 
@@ -302,6 +443,7 @@ class PackageVariant(_Common):
         """
         self.variant = variant
         self.building = building
+        self._requires_list = None
 
     @property
     def name(self):
@@ -319,13 +461,18 @@ class PackageVariant(_Common):
     def handle(self):
         return self.variant.handle.to_dict()
 
-    @cached_property
+    @property
     def requires_list(self):
         """
         It is important that this property is calculated lazily. Getting the
         'requires' attribute may trigger a package load, which may be avoided if
         this variant is reduced away before that happens.
         """
+        if self._requires_list is None:
+            self._requires_list = self._get_requires_list()
+        return self._requires_list
+
+    def _get_requires_list(self):
         requires = self.variant.get_requires(build_requires=self.building)
         reqlist = RequirementList(requires)
 
@@ -372,6 +519,8 @@ class _PackageEntry(object):
 
     Holds some extra state data, such as whether the variants are sorted.
     """
+    __slots__ = ("package", "variants", "solver", "sorted")
+
     def __init__(self, package, variants, solver):
         self.package = package
         self.variants = variants
@@ -428,13 +577,13 @@ class _PackageEntry(object):
                 if not request.conflict:
                     req = variant.requires_list.get(request.name)
                     if req is not None:
-                        requested_key.append((-i, req.range))
+                        requested_key.append((-i, req.range.sort_key()))
                         names.add(req.name)
 
             additional_key = []
             for request in variant.requires_list:
                 if not request.conflict and request.name not in names:
-                    additional_key.append((request.range, request.name))
+                    additional_key.append((request.range.sort_key(), request.name))
 
             if (VariantSelectMode[config.variant_select_mode] == VariantSelectMode.version_priority):
                 k = (requested_key,
@@ -454,12 +603,41 @@ class _PackageEntry(object):
         self.sorted = True
 
 
+# marks an entry in a shared variant list whose package has late bound requires
+_late_requires = object()
+
+
+def _has_late_requires(package):
+    data = package.data or {}
+
+    for key in ("requires", "build_requires", "private_build_requires"):
+        value = data.get(key)
+        if isinstance(value, SourceCode) and value.late_binding:
+            return True
+
+    return False
+
+
 class _PackageVariantList(_Common):
     """A list of package variants, loaded lazily.
+
+    Entries are sorted by ascending version, so that the entries within a
+    version range can be found by bisection.
     """
-    def __init__(self, package_name, solver):
+    def __init__(self, package_name, solver, shared=False):
+        """
+        Args:
+            package_name (str): Name of package family.
+            solver (`Solver`): Solver to load packages for.
+            shared (bool): If True, this list is shared by solvers with the same
+                package paths, package filter and build mode (see
+                `SharedPackageVariantCache`). Packages are then loaded without
+                a context, and `solver` is not retained.
+        """
         self.package_name = package_name
-        self.solver = solver
+        self.solver = None if shared else solver
+        self.shared = shared
+        self.lock = threading.Lock() if shared else nullcontext()
 
         # note: we do not apply package filters here, because doing so might
         # cause package loads (eg, timestamp rules). We only apply filters
@@ -468,65 +646,113 @@ class _PackageVariantList(_Common):
         self.entries = []
 
         for package in iter_packages(self.package_name,
-                                     paths=self.solver.package_paths):
-            package.set_context(solver.context)
+                                     paths=solver.package_paths):
+            if not shared:
+                package.set_context(solver.context)
             self.entries.append([package, False])
 
         if not self.entries:
             raise PackageFamilyNotFoundError(
                 "package family not found: %s (searched: %s)"
-                % (package_name, "; ".join(self.solver.package_paths)))
+                % (package_name, "; ".join(solver.package_paths)))
+
+        self.entries.sort(key=lambda x: x[0].version)
+        self.versions = [x[0].version for x in self.entries]
+
+    def iter_entries(self, range_):
+        """Iterate over the entries within a version range.
+
+        Args:
+            range_ (`VersionRange`): Package version range.
+
+        Returns:
+            Iterator of [`Package`, value] entries, in ascending version order.
+        """
+        versions = self.versions
+        start = 0
 
-    def get_intersection(self, range_):
+        # bounds are ascending and do not overlap
+        for bound in range_.bounds:
+            lower, upper = bound.lower, bound.upper
+
+            if lower.inclusive:
+                i = bisect_left(versions, lower.version, start)
+            else:
+                i = bisect_right(versions, lower.version, start)
+
+            if upper.inclusive:
+                start = bisect_right(versions, upper.version, i)
+            else:
+                start = bisect_left(versions, upper.version, i)
+
+            for j in range(i, start):
+                yield self.entries[j]
+
+    def get_intersection(self, range_, solver=None):
         """Get a list of variants that intersect with the given range.
 
         Args:
             range_ (`VersionRange`): Package version range.
+            solver (`Solver`): Solver the variants are for. Defaults to the
+                solver this list was created with, and is required if the list
+                is shared.
 
         Returns:
             List of `_PackageEntry` objects.
         """
+        solver = solver or self.solver
         result = []
 
-        for entry in self.entries:
-            package, value = entry
+        with self.lock:
+            for entry in self.iter_entries(range_):
+                package, value = entry
+
+                if value is None:
+                    continue  # package was blocked by package filters
+
+                if value is False:
+                    # apply package filter
+                    if solver.package_filter:
+                        rule = solver.package_filter.excludes(package)
+                        if rule:
+                            if config.debug_package_exclusions:
+                                print_debug("Package '%s' was excluded by rule '%s'"
+                                            % (package.qualified_name, str(rule)))
+                            entry[1] = None
+                            continue
 
-            if value is None:
-                continue  # package was blocked by package filters
+                    if self.shared and _has_late_requires(package):
+                        # late bound requires may depend on the context, so
+                        # these variants are not shared
+                        value = entry[1] = _late_requires
+                    else:
+                        value = entry[1] = self._get_variants(package, solver)
 
-            if package.version not in range_:
-                continue
+                if value is _late_requires:
+                    variants = solver.package_cache.get_context_variants(package)
+                elif self.shared:
+                    # entries sort their variants in place
+                    variants = list(value)
+                else:
+                    variants = value
 
-            if isinstance(value, list):
-                variants = value
-                entry_ = _PackageEntry(package, variants, self.solver)
+                entry_ = _PackageEntry(package, variants, solver)
                 result.append(entry_)
-                continue
-
-            # apply package filter
-            if self.solver.package_filter:
-                rule = self.solver.package_filter.excludes(package)
-                if rule:
-                    if config.debug_package_exclusions:
-                        print_debug("Package '%s' was excluded by rule '%s'"
-                                    % (package.qualified_name, str(rule)))
-                    entry[1] = None
-                    continue
 
-            # expand package entry into list of variants
-            if self.solver.package_load_callback:
-                self.solver.package_load_callback(package)
+        return result or None
 
-            variants_ = []
-            for var in package.iter_variants():
-                variant = PackageVariant(var, self.solver.building)
-                variants_.append(variant)
+    @classmethod
+    def _get_variants(cls, package, solver):
+        # expand package entry into list of variants
+        if solver.package_load_callback:
+            solver.package_load_callback(package)
 
-            entry[1] = variants_
-            entry_ = _PackageEntry(package, variants_, self.solver)
-            result.append(entry_)
+        variants = []
+        for var in package.iter_variants():
+            variant = PackageVariant(var, solver.building)
+            variants.append(variant)
 
-        return result or None
+        return variants
 
     def dump(self):
         print(self.package_name)
@@ -539,6 +765,8 @@ class _PackageVariantList(_Common):
                 variants = value
                 for variant in variants:
                     print("    %s" % str(variant))
+            elif value is _late_requires:
+                print("    [CONTEXT DEPENDENT]")
             else:
                 print("    %s" % str(package))
 
@@ -561,6 +789,10 @@ class _PackageVariantList(_Common):
 
 class _PackageVariantSlice(_Common):
     """A subset of a variant list, but with more dependency-related info."""
+    __slots__ = ("solver", "package_name", "entries", "extracted_fams",
+                 "been_reduced_by", "been_intersected_with", "sorted", "_len",
+                 "_range", "_fam_requires", "_common_fams")
+
     def __init__(self, package_name, entries, solver):
         """
         Args:
@@ -581,6 +813,21 @@ class _PackageVariantSlice(_Common):
         self._fam_requires = None
         self._common_fams = None
 
+    def __copy__(self):
+        slice_ = _PackageVariantSlice.__new__(_PackageVariantSlice)
+        slice_.solver = self.solver
+        slice_.package_name = self.package_name
+        slice_.entries = self.entries
+        slice_.extracted_fams = self.extracted_fams
+        slice_.been_reduced_by = self.been_reduced_by
+        slice_.been_intersected_with = self.been_intersected_with
+        slice_.sorted = self.sorted
+        slice_._len = self._len
+        slice_._range = self._range
+        slice_._fam_requires = self._fam_requires
+        slice_._common_fams = self._common_fams
+        return slice_
+
     @property
     def pr(self):
         return self.solver.pr
@@ -847,7 +1094,8 @@ class _PackageVariantSlice(_Common):
                 return
 
         # default ordering is version descending
-        self.entries = sorted(self.entries, key=lambda x: x.version, reverse=True)
+        self.entries = sorted(
+            self.entries, key=lambda x: x.version.sort_key(), reverse=True)
         self.sorted = True
 
         if self.pr:
@@ -867,6 +1115,11 @@ class _PackageVariantSlice(_Common):
         slice_.been_intersected_with = self.been_intersected_with.copy()
         return slice_
 
+    @property
+    def has_conflict_requires(self):
+        """True if any variant has a conflict requirement (eg '!foo')."""
+        return any(x.conflict_request_fams for x in self.iter_variants())
+
     def _update_fam_info(self):
         if self._common_fams is not None:
             return
@@ -922,10 +1175,15 @@ class _PackageVariantSlice(_Common):
 
 
 class PackageVariantCache(object):
-    def __init__(self, solver):
+    def __init__(self, solver, shared_cache=None):
         self.solver = solver
+        self.shared_cache = shared_cache
         self.variant_lists = {}  # {package-name: _PackageVariantList}
 
+        # variants of packages with late bound requires, when variant lists
+        # are shared. {(package-name, version): [PackageVariant]}
+        self.context_variants = {}
+
     def get_variant_slice(self, package_name, range_):
         """Get a list of variants from the cache.
 
@@ -939,10 +1197,15 @@ class PackageVariantCache(object):
         variant_list = self.variant_lists.get(package_name)
 
         if variant_list is None:
-            variant_list = _PackageVariantList(package_name, self.solver)
+            with self.solver.profiled("list", package_name):
+                if self.shared_cache is None:
+                    variant_list = _PackageVariantList(package_name, self.solver)
+                else:
+                    variant_list = self.shared_cache.get_variant_list(
+                        package_name, self.solver)
             self.variant_lists[package_name] = variant_list
 
-        entries = variant_list.get_intersection(range_)
+        entries = variant_list.get_intersection(range_, self.solver)
         if not entries:
             return None
 
@@ -951,12 +1214,137 @@ class PackageVariantCache(object):
                                       solver=self.solver)
         return slice_
 
+    def has_variant_list(self, package_name):
+        """Determine if a family's variant list is already loaded.
+
+        Args:
+            package_name (str): Name of package.
+
+        Returns:
+            bool: True if the list is loaded, either by this solver or in the
+            shared cache.
+        """
+        if package_name in self.variant_lists:
+            return True
+
+        return (
+            self.shared_cache is not None
+            and self.shared_cache.has_variant_list(package_name, self.solver)
+        )
+
+    def get_context_variants(self, package):
+        """Get the variants of a package, evaluated within this solve's context.
+
+        Args:
+            package (`Package`): Package, which may be shared between solvers.
+
+        Returns:
+            List of `PackageVariant`.
+        """
+        key = (package.name, package.version)
+        variants = self.context_variants.get(key)
+
+        if variants is None:
+            package_ = Package(package.resource, context=self.solver.context)
+            variants = _PackageVariantList._get_variants(package_, self.solver)
+            self.context_variants[key] = variants
+
+        return list(variants)
+
+
+class SharedPackageVariantCache(object):
+    """Package variant lists that are shared by the solvers in a process.
+
+    Every solve loads the packages of each family it visits, and wraps their
+    variants. Processes that perform many resolves can share this work between
+    solvers that have the same package paths, package filter and build mode,
+    by enabling the 'shared_variant_caching' config setting.
+
+    Packages with late bound requires are loaded once, but their variants are
+    still evaluated per solve, since they may depend on the context.
+
+    The cache is cleared when `package_repository_manager.clear_caches` is
+    called.
+    """
+    def __init__(self):
+        self.lock = threading.Lock()
+
+        # {((package-paths, building, filter-sha1), package-name):
+        #   _PackageVariantList}
+        self.variant_lists = {}
+
+    def get_variant_list(self, package_name, solver):
+        """Get the shared variant list of a package family.
+
+        Args:
+            package_name (str): Name of package family.
+            solver (`Solver`): Solver requesting the list.
+
+        Returns:
+            `_PackageVariantList` object.
+        """
+        key = (self._solver_key(solver), package_name)
+
+        with self.lock:
+            variant_list = self.variant_lists.get(key)
+
+        if variant_list is None:
+            # note: loading happens outside the lock so that solvers in other
+            # threads are not blocked. If two solvers load the same family at
+            # once, the first list stored wins.
+            #
+            variant_list = _PackageVariantList(package_name, solver, shared=True)
+
+            with self.lock:
+                variant_list = self.variant_lists.setdefault(key, variant_list)
+
+        return variant_list
+
+    def has_variant_list(self, package_name, solver):
+        """Determine if a family's variant list is cached.
+
+        Args:
+            package_name (str): Name of package family.
+            solver (`Solver`): Solver requesting the list.
+
+        Returns:
+            bool.
+        """
+        key = (self._solver_key(solver), package_name)
+        return (key in self.variant_lists)
+
+    def clear(self):
+        """Clear the cache."""
+        with self.lock:
+            self.variant_lists.clear()
+
+    def __len__(self):
+        return len(self.variant_lists)
+
+    @classmethod
+    def _solver_key(cls, solver):
+        if solver.package_filter:
+            filter_hash = solver.package_filter.sha1
+        else:
+            filter_hash = ''
+
+        return (tuple(solver.package_paths), solver.building, filter_hash)
+
+
+# singleton
+shared_package_variant_cache = SharedPackageVariantCache()
+package_repository_manager.add_clear_caches_callback(
+    shared_package_variant_cache.clear)
+
 
 class _PackageScope(_Common):
     """Contains possible solutions for a package, such as a list of variants,
     or a conflict range. As the resolve progresses, package scopes are narrowed
     down.
     """
+    __slots__ = ("package_name", "solver", "package_request", "variant_slice",
+                 "pr", "is_ephemeral")
+
     def __init__(self, package_request, solver):
         self.package_name = package_request.name
         self.solver = solver
@@ -979,6 +1367,16 @@ class _PackageScope(_Common):
                                            % str(req))
             self._update()
 
+    def __copy__(self):
+        scope = _PackageScope.__new__(_PackageScope)
+        scope.package_name = self.package_name
+        scope.solver = self.solver
+        scope.package_request = self.package_request
+        scope.variant_slice = self.variant_slice
+        scope.pr = self.pr
+        scope.is_ephemeral = self.is_ephemeral
+        return scope
+
     @property
     def is_conflict(self):
         return self.package_request and self.package_request.conflict
@@ -1035,7 +1433,8 @@ class _PackageScope(_Common):
                     new_slice = self.solver._get_variant_slice(
                         self.package_name, new_range)
         else:
-            new_slice = self.variant_slice.intersect(range_)
+            with self.solver.profiled("intersect", self.package_name):
+                new_slice = self.variant_slice.intersect(range_)
 
         # intersection reduced the scope to nothing
         if new_slice is None:
@@ -1071,7 +1470,8 @@ class _PackageScope(_Common):
             return (self, [])
 
         # perform the reduction
-        new_slice, reductions = self.variant_slice.reduce_by(package_request)
+        with self.solver.profiled("reduce", self.package_name):
+            new_slice, reductions = self.variant_slice.reduce_by(package_request)
 
         # there was total reduction
         if new_slice is None:
@@ -1111,7 +1511,11 @@ class _PackageScope(_Common):
         if self.is_conflict or self.is_ephemeral:
             return (self, None)
 
-        new_slice, package_request = self.variant_slice.extract()
+        if not self.variant_slice.extractable:
+            return (self, None)
+
+        with self.solver.profiled("extract", self.package_name):
+            new_slice, package_request = self.variant_slice.extract()
         if not package_request:
             return (self, None)
 
@@ -1137,7 +1541,8 @@ class _PackageScope(_Common):
         ):
             return None
 
-        r = self.variant_slice.split()
+        with self.solver.profiled("split", self.package_name):
+            r = self.variant_slice.split()
         if r is None:
             return None
 
@@ -1190,6 +1595,107 @@ class _PackageScope(_Common):
             return str(self.variant_slice)
 
 
+class _ReductionQueue(object):
+    """Pending reductions, as processed in the REDUCING step of a phase solve.
+
+    Each pending reduction is an (x, y) pair, meaning that scope x is to be
+    reduced by the request of scope y. Pending pairs are stored as a bitset
+    per reducing scope x (bit y is set), so a pair that is already pending is
+    never queued twice. Pairs are popped highest x first, then highest y first,
+    so reductions always happen in a deterministic order.
+
+    The queue also indexes which scopes have requirements on which families.
+    Reducing scope x by scope y can have no effect unless some variant in x
+    has a requirement on y's family, so only those pairs are queued (unless
+    the solver is running unoptimised).
+
+    Note that the index is conservative - scopes only ever narrow during a
+    solve, so a scope's family requirements can shrink but never grow.
+    """
+    def __init__(self, scopes, optimised=True):
+        self.scopes = scopes
+        self.optimised = optimised
+        self.pending = {}  # {x: bitset of y}
+        self.heap = []  # negated x of every key in self.pending
+        self.scope_indexes = {}  # {family: scope index}
+        self.dependents = {}  # {family: set of scope index}
+        self.indexed = set()  # indexes of scopes with an indexed variant slice
+
+    def update_index(self):
+        """Index any scopes that have been added or widened."""
+        for i, scope in enumerate(self.scopes):
+            if i in self.indexed:
+                continue
+
+            self.scope_indexes[scope.package_name] = i
+
+            # conflict scopes are indexed later, if they widen
+            if scope.variant_slice is None:
+                continue
+
+            for fam in scope.variant_slice.fam_requires:
+                self.dependents.setdefault(fam, set()).add(i)
+            self.indexed.add(i)
+
+    def add(self, x, y):
+        """Queue scope x to be reduced by scope y."""
+        if x == y:
+            return
+
+        bits = self.pending.get(x, 0)
+        if not bits:
+            heapq.heappush(self.heap, -x)
+        self.pending[x] = bits | (1 << y)
+
+    def add_dependents(self, y):
+        """Queue every scope with a requirement on scope y to be reduced by y."""
+        if self.optimised:
+            fam = self.scopes[y].package_name
+            dependents_i = self.dependents.get(fam, ())
+        else:
+            dependents_i = range(len(self.scopes))
+
+        for x in dependents_i:
+            self.add(x, y)
+
+    def add_reducers(self, x):
+        """Queue scope x to be reduced by every scope it has a requirement on."""
+        if self.optimised:
+            slice_ = self.scopes[x].variant_slice
+            if slice_ is None:
+                return
+
+            for fam in slice_.fam_requires:
+                y = self.scope_indexes.get(fam)
+                if y is not None:
+                    self.add(x, y)
+        else:
+            for y in range(len(self.scopes)):
+                self.add(x, y)
+
+    def pop(self):
+        """Remove the next pending reduction.
+
+        Returns:
+            (x, y) tuple, or None if there are no pending reductions.
+        """
+        if not self.heap:
+            return None
+
+        x = -self.heap[0]
+        bits = self.pending[x]
+        y = bits.bit_length() - 1
+        bits ^= (1 << y)
+
+        if bits:
+            self.pending[x] = bits
+        else:
+            del self.pending[x]
+            heapq.heappop(self.heap)
+
+        return x, y
+
+
 def _get_dependency_order(g, node_list):
     """Return list of nodes as close as possible to the ordering in node_list,
     but with child nodes earlier in the list than parents."""
@@ -1229,15 +1735,34 @@ class _ResolvePhase(_Common):
     If the resolve phase gets to a point where every package scope is solved,
     then the entire resolve is considered to be solved.
     """
-    def __init__(self, solver):
+    def __init__(self, solver, scopes=None, widened_scopes_i=None):
+        """Create a resolve phase.
+
+        Args:
+            solver (`Solver`): Owning solver.
+            scopes (list of `_PackageScope`): Initial scopes. If None, a scope
+                is created for each request in the solver's request list.
+            widened_scopes_i (set of int): Indexes of scopes in `scopes` that
+                must be reduced against all other scopes. Only the scopes in
+                this set are treated as changed. Ignored if `scopes` is None.
+        """
         self.solver = solver
         self.failure_reason = None
         self.extractions = {}
         self.status = SolverStatus.pending
+        self.widened_scopes_i = set()
+
+        if scopes is not None:
+            # a seeded phase - only the given scopes need reducing
+            self.scopes = scopes
+            self.widened_scopes_i = set(widened_scopes_i or [])
+            self.changed_scopes_i = self.widened_scopes_i.copy()
+            return
 
         self.scopes = []
         for package_request in self.solver.request_list:
-            scope = _PackageScope(package_request, solver=solver)
+            with solver.profiled("add", package_request.name):
+                scope = _PackageScope(package_request, solver=solver)
             self.scopes.append(scope)
 
         # only so an initial reduction across all scopes happens in a new phase
@@ -1257,6 +1782,8 @@ class _ResolvePhase(_Common):
         extractions = {}
 
         changed_scopes_i = self.changed_scopes_i.copy()
+        widened_scopes_i = self.widened_scopes_i.copy()
+        reduction_queue = _ReductionQueue(scopes, optimised=self.solver.optimised)
 
         def _create_phase(status=None):
             phase = copy.copy(self)
@@ -1264,6 +1791,7 @@ class _ResolvePhase(_Common):
             phase.failure_reason = failure_reason
             phase.extractions = extractions
             phase.changed_scopes_i = set()
+            phase.widened_scopes_i = set()
 
             if status is None:
                 phase.status = (SolverStatus.solved if phase._is_solved()
@@ -1275,7 +1803,6 @@ class _ResolvePhase(_Common):
         # iteratively reduce until no more reductions possible
         while True:
             prev_num_scopes = len(scopes)
-            widened_scopes_i = set()
 
             # iteratively extract until no more extractions possible
             while True:
@@ -1363,10 +1890,13 @@ class _ResolvePhase(_Common):
 
                 if new_extracted_reqs:
                     self.pr.subheader("ADDING:")
+                    self.solver._prefetch_package_families(
+                        x.name for x in new_extracted_reqs)
 
                     for req in new_extracted_reqs:
                         try:
-                            scope = _PackageScope(req, solver=self.solver)
+                            with self.solver.profiled("add", req.name):
+                                scope = _PackageScope(req, solver=self.solver)
                         except PackageFamilyNotFoundError as e:
                             # Look up which are requesting the missing one
                             requesters = []
@@ -1411,47 +1941,40 @@ class _ResolvePhase(_Common):
                 changed_scopes_i = set(range(num_scopes))
                 prev_num_scopes = num_scopes
 
-            # Create set of pending reductions from the list of changed scopes
-            # and list of added scopes. Each item is an (x, y) tuple, where
+            # Queue pending reductions from the list of changed scopes and
+            # list of added scopes. Each item is an (x, y) pair, where
             # scope[x] will reduce by scope[y].package_request.
             #
-            all_scopes_i = range(num_scopes)
-            prev_scopes_i = range(prev_num_scopes)
-            added_scopes_i = range(prev_num_scopes, num_scopes)
+            reduction_queue.update_index()
 
-            pending_reducts = set(chain(
-
-                # existing scopes must reduce against changed scopes
-                product(prev_scopes_i, changed_scopes_i),
+            # existing scopes must reduce against changed scopes
+            for i in changed_scopes_i:
+                reduction_queue.add_dependents(i)
 
+            for i in range(prev_num_scopes, num_scopes):
                 # existing scopes must reduce against newly added scopes
-                product(prev_scopes_i, added_scopes_i),
+                reduction_queue.add_dependents(i)
 
                 # newly added scopes must reduce against all other scopes
-                product(added_scopes_i, all_scopes_i),
+                reduction_queue.add_reducers(i)
 
-                # 'widened' scopes (see earlier comment in this func) must reduce
-                # against all other scopes
-                #
-                product(widened_scopes_i, all_scopes_i)
-            ))
+            # 'widened' scopes (see earlier comment in this func) must reduce
+            # against all other scopes
+            #
+            for i in widened_scopes_i:
+                reduction_queue.add_reducers(i)
 
             # iteratively reduce until there are no more pending reductions.
             # Note that if a scope is reduced, then other scopes need to reduce
             # against it once again.
             #
             with self.solver.timed(self.solver.reduction_test_time):
+                while True:
+                    pending_reduct = reduction_queue.pop()
+                    if pending_reduct is None:
+                        break
 
-                # A different order here wouldn't cause an invalid solve, however
-                # rez solves must be deterministic, so this is why we sort.
-                #
-                pending_reducts = sorted(pending_reducts)
-
-                while pending_reducts:
-                    x, y = pending_reducts.pop()
-                    if x == y:
-                        continue
-
+                    x, y = pending_reduct
                     new_scope, reductions = scopes[x].reduce_by(
                         scopes[y].package_request)
 
@@ -1463,11 +1986,10 @@ class _ResolvePhase(_Common):
                         scopes[x] = new_scope
 
                         # other scopes need to reduce against x again
-                        for j in all_scopes_i:
-                            if j != x:
-                                pending_reducts.append((j, x))
+                        reduction_queue.add_dependents(x)
 
             changed_scopes_i = set()
+            widened_scopes_i = set()
 
         return _create_phase()
 
@@ -1567,6 +2089,8 @@ class _ResolvePhase(_Common):
         #     if i != split_i:
         #         phase.pending_reducts.add((i, split_i))
 
+        phase.widened_scopes_i = set()
+
         next_phase = copy.copy(phase)
         next_phase.scopes = next_scopes
         return (phase, next_phase)
@@ -1879,6 +2403,52 @@ class _ResolvePhase(_Common):
         return ' '.join(str(x) for x in self.scopes)
 
 
+class SolverSeed(object):
+    """The result of a previous solve, used to seed an incremental solve.
+
+    An incremental solve starts from the previously resolved variants, rather
+    than from scratch. Only the families whose requests have changed are
+    re-scoped; every other previously resolved variant is kept as a solved
+    scope. This makes patching a resolve (adding or changing a few requests)
+    far cheaper than a full solve.
+
+    Note that an incremental solve keeps previous resolve results wherever
+    they are still valid, so it can differ from a full solve of the same
+    request (it will not pick up newer versions of unchanged packages, for
+    example). If the seeded solve fails, the solver falls back to a full solve.
+    """
+    def __init__(self, request, variants, package_paths, building=False):
+        """Create a solver seed.
+
+        Args:
+            request (list of `Requirement`): Request of the previous solve.
+            variants (list of `PackageVariant` or `Variant`): Variants resolved
+                by the previous solve.
+            package_paths (list of str): Package search paths of the previous
+                solve.
+            building (bool): True if the previous solve was for a build.
+        """
+        self.request_list = RequirementList(request)
+        self.variants = list(variants)
+        self.package_paths = list(package_paths)
+        self.building = building
+
+    @classmethod
+    def from_solver(cls, solver):
+        """Create a seed from a solved `Solver`.
+
+        Returns:
+            `SolverSeed`, or None if the solver is not solved.
+        """
+        if solver.status != SolverStatus.solved:
+            return None
+
+        return cls(request=solver.request_list.requirements,
+                   variants=solver.resolved_packages,
+                   package_paths=solver.package_paths,
+                   building=solver.building)
+
+
 class Solver(_Common):
     """Solver.
 
@@ -1892,7 +2462,8 @@ class Solver(_Common):
                  package_filter=None, package_orderers=None, callback=None,
                  building=False, optimised=True, verbosity=0, buf=None,
                  package_load_callback=None, prune_unfailed=True,
-                 suppress_passive=False, print_stats=False):
+                 suppress_passive=False, print_stats=False, seed=None,
+                 profile=False):
         """Create a Solver.
 
         Args:
@@ -1925,6 +2496,12 @@ class Solver(_Common):
                 has had no effect on the solve. This argument only has an
                 effect if `verbosity` > 2.
             print_stats (bool): If true, print advanced solver stats at the end.
+            seed (`SolverSeed`): If provided, perform an incremental solve,
+                starting from the result of a previous solve. If the seed is
+                not compatible with this solve, or the seeded solve fails, a
+                full solve is performed instead.
+            profile (bool): If True, gather detailed timing information about
+                the solve, see `SolverProfile`.
         """
         self.package_paths = package_paths
         self.package_filter = package_filter
@@ -1939,6 +2516,7 @@ class Solver(_Common):
         self.pr = _Printer(verbosity, buf=buf, suppress_passive=suppress_passive)
         self.print_stats = print_stats
         self.buf = buf
+        self.profile = SolverProfile() if profile else None
 
         if _force_unoptimised_solver:
             self.optimised = False
@@ -1954,6 +2532,11 @@ class Solver(_Common):
         self.solve_time = None
         self.load_time = None
 
+        # incremental solve state
+        self.seed = seed
+        self.seeded = False
+        self.seed_fallback = False
+
         # advanced solve metrics
         self.solve_count = 0
         self.extractions_count = 0
@@ -1972,7 +2555,12 @@ class Solver(_Common):
 
         self._init()
 
-        self.package_cache = PackageVariantCache(self)
+        if config.shared_variant_caching:
+            self.package_cache = PackageVariantCache(
+                self, shared_cache=shared_package_variant_cache)
+        else:
+            self.package_cache = PackageVariantCache(self)
+        self._prefetched_fams = set()
 
         # merge the request
         if self.pr:
@@ -1994,10 +2582,30 @@ class Solver(_Common):
             s = ' '.join(map(str, self.request_list.requirements))
             self.pr("merged request: %s", s)
 
+        self._prefetch_package_families(
+            x.name for x in self.request_list if not x.conflict)
+
         # create the initial phase
-        phase = _ResolvePhase(solver=self)
+        phase = None
+        if seed is not None:
+            phase = self._create_seeded_phase(seed)
+
+        if phase is None:
+            phase = _ResolvePhase(solver=self)
+        else:
+            self.seeded = True
+
         self._push_phase(phase)
 
+    def profiled(self, operation, family=None):
+        """Context manager that records an operation in the solve profile.
+
+        Does nothing if profiling is disabled.
+        """
+        if self.profile is None:
+            return _null_context
+        return self.profile.record(operation, family)
+
     @contextmanager
     def timed(self, target):
         t = time.time()
@@ -2100,10 +2708,18 @@ class Solver(_Common):
         t1 = time.time()
         pt1 = package_repo_stats.package_load_time
 
-        # iteratively solve phases
-        while self.status == SolverStatus.unsolved:
-            self.solve_step()
-            if self.status == SolverStatus.unsolved and not self._do_callback():
+        while True:
+            # iteratively solve phases
+            while self.status == SolverStatus.unsolved:
+                self.solve_step()
+                if self.status == SolverStatus.unsolved and not self._do_callback():
+                    break
+
+            # an incremental solve that failed, or that has left behind
+            # packages that are no longer needed, falls back to a full solve
+            if self.seeded and self._seeded_solve_rejected():
+                self._fallback_to_full_solve()
+            else:
                 break
 
         self.load_time = package_repo_stats.package_load_time - pt1
@@ -2147,7 +2763,9 @@ class Solver(_Common):
             "num_solves": self.num_solves,
             "num_fails": self.num_fails,
             "solve_time": self.solve_time,
-            "load_time": self.load_time
+            "load_time": self.load_time,
+            "seeded": self.seeded,
+            "seed_fallback": self.seed_fallback
         }
 
         return {
@@ -2175,6 +2793,9 @@ class Solver(_Common):
             self.failed_phase_list.append(phase)
             phase = self._pop_phase()
 
+        if self.profile is not None:
+            self.profile.depth = len(self.phase_stack)
+
         if phase.status == SolverStatus.exhausted:
             self.pr.subheader("SPLITTING:")
             phase, next_phase = phase.split()
@@ -2182,7 +2803,12 @@ class Solver(_Common):
             if self.pr:
                 self.pr("new phase: %s", phase)
 
-        new_phase = phase.solve()
+            # the first phase of the split sits above the next phase
+            if self.profile is not None:
+                self.profile.depth = len(self.phase_stack)
+
+        with self.profiled("solve"):
+            new_phase = phase.solve()
         self.solve_count += 1
 
         if new_phase.status == SolverStatus.failed:
@@ -2194,7 +2820,8 @@ class Solver(_Common):
         elif new_phase.status == SolverStatus.solved:
             # solved, but there may be cyclic dependencies
             self.pr.subheader("SOLVED:")
-            final_phase = new_phase.finalise()
+            with self.profiled("finalise"):
+                final_phase = new_phase.finalise()
             self._push_phase(final_phase)
 
             if self.pr:
@@ -2305,6 +2932,9 @@ class Solver(_Common):
             print('\n'.join(columnise(rows)))
 
     def _init(self):
+        if self.profile is not None:
+            self.profile = SolverProfile()
+
         self.phase_stack = []
         self.failed_phase_list = []
         self.depth_counts = {}
@@ -2357,6 +2987,154 @@ class Solver(_Common):
 
         return keep_going
 
+    def _create_seeded_phase(self, seed):
+        """Create the initial phase of an incremental solve.
+
+        Returns:
+            `_ResolvePhase`, or None if the seed cannot be used.
+        """
+        if seed.building != self.building \
+                or seed.package_paths != list(self.package_paths):
+            self.pr("seed ignored: incompatible package paths or build mode")
+            return None
+
+        prev_requests = dict((x.name, x) for x in seed.request_list)
+
+        # a request was removed - we can't know which of the seed's packages
+        # are still needed, so do a full solve
+        request_fams = set(x.name for x in self.request_list)
+        if set(prev_requests.keys()) - request_fams:
+            self.pr("seed ignored: requests were removed")
+            return None
+
+        changed_fams = set(
+            x.name for x in self.request_list
+            if prev_requests.get(x.name) != x
+        )
+
+        seed_variants = dict((x.name, x) for x in seed.variants)
+        scopes = []
+        widened_scopes_i = set()
+
+        def _add_scope(scope, widened):
+            if widened:
+                widened_scopes_i.add(len(scopes))
+            scopes.append(scope)
+
+        for request in self.request_list:
+            scope = None
+            variant = seed_variants.pop(request.name, None)
+
+            if variant is not None and request.name not in changed_fams:
+                stmt = VersionedObject.construct(variant.name, variant.version)
+                if not request.conflicts_with(stmt):
+                    scope = self._get_seeded_scope(variant)
+
+            if scope is None:
+                _add_scope(_PackageScope(request, solver=self), True)
+            else:
+                _add_scope(scope, scope.variant_slice.has_conflict_requires)
+
+        for variant in seed.variants:
+            if variant.name not in seed_variants:
+                continue
+
+            scope = self._get_seeded_scope(variant)
+            if scope is None:
+                self.pr("seed ignored: %s is no longer available",
+                        VersionedObject.construct(variant.name, variant.version))
+                return None
+
+            # scopes with conflict requirements can only be checked against
+            # other scopes by reduction, so they must be reduced against all
+            _add_scope(scope, scope.variant_slice.has_conflict_requires)
+
+        if self.pr:
+            self.pr("seeded from previous solve, changed requests: %s",
+                    ' '.join(sorted(changed_fams)) or "(none)")
+
+        return _ResolvePhase(solver=self, scopes=scopes,
+                             widened_scopes_i=widened_scopes_i)
+
+    def _get_seeded_scope(self, variant):
+        """Create a solved scope containing only the given variant.
+
+        Returns:
+            `_PackageScope`, or None if the variant is no longer available (eg,
+            it has since been filtered out, or deleted).
+        """
+        range_ = VersionRange.from_version(variant.version)
+        request = Requirement.construct(variant.name, range_)
+
+        try:
+            scope = _PackageScope(request, solver=self)
+        except (PackageNotFoundError, PackageFamilyNotFoundError):
+            return None
+
+        slice_ = scope.variant_slice
+        for entry in slice_.entries:
+            for variant_ in entry.variants:
+                if variant_.index == variant.index:
+                    entry_ = _PackageEntry(entry.package, [variant_], self)
+                    return scope._copy(slice_._copy([entry_]))
+
+        return None
+
+    def _seeded_solve_rejected(self):
+        """Returns True if an incremental solve must be redone in full.
+
+        This is the case if the seeded solve failed, or if it contains seeded
+        packages that are no longer required by anything in the request.
+        """
+        st = self.status
+        if st == SolverStatus.failed:
+            self.pr("seeded solve failed, falling back to full solve")
+            return True
+        elif st != SolverStatus.solved:
+            return False
+
+        final_phase = self.phase_stack[-1]
+        g = final_phase._get_minimal_graph()
+        access_dict = accessibility(g)
+
+        required_fams = set()
+        for request in self.request_list:
+            if not request.conflict:
+                required_fams.update(access_dict.get(request.name, []))
+
+        for variant in final_phase._get_solved_variants():
+            if variant.name not in required_fams:
+                self.pr("seeded solve contains unrequired package %s, "
+                        "falling back to full solve", variant)
+                return True
+
+        return False
+
+    def _fallback_to_full_solve(self):
+        self._init()
+        self.seeded = False
+        self.seed_fallback = True
+        self.abort_reason = None
+        self.callback_return = None
+
+        phase = _ResolvePhase(solver=self)
+        self._push_phase(phase)
+
+    def _prefetch_package_families(self, names):
+        # ephemerals are not packages, and families that have already been
+        # loaded or prefetched gain nothing from a prefetch
+        names = [
+            x for x in names
+            if not x.startswith('.')
+            and x not in self._prefetched_fams
+            and not self.package_cache.has_variant_list(x)
+        ]
+
+        if names:
+            self._prefetched_fams.update(names)
+            with self.profiled("prefetch"):
+                prefetch_package_families(names, paths=self.package_paths)
+
     def _get_variant_slice(self, package_name, range_):
         slice_ = self.package_cache.get_variant_slice(
             package_name=package_name, range_=range_)
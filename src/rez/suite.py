@@ -11,7 +11,10 @@ from rez.utils.colorize import warning, critical, Printer, alias as alias_col
 from rez.vendor import yaml
 from rez.vendor.yaml.error import YAMLError
 from rez.utils.yaml import dump_yaml
+from rez.config import config
+from rez import suite_launch
 from collections import defaultdict
+import json
 import os
 import os.path
 import shutil
@@ -484,6 +487,9 @@ class Suite(object):
                                      tool_name=tool_name,
                                      prefix_char=prefix_char)
 
+        if config.suite_fast_launch:
+            self._write_launch_manifest(path, tools, verbose=verbose)
+
     @classmethod
     def load(cls, path):
         if not os.path.exists(path):
@@ -750,6 +756,65 @@ class Suite(object):
                     else:
                         self.tools[alias] = entry
 
+    def _write_launch_manifest(self, path, tools, verbose=False):
+        # see rez.suite_launch
+        contexts = {}
+        launch_tools = {}
+
+        for tool_alias, d in tools.items():
+            context_name = d["context_name"]
+
+            if context_name not in contexts:
+                context = self.context(context_name)
+                contexts[context_name] = context.get_launch_environ()
+
+                if contexts[context_name] is None and verbose:
+                    print("context %r needs a shell, its tools will not be "
+                          "fast-launched" % context_name)
+
+            if contexts[context_name] is None:
+                continue
+
+            # only search $PATH up to the first entry that depends on the
+            # parent environment, since that may contain the same tool
+            environ, _ = contexts[context_name]
+            paths = []
+            for path_ in environ.get("PATH", "").split(os.pathsep):
+                if '\x00' in path_:
+                    break
+                paths.append(path_)
+
+            filepath = shutil.which(d["tool_name"], path=os.pathsep.join(paths))
+            if filepath is None:
+                continue
+
+            prefix_char = self._context(context_name).get("prefix_char")
+            if prefix_char is None:
+                prefix_char = config.suite_alias_prefix_char
+
+            launch_tools[tool_alias] = {
+                "context_name": context_name,
+                "argv": [os.path.abspath(filepath)],
+                "prefix_char": prefix_char
+            }
+
+        manifest = {
+            "version": suite_launch.manifest_version,
+            "suite_visibility": config.suite_visibility,
+            "parent_suite_path": path,
+            "contexts": dict(
+                (name, {"environ": value[0], "unset": value[1]})
+                for name, value in contexts.items() if value is not None
+            ),
+            "tools": launch_tools
+        }
+
+        filepath = os.path.join(path, suite_launch.manifest_filename)
+        if verbose:
+            print("writing %r..." % filepath)
+        with open(filepath, 'w') as f:
+            json.dump(manifest, f)
+
 
 def _FWD__invoke_suite_tool_alias(context_name, tool_name, prefix_char=None,
                                   _script=None, _cli_args=None):
@@ -0,0 +1,201 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+Fast launching of suite tools.
+
+Normally a suite tool is run by loading the suite and the tool's context, then
+interpreting the context into a shell, and running the tool in that shell. If
+:data:`suite_fast_launch` is enabled when a suite is saved, the suite also
+stores a launch manifest - the precomputed environment of each context, and
+the executable of each tool. The ``_rez_fwd`` entry point then runs the tool
+directly from the manifest, without loading the suite, resolving or
+interpreting its context, or starting a shell.
+
+The manifest is a snapshot - package commands are not re-executed each time a
+tool is launched, as they are otherwise. Contexts whose package commands need
+a shell (aliases, sourced scripts etc) or depend on their environment are not
+added to the manifest, and their tools are launched normally.
+
+Note:
+    This module is imported on every launch of a suite tool, and must not
+    import other rez modules.
+"""
+import json
+import os
+import os.path
+import re
+import subprocess
+import sys
+import time
+
+
+#: Name of the launch manifest file, in the suite directory.
+manifest_filename = "launch.json"
+
+# this version should be changed if and when the manifest format changes
+manifest_version = 1
+
+# Markers left in precomputed environ values, and substituted at launch time.
+# A parent marker is the value of a parent variable (see :data:`parent_variables`)
+# that is appended or prepended to. A variable marker is a $VAR reference in a
+# value. The suites marker is where visible suite bin paths go in $PATH.
+#
+_parent_marker = "\x00p:%s\x00"
+_variable_marker = "\x00v:%s\x00"
+suites_marker = "\x00suites\x00"
+
+_marker_regex = re.compile("\x00([pv]):([^\x00]*)\x00")
+
+
+class ParentEnvironMarkers(dict):
+    """A parent environment, as seen while precomputing a launch environ.
+
+    Every variable appears to exist, and has a marker as its value.
+    """
+    def __contains__(self, key):
+        return True
+
+    def __getitem__(self, key):
+        return _variable_marker % key
+
+    def get(self, key, default=None):
+        return _parent_marker % key
+
+
+def launch_suite_tool(script, args):
+    """Launch a suite tool from its suite's launch manifest.
+
+    Args:
+        script (str): Path to the tool's wrapper script.
+        args (list of str): Arguments to pass to the tool.
+
+    Returns:
+        None if the tool cannot be launched from a manifest, in which case it
+        should be launched normally. Otherwise this function does not return.
+    """
+    script = os.path.abspath(script)
+    tools_path, tool_alias = os.path.split(script)
+    suite_path = os.path.dirname(tools_path)
+
+    if os.name == "nt" and tool_alias.lower().endswith(".cmd"):
+        tool_alias = tool_alias[:-4]
+
+    manifest = _load_manifest(suite_path)
+    if manifest is None:
+        return None
+
+    tool = manifest["tools"].get(tool_alias)
+    if tool is None:
+        return None
+
+    # rez args (eg '+i') are handled by the full wrapper
+    prefix_char = tool["prefix_char"]
+    if prefix_char and any(x.startswith(prefix_char) for x in args):
+        return None
+
+    context_name = tool["context_name"]
+    environ = get_launch_environ(
+        manifest["contexts"][context_name],
+        suite_visibility=manifest["suite_visibility"],
+        parent_suite_path=manifest["parent_suite_path"]
+    )
+
+    environ["REZ_RXT_FILE"] = os.path.join(
+        suite_path, "contexts", "%s.rxt" % context_name)
+    environ["REZ_SHELL_INIT_TIMESTAMP"] = str(int(time.time()))
+    environ["REZ_SHELL_INTERACTIVE"] = "0"
+
+    argv = tool["argv"] + list(args)
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    if os.name == "posix":
+        os.execve(argv[0], argv, environ)
+
+    sys.exit(subprocess.call(argv, env=environ))
+
+
+def get_launch_environ(data, suite_visibility="never", parent_suite_path=None,
+                       parent_environ=None):
+    """Get the environment to launch a tool in.
+
+    Args:
+        data (dict): Context entry of a launch manifest.
+        suite_visibility (str): Value of :data:`suite_visibility` when the
+            manifest was written.
+        parent_suite_path (str): Path of the suite the manifest belongs to.
+        parent_environ (dict): Environment to launch within, defaults to
+            os.environ.
+
+    Returns:
+        dict: The environment.
+    """
+    if parent_environ is None:
+        parent_environ = os.environ
+
+    def _substitute(m):
+        kind, name = m.groups()
+        value = parent_environ.get(name)
+        if value is not None:
+            return value
+        return '' if kind == 'p' else "${%s}" % name
+
+    environ = dict(parent_environ)
+    for key in data["unset"]:
+        environ.pop(key, None)
+
+    for key, value in data["environ"].items():
+        if '\x00' in value:
+            value = _marker_regex.sub(_substitute, value)
+
+            if key == "PATH":
+                value = _substitute_suite_paths(
+                    value, suite_visibility, parent_suite_path, parent_environ)
+
+        environ[key] = value
+
+    return environ
+
+
+def _substitute_suite_paths(value, suite_visibility, parent_suite_path,
+                            parent_environ):
+    # see ResolvedContext._append_suite_paths
+    suite_paths = []
+    visible_suite_paths = []
+
+    for path in parent_environ.get("PATH", "").split(os.pathsep):
+        if path and os.path.isdir(path):
+            path_ = os.path.dirname(path)
+            if os.path.isfile(os.path.join(path_, "suite.yaml")):
+                visible_suite_paths.append(path_)
+
+    if visible_suite_paths:
+        if suite_visibility == "always":
+            suite_paths = visible_suite_paths
+        elif suite_visibility in ("parent", "parent_priority"):
+            suite_paths = [parent_suite_path]
+
+    paths = []
+    for path in value.split(os.pathsep):
+        if path == suites_marker:
+            paths.extend(os.path.join(x, "bin") for x in suite_paths)
+        else:
+            paths.append(path)
+
+    return os.pathsep.join(paths)
+
+
+def _load_manifest(suite_path):
+    filepath = os.path.join(suite_path, manifest_filename)
+
+    try:
+        with open(filepath) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+
+    if manifest.get("version") != manifest_version:
+        return None
+    return manifest
@@ -9,12 +9,16 @@ from rez.config import config
 from rez.build_process import create_build_process
 from rez.build_system import create_build_system
 from rez.resolved_context import ResolvedContext
+from rez.packages import get_package
 from rez.exceptions import BuildError, BuildContextResolveError,\
     PackageFamilyNotFoundError
 import unittest
 from rez.tests.util import TestBase, TempdirMixin, find_file_in_path, \
     per_available_shell, install_dependent, program_dependent
 from rez.utils.platform_ import platform_
+from concurrent.futures import wait
+from unittest import mock
+import multiprocessing
 import shutil
 import os.path
 
@@ -172,6 +176,100 @@ class TestBuild(TestBase, TempdirMixin):
         self._test_build_floob()
         self._test_build_anti()
 
+    @per_available_shell()
+    @install_dependent()
+    def test_build_parallel_variants(self, shell):
+        """Test building variants in parallel."""
+        config.override("default_shell", shell)
+        self.inject_python_repo()
+
+        self._test_build_build_util()
+        self._test_build_floob()
+        self._test_build_foo()
+
+        # a package without variants is built sequentially
+        working_dir = os.path.join(self.src_root, "floob")
+        builder = self._create_builder(working_dir)
+        num_built = builder.build(install_path=self.install_root, install=True,
+                                  clean=True, parallel_variants=2)
+        self.assertEqual(num_built, 1)
+        self.assertFalse(os.path.exists(
+            os.path.join(builder.build_path, "variant-logs")))
+
+        # the install directory is made writable for all the variant builds,
+        # and restored afterwards
+        install_mode = os.stat(self.install_root).st_mode
+        os.chmod(self.install_root, 0o555)
+
+        try:
+            working_dir = os.path.join(self.src_root, "bah", "2.1")
+            builder = self._create_builder(working_dir)
+            num_built = builder.build(install_path=self.install_root,
+                                      install=True, clean=True,
+                                      parallel_variants=2)
+            self.assertEqual(num_built, 2)
+            self.assertEqual(os.stat(self.install_root).st_mode & 0o777, 0o555)
+        finally:
+            os.chmod(self.install_root, install_mode)
+
+        self._create_context("bah==2.1", "foo==1.0.0")
+        self._create_context("bah==2.1", "foo==1.1.0")
+
+        # payloads of variants that finished are discarded on interruption
+        install_path = os.path.join(self.root, "interrupted_packages")
+        builder = self._create_builder(working_dir)
+
+        with mock.patch("rez.build_process.wait", _interrupted_wait):
+            self.assertRaises(KeyboardInterrupt, builder.build,
+                              install_path=install_path, install=True,
+                              clean=True, parallel_variants=2)
+
+        package_path = os.path.join(install_path, "bah", "2.1")
+        payloads = [x for x in os.listdir(package_path)
+                    if x != "_v"]  # variant shortlinks
+        self.assertEqual(payloads, [])
+        self.assertIsNone(get_package("bah", "2.1", paths=[install_path]))
+
+    @unittest.skipIf("fork" not in multiprocessing.get_all_start_methods(),
+                     "Parallel variant builds require fork")
+    def test_visit_variants_parallel(self):
+        """Test visiting variants concurrently, in subprocesses."""
+        working_dir = os.path.join(self.src_root, "bah", "2.1")
+        builder = self._create_builder(working_dir)
+        log_path = os.path.join(self.root, "variant_logs")
+
+        def _visit(variant, fail_index=None):
+            print("visiting variant %d" % variant.index)
+            if variant.index == fail_index:
+                raise BuildError("variant %d failed" % variant.index)
+            return variant.index
+
+        visits = builder.visit_variants_parallel(_visit, max_workers=2,
+                                                 log_path=log_path)
+        self.assertEqual([x.result for x in visits], [0, 1])
+        self.assertEqual([x.get_log() for x in visits],
+                         ["visiting variant 0\n", "visiting variant 1\n"])
+
+        # the first variant fails, the second is cancelled if not yet started
+        visits = builder.visit_variants_parallel(_visit, max_workers=1,
+                                                 log_path=log_path,
+                                                 fail_index=0)
+        self.assertIsInstance(visits[0].exception, BuildError)
+        self.assertFalse(visits[0].success)
+        self.assertTrue(visits[1].cancelled or visits[1].result == 1)
+
+        # the caller is given the finished calls on interruption
+        errored_visits = []
+
+        with mock.patch("rez.build_process.wait", _interrupted_wait):
+            self.assertRaises(KeyboardInterrupt,
+                              builder.visit_variants_parallel, _visit,
+                              max_workers=2, log_path=log_path,
+                              on_error=errored_visits.extend)
+
+        self.assertEqual([x.result for x in errored_visits], [0, 1])
+        self.assertTrue(all(x.success for x in errored_visits))
+
     @program_dependent("cmake")
     @install_dependent()
     def test_build_cmake(self):
@@ -200,5 +298,12 @@ class TestBuild(TestBase, TempdirMixin):
         self.assertEqual('Oh hai!', stdout.decode("utf-8").strip())
 
 
+def _interrupted_wait(futures, **kwargs):
+    # interrupts the wait for the calls of visit_variants_parallel (as Ctrl-C
+    # would), once they have all finished
+    wait(futures)
+    raise KeyboardInterrupt
+
+
 if __name__ == '__main__':
     unittest.main()
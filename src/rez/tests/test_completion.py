@@ -30,7 +30,8 @@ class TestCompletion(TestBase):
         _eq("zzz", [])
         _eq("pref", ["prefix_prompt"])
         _eq("plugin", ["plugins",
-                       "plugin_path"])
+                       "plugin_path",
+                       "plugin_cache_path"])
         _eq("plugins", ["plugins",
                         "plugins.command",
                         "plugins.package_repository",
@@ -49,11 +50,11 @@ class TestCompletion(TestBase):
             self.assertEqual(set(completions), set(expected_completions))
 
         _eq("zzz", [])
-        _eq("", ["bahish", "nada", "nopy", "pybah", "pydad", "pyfoo", "pymum",
+        _eq("", ["bahish", "nada", "nopy", "pybah", "pydad", "pyfoo", "pylate", "pymum",
                  "pyodd", "pyson", "pysplit", "python", "pyvariants",
                  "test_variant_split_start", "test_variant_split_mid1",
                  "test_variant_split_mid2", "test_variant_split_end", "missing_variant_requires"])
-        _eq("py", ["pybah", "pydad", "pyfoo", "pymum", "pyodd", "pyson",
+        _eq("py", ["pybah", "pydad", "pyfoo", "pylate", "pymum", "pyodd", "pyson",
             "pysplit", "python", "pyvariants"])
         _eq("pys", ["pyson", "pysplit"])
         _eq("pyb", ["pybah", "pybah-4", "pybah-5"])
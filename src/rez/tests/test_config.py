@@ -8,7 +8,8 @@ test configuration settings
 import unittest
 from rez.tests.util import TestBase, TempdirMixin, restore_os_environ
 from rez.exceptions import ConfigurationError
-from rez.config import Config, get_module_root_config, _replace_config, _Deprecation
+from rez.config import Config, get_module_root_config, _replace_config, \
+    _Deprecation, _ConfigFileCache, _parse_config_yaml, _compile_config_py
 from rez.system import system
 from rez.utils.data_utils import RO_AttrDictWrapper
 from rez.packages import get_developer_package
@@ -297,6 +298,60 @@ class TestConfig(TestBase):
                 raise
 
 
+class TestConfigFileCache(TestBase, TempdirMixin):
+    @classmethod
+    def setUpClass(cls):
+        TempdirMixin.setUpClass()
+        cls.settings = {}
+
+    @classmethod
+    def tearDownClass(cls):
+        TempdirMixin.tearDownClass()
+
+    def test_cache(self):
+        """Test caching of parsed config files."""
+        cache_path = os.path.join(self.root, "config.cache")
+        yaml_filepath = os.path.join(self.root, "cached_config.yaml")
+        py_filepath = os.path.join(self.root, "cached_config.py")
+
+        with open(yaml_filepath, 'w') as f:
+            f.write("packages_path: [/foo]\n")
+        with open(py_filepath, 'w') as f:
+            f.write("packages_path = ['/bah']\n")
+
+        def _not_loaded(filepath):
+            raise AssertionError("%s was not loaded from cache" % filepath)
+
+        cache = _ConfigFileCache(cache_path)
+        doc = cache.get(yaml_filepath, _parse_config_yaml)
+        code = cache.get(py_filepath, _compile_config_py)
+        cache.save()
+        self.assertEqual(cache.misses, 2)
+
+        g = {}
+        exec(code, g)
+        self.assertEqual(g["packages_path"], ["/bah"])
+
+        # a new cache reads the entries from file
+        cache = _ConfigFileCache(cache_path)
+        self.assertEqual(cache.get(yaml_filepath, _not_loaded), doc)
+        code2 = cache.get(py_filepath, _not_loaded)
+        self.assertEqual(cache.hits, 2)
+
+        g = {}
+        exec(code2, g)
+        self.assertEqual(g["packages_path"], ["/bah"])
+
+        # changing a config file invalidates its entry
+        with open(yaml_filepath, 'w') as f:
+            f.write("packages_path: [/foo, /eek]\n")
+
+        cache = _ConfigFileCache(cache_path)
+        doc = cache.get(yaml_filepath, _parse_config_yaml)
+        self.assertEqual(doc, {"packages_path": ["/foo", "/eek"]})
+        self.assertEqual(cache.misses, 1)
+
+
 class TestDeprecations(TestBase, TempdirMixin):
     @classmethod
     def setUpClass(cls):
@@ -7,12 +7,20 @@ test resolved contexts
 """
 from rez.tests.util import restore_os_environ, restore_sys_path, TempdirMixin, \
     TestBase
-from rez.resolved_context import ResolvedContext
+from rez.resolved_context import ResolvedContext, resolve_many
 from rez.bundle_context import bundle_context
+from rez.env_cache import ContextEnvironmentCache
+from rez.resolve_server import ResolveServer
+from rez.package_repository import package_repository_manager
+from rez.exceptions import PackageFamilyNotFoundError
+from rez import compact_context
 from rez.bind import hello_world
 from rez.utils.platform_ import platform_
 from rez.utils.filesystem import is_subdirectory
+import multiprocessing
+import threading
 import unittest
+import socket
 import subprocess
 import platform
 import shutil
@@ -48,6 +56,169 @@ class TestContext(TestBase, TempdirMixin):
         r = ResolvedContext(["hello_world"])
         r.print_info()
 
+    def test_file_resolve_cache(self):
+        """Test resolves cached to a file-based resolve cache."""
+        cache_path = os.path.join(self.root, "resolve_cache")
+        self.update_settings(dict(resolve_caching=True,
+                                  memcached_uri=[],
+                                  resolve_cache_path=cache_path))
+
+        r = ResolvedContext(["hello_world"])
+        self.assertFalse(r.from_cache)
+
+        r2 = ResolvedContext(["hello_world"])
+        self.assertTrue(r2.from_cache)
+        self.assertEqual(r2.resolved_packages, r.resolved_packages)
+
+        r3 = ResolvedContext(["hello_world"], caching=False)
+        self.assertFalse(r3.from_cache)
+
+    def test_resolve_many(self):
+        """Test resolving many requests in a pool of processes."""
+        package_paths = [self.data_path("solver", "packages")]
+        requests = [
+            ["python"],
+            ["pyfoo", "python-2.5"],
+            ["nada", "!nada"],
+            ["python-1+<0"]
+        ]
+
+        def _summary(results):
+            summary = []
+            for result in results:
+                if isinstance(result, ResolvedContext):
+                    summary.append([result.status.name] + [
+                        x.qualified_package_name
+                        for x in (result.resolved_packages or [])
+                    ])
+                else:
+                    summary.append(type(result))
+            return summary
+
+        expected = _summary(
+            resolve_many(requests, max_workers=1, package_paths=package_paths))
+        self.assertEqual(expected[:3], [
+            ["solved", "python-2.7.0"],
+            ["solved", "python-2.5.2", "pyfoo-3.0.0"],
+            ["failed"]
+        ])
+        self.assertTrue(issubclass(expected[3], Exception))
+
+        if "fork" in multiprocessing.get_all_start_methods():
+            completed = []
+            results = resolve_many(requests, max_workers=2,
+                                   callback=lambda i, _: completed.append(i),
+                                   package_paths=package_paths)
+            self.assertEqual(_summary(results), expected)
+            self.assertEqual(sorted(completed), [0, 1, 2, 3])
+
+    @unittest.skipIf(platform_.name == "windows", "unix sockets only")
+    def test_resolve_server(self):
+        """Test resolves performed by a resolve server."""
+        socket_path = os.path.join(self.root, "resolve.sock")
+        packages_path = os.path.join(self.root, "server_packages")
+        shutil.copytree(self.packages_path, packages_path)
+
+        server = ResolveServer(socket_path)
+        socket_server = server.create_socket_server()
+        thread = threading.Thread(target=socket_server.serve_forever)
+        thread.start()
+
+        try:
+            self.update_settings(dict(resolve_server=socket_path,
+                                      packages_path=[packages_path]))
+
+            # a family that was not found is seen once it is released
+            self.assertRaises(PackageFamilyNotFoundError,
+                              ResolvedContext, ["foo"])
+
+            package_path = os.path.join(packages_path, "foo", "1.0")
+            os.makedirs(package_path)
+            with open(os.path.join(package_path, "package.py"), 'w') as f:
+                f.write("name = 'foo'\nversion = '1.0'\n")
+            mtime = os.stat(packages_path).st_mtime + 10
+            os.utime(packages_path, (mtime, mtime))
+
+            r = ResolvedContext(["foo"])
+            self.assertTrue(r.from_resolve_server)
+            self.assertEqual(
+                [x.qualified_package_name for x in r.resolved_packages],
+                ["foo-1.0"])
+            self.assertEqual(server.num_resolves, 1)
+
+            r = ResolvedContext(["hello_world"])
+            self.assertTrue(r.from_resolve_server)
+            self.assertTrue(r.success)
+            self.assertEqual(
+                [x.qualified_package_name for x in r.resolved_packages],
+                ["hello_world-1.0"])
+            self.assertIs(r.resolved_packages[0].context, r)
+            self.assertEqual(server.num_resolves, 2)
+
+            r = ResolvedContext(["hello_world", "!hello_world"])
+            self.assertTrue(r.from_resolve_server)
+            self.assertFalse(r.success)
+            self.assertIsNotNone(r.graph())
+
+            # resolves that need a callback are performed locally
+            r = ResolvedContext(["hello_world"], callback=lambda x: x)
+            self.assertFalse(r.from_resolve_server)
+
+            # a new release invalidates the server's caches
+            family_path = os.path.join(packages_path, "hello_world")
+            shutil.copytree(os.path.join(family_path, "1.0"),
+                            os.path.join(family_path, "2.0"))
+            package_file = os.path.join(family_path, "2.0", "package.py")
+            with open(package_file) as f:
+                content = f.read().replace("'1.0'", "'2.0'")
+            with open(package_file, 'w') as f:
+                f.write(content)
+
+            r = ResolvedContext(["hello_world"])
+            self.assertTrue(r.from_resolve_server)
+            self.assertEqual(
+                [x.qualified_package_name for x in r.resolved_packages],
+                ["hello_world-2.0"])
+
+            # so does a change to a loaded package definition, which does not
+            # change its family directory (as when a variant is installed)
+            with open(package_file, 'a') as f:
+                f.write("\nrequires = ['hello_world-1']\n")
+            mtime = os.stat(package_file).st_mtime + 10
+            os.utime(package_file, (mtime, mtime))
+
+            r = ResolvedContext(["hello_world"])
+            self.assertTrue(r.from_resolve_server)
+            self.assertEqual(
+                [x.qualified_package_name for x in r.resolved_packages],
+                ["hello_world-1.0"])
+        finally:
+            socket_server.shutdown()
+            socket_server.server_close()
+            thread.join()
+
+        # unreachable servers are ignored
+        r = ResolvedContext(["hello_world"])
+        self.assertFalse(r.from_resolve_server)
+        self.assertTrue(r.success)
+
+        # as are servers that do not respond in time
+        self.update_settings(dict(resolve_server=socket_path,
+                                  resolve_server_timeout=0.2,
+                                  packages_path=[packages_path]))
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            os.remove(socket_path)
+            sock.bind(socket_path)
+            sock.listen(1)
+
+            r = ResolvedContext(["hello_world"])
+            self.assertFalse(r.from_resolve_server)
+            self.assertTrue(r.success)
+        finally:
+            sock.close()
+
     def test_apply(self):
         """Test apply() function."""
         # Isolate our changes to os.environ and sys.path and return to the
@@ -109,6 +280,70 @@ class TestContext(TestBase, TempdirMixin):
         env = r2.get_environ()
         self.assertEqual(env.get("OH_HAI_WORLD"), "hello")
 
+    def test_serialize_compact(self):
+        """Test context serialization in the compact format."""
+        packages_path = os.path.join(self.root, "compact_packages")
+        shutil.copytree(self.packages_path, packages_path)
+        self.update_settings(dict(packages_path=[packages_path],
+                                  compact_context_files=True))
+
+        # save
+        file = os.path.join(self.root, "test_compact.rxt")
+        r = ResolvedContext(["hello_world"])
+        r.save(file)
+
+        with open(file, "rb") as f:
+            self.assertTrue(compact_context.is_compact(f.read()))
+
+        # variants are loaded from the data stored in the file, rather than
+        # from the repository
+        shutil.rmtree(os.path.join(packages_path, "hello_world"))
+        package_repository_manager.clear_caches()
+
+        r2 = ResolvedContext.load(file)
+        self.assertEqual(r.resolved_packages, r2.resolved_packages)
+        self.assertEqual(r2.get_environ().get("OH_HAI_WORLD"), "hello")
+
+        variant = r2.resolved_packages[0]
+        self.assertEqual(variant.root, r.resolved_packages[0].root)
+        self.assertEqual(variant.tools, ["hello_world"])
+
+        # json files are still readable
+        r.save(file, compact=False)
+        r3 = ResolvedContext.load(file)
+        self.assertEqual(r.resolved_packages, r3.resolved_packages)
+
+    def test_env_cache(self):
+        """Test caching of the environment of a context loaded from file."""
+        self.update_settings(dict(context_env_caching=True))
+
+        file = os.path.join(self.root, "test_env_cache.rxt")
+        ResolvedContext(["hello_world"]).save(file)
+
+        # first interpretation populates the cache
+        r = ResolvedContext.load(file)
+        parent_environ = {"PATH": "/foo"}
+        env = r.get_environ(parent_environ=parent_environ)
+        self.assertEqual(env.get("OH_HAI_WORLD"), "hello")
+
+        cache = ContextEnvironmentCache.for_context(r)
+        self.assertTrue(os.path.exists(cache.filepath))
+
+        # second interpretation replays the cached commands
+        r2 = ResolvedContext.load(file)
+        env2 = r2.get_environ(parent_environ=parent_environ)
+        self.assertEqual(env2, env)
+
+        entries = cache._read()
+        self.assertEqual(len(entries), 1)
+        entry = cache.get(next(iter(entries)))
+        self.assertTrue(entry.replayable)
+
+        # replayed commands match those of an uncached interpretation
+        self.update_settings(dict(context_env_caching=False))
+        r3 = ResolvedContext.load(file)
+        self.assertEqual(r3.get_environ(parent_environ=parent_environ), env2)
+
     def test_retarget(self):
         """Test that a retargeted context behaves identically."""
         self.inject_python_repo()
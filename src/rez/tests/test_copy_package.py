@@ -330,3 +330,33 @@ class TestCopyPackage(TestBase, TempdirMixin):
         # this can only match if the include module was copied with the package
         environ = ctxt.get_environ(parent_environ={})
         self.assertEqual(environ.get("EEK"), "2")
+
+    def test_9(self):
+        """Copy with multiple threads, hardlinking duplicate payload files."""
+        self._reset_dest_repository()
+
+        src_pkg = self._get_src_pkg("foo", "1.1.0")
+        copy_package(
+            package=src_pkg,
+            dest_repository=self.dest_install_root,
+            threads=4
+        )
+
+        result = copy_package(
+            package=src_pkg,
+            dest_repository=self.dest_install_root,
+            dest_version="1.2.0",
+            threads=4,
+            hardlink_duplicates=True
+        )
+
+        self._assert_copied(result, 1, 0)
+
+        # the payload file is identical in both versions, so is hardlinked
+        relpath = os.path.join("python", "foo", "__init__.py")
+        root1 = next(self._get_dest_pkg("foo", "1.1.0").iter_variants()).root
+        root2 = next(self._get_dest_pkg("foo", "1.2.0").iter_variants()).root
+        st1 = os.stat(os.path.join(root1, relpath))
+        st2 = os.stat(os.path.join(root2, relpath))
+
+        self.assertEqual((st1.st_dev, st1.st_ino), (st2.st_dev, st2.st_ino))
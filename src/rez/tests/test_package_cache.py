@@ -67,6 +67,128 @@ class TestPackageCache(TestBase, TempdirMixin):
         _, status = pkgcache.add_variant(variant)
         self.assertEqual(status, PackageCache.VARIANT_FOUND)
 
+    def test_cache_variants(self):
+        """Test caching of several variants at once."""
+        pkgcache = self._pkgcache()
+
+        variants = [
+            next(get_package("timestamped", "1.0.6").iter_variants()),
+            next(get_package("timestamped", "2.0.0").iter_variants()),
+            next(get_package("timestamped", "1.1.1").iter_variants())  # not cachable
+        ]
+
+        results = pkgcache.add_variants(variants, workers=2)
+        self.assertEqual(
+            [(variant, status) for variant, _, status in results],
+            [
+                (variants[0], PackageCache.VARIANT_CREATED),
+                (variants[1], PackageCache.VARIANT_CREATED),
+                (variants[2], PackageCache.VARIANT_NOT_FOUND)
+            ]
+        )
+
+        for variant, rootpath, _ in results[:2]:
+            self.assertEqual(pkgcache.get_cached_root(variant), rootpath)
+
+        # adding again should indicate the variants are already cached
+        results = pkgcache.add_variants(variants[:2], workers=2)
+        self.assertEqual(
+            [status for _, _, status in results],
+            [PackageCache.VARIANT_FOUND] * 2
+        )
+
+    def test_cache_variants_content_addressed(self):
+        """Test that identical payload files are shared between variants."""
+        self.update_settings(dict(package_cache_content_addressed=True))
+        pkgcache = self._pkgcache()
+
+        # create two versions of a package, with one file in common
+        repo_path = os.path.join(self.root, "blobby_packages")
+        for version in ("1.0", "1.1"):
+            pkg_path = os.path.join(repo_path, "blobby", version)
+            os.makedirs(pkg_path)
+
+            with open(os.path.join(pkg_path, "package.py"), 'w') as f:
+                f.write("name = 'blobby'\nversion = '%s'\n" % version)
+            with open(os.path.join(pkg_path, "data.txt"), 'w') as f:
+                f.write("shared data")
+
+        rootpaths = []
+        for version in ("1.0", "1.1"):
+            package = get_package("blobby", version, paths=[repo_path])
+            variant = next(package.iter_variants())
+
+            # forced, since packages in a temp dir are not cached otherwise
+            rootpath, status = pkgcache.add_variant(variant, force=True)
+            self.assertEqual(status, PackageCache.VARIANT_CREATED)
+            rootpaths.append(rootpath)
+
+        st1, st2 = [os.stat(os.path.join(x, "data.txt")) for x in rootpaths]
+        self.assertEqual(st1.st_ino, st2.st_ino)
+        self.assertEqual(st1.st_nlink, 3)  # the blob, and two variants
+
+        st1, st2 = [os.stat(os.path.join(x, "package.py")) for x in rootpaths]
+        self.assertNotEqual(st1.st_ino, st2.st_ino)
+
+        # blobs are deleted once no longer used by any variant
+        for version in ("1.0", "1.1"):
+            package = get_package("blobby", version, paths=[repo_path])
+            pkgcache.remove_variant(next(package.iter_variants()))
+
+        # an in-flight copy is kept, even though its mtime is that of its
+        # (old) source file
+        tmp_filepath = os.path.join(pkgcache._blobs_dir, ".tmp-inflight")
+        with open(tmp_filepath, 'w') as f:
+            f.write("shared data")
+        old_time = time.time() - (pkgcache._BLOB_TMP_TIME_MAX * 2)
+        os.utime(tmp_filepath, (old_time, old_time))
+
+        pkgcache.clean()
+
+        blobs = [
+            os.path.join(dirpath, name)
+            for dirpath, _, names in os.walk(pkgcache._blobs_dir)
+            for name in names
+        ]
+        self.assertEqual(blobs, [tmp_filepath])
+
+    def test_cache_stats(self):
+        """Test recording of cache metrics."""
+        pkgcache = self._pkgcache()
+        since = time.time()
+
+        package = get_package("timestamped", "2.1.0")
+        variant = next(package.iter_variants())
+
+        self.assertEqual(pkgcache.get_cached_root(variant), None)
+        pkgcache.add_variant(variant)
+        self.assertNotEqual(pkgcache.get_cached_root(variant), None)
+        self.assertNotEqual(pkgcache.get_cached_root(variant), None)
+        pkgcache.metrics.flush()
+
+        stats = pkgcache.get_stats(since=since)
+
+        self.assertEqual(stats["lookups"]["hit"], 2)
+        self.assertEqual(stats["lookups"]["miss"], 1)
+        self.assertAlmostEqual(stats["lookups"]["hit_rate"], 2 / 3.0)
+        self.assertEqual(stats["copies"]["count"], 1)
+
+        family = stats["families"]["timestamped"]
+        self.assertEqual(family["copies"], 1)
+        self.assertEqual(family["bytes"], stats["copies"]["bytes"])
+        self.assertEqual(
+            family["bytes"],
+            os.path.getsize(os.path.join(package.base, "package.py"))
+        )
+
+        # metrics are not recorded when disabled
+        self.update_settings(dict(package_cache_metrics_days=0))
+        pkgcache.get_cached_root(variant)
+        pkgcache.metrics.flush()
+
+        stats = pkgcache.get_stats(since=since)
+        self.assertEqual(stats["lookups"]["hit"], 2)
+
     def test_delete_cached_variant(self):
         """Test variant deletion from cache."""
         pkgcache = self._pkgcache()
@@ -8,7 +8,7 @@ test package iteration, serialization etc
 from rez.packages import iter_package_families, iter_packages, get_package, \
     create_package, get_developer_package, get_variant_from_uri, \
     get_package_from_uri, get_package_from_repository, \
-    get_package_family_from_repository
+    get_package_family_from_repository, scan_package_families
 from rez.exceptions import PackageRepositoryError
 from rez.package_py_utils import expand_requirement
 from rez.package_resources import package_release_keys
@@ -16,10 +16,12 @@ from rez.package_move import move_package
 from rez.package_remove import remove_package, remove_packages_ignored_since, \
     remove_package_family
 from rez.package_repository import package_repository_manager
+from rez.package_search import get_reverse_dependency_tree
 from rez.tests.util import TestBase, TempdirMixin
 from rez.utils.formatting import PackageRequest
 from rez.utils.sourcecode import SourceCode
 import unittest
+from unittest import mock
 from rez.version import Version
 from rez.version import VersionError
 from rez.utils.filesystem import canonical_path
@@ -36,6 +38,7 @@ ALL_PACKAGES = set([
     'pybah-4', 'pybah-5',
     'pydad-1', 'pydad-2', 'pydad-3',
     'pyfoo-3.0.0', 'pyfoo-3.1.0',
+    'pylate-1.0.0',
     'pymum-1', 'pymum-2', 'pymum-3',
     'pyodd-1', 'pyodd-2',
     'pyson-1', 'pyson-2',
@@ -133,6 +136,33 @@ class TestPackages(TestBase, TempdirMixin):
                 it = family.iter_packages()
                 self.assertTrue(package in it)
 
+    def test_scan_package_families(self):
+        """concurrent package family scanning."""
+        def _requires(name, packages):
+            return set(
+                str(req)
+                for pkg in packages
+                for variant in pkg.iter_variants()
+                for req in variant.get_requires()
+            )
+
+        names = sorted(ALL_FAMILIES)
+        expected = [
+            (name, _requires(name, list(iter_packages(name))))
+            for name in names
+        ]
+
+        for num_workers in (1, 4):
+            results = list(scan_package_families(
+                _requires, names, num_workers=num_workers))
+            self.assertEqual(results, expected)
+
+        # with range
+        results = list(scan_package_families(
+            lambda name, packages: _to_qnames(packages), ["pydad"], "<3",
+            num_workers=4))
+        self.assertEqual(results, [("pydad", set(["pydad-1", "pydad-2"]))])
+
     def test_pkg_data(self):
         """check package contents."""
         # a py-based package
@@ -618,6 +648,94 @@ class TestPackages(TestBase, TempdirMixin):
         i = repo.unignore_package(pkg_name, pkg_version)
         self.assertEqual(i, -1)
 
+    def test_package_index(self):
+        """Test filesystem repository package index."""
+        def _qnames(repo):
+            repo.clear_caches()
+            qnames = set()
+            for fam in iter_package_families(paths=[repo.location]):
+                qnames |= _to_qnames(fam.iter_packages())
+            return qnames
+
+        # copy packages to a temp repo
+        repo_path = os.path.join(self.root, "tmp7_packages")
+        shutil.copytree(self.solver_packages_path, repo_path)
+
+        repo = package_repository_manager.get_repository(repo_path)
+        expected_qnames = _qnames(repo)
+
+        # create the index
+        num_families = repo.update_package_index()
+        self.assertEqual(num_families, len(repo.get_families()))
+        self.assertTrue(os.path.isfile(repo.index_filepath))
+
+        # verify packages are found via the index, without touching disk
+        def _find_file(*nargs, **kwargs):
+            raise AssertionError("Package index was not used")
+
+        repo._find_file = _find_file
+        self.assertEqual(_qnames(repo), expected_qnames)
+        del repo._find_file
+
+        # ignoring a package updates the index
+        repo.ignore_package("pydad", Version("2"))
+        repo._find_file = _find_file
+        self.assertEqual(_qnames(repo), expected_qnames - set(["pydad-2"]))
+        del repo._find_file
+        repo.unignore_package("pydad", Version("2"))
+
+        # a change made outside of rez invalidates the family's index entry
+        fam_path = os.path.join(repo_path, "pydad")
+        shutil.copytree(os.path.join(fam_path, "3"), os.path.join(fam_path, "4"))
+        os.utime(fam_path, (0, 12345))
+        self.assertEqual(_qnames(repo), expected_qnames | set(["pydad-4"]))
+
+        # remove the index
+        self.assertTrue(repo.remove_package_index())
+        self.assertFalse(repo.remove_package_index())
+        self.assertEqual(_qnames(repo), expected_qnames | set(["pydad-4"]))
+
+    def test_reverse_dependency_index(self):
+        """Test reverse dependency lookup from the package index."""
+        def _rdeps(**kwargs):
+            repo.clear_caches()
+            pkgs_list, _ = get_reverse_dependency_tree(
+                "python", paths=[repo_path], **kwargs)
+            return pkgs_list
+
+        # copy packages to a temp repo
+        repo_path = os.path.join(self.root, "tmp8_packages")
+        shutil.copytree(self.solver_packages_path, repo_path)
+
+        repo = package_repository_manager.get_repository(repo_path)
+        expected = _rdeps(use_index=False)
+        self.assertEqual(expected, [["python"],
+                                    ["pybah", "pyfoo", "pylate", "pysplit",
+                                     "pyvariants"],
+                                    ["bahish", "pyodd"]])
+
+        repo.update_package_index()
+        self.assertEqual(repo.get_indexed_requires("pyfoo")["requires"],
+                         ["python"])
+
+        # verify the index is used, without loading any packages
+        def _scan(*nargs, **kwargs):
+            raise AssertionError("Package index was not used")
+
+        with mock.patch("rez.package_search.scan_package_families", _scan):
+            self.assertEqual(_rdeps(), expected)
+
+        # ignoring the latest package updates the index
+        repo.ignore_package("pybah", Version("5"))
+        self.assertEqual(str(repo.get_indexed_requires("pybah")["version"]), "4")
+        self.assertEqual(_rdeps(), _rdeps(use_index=False))
+
+        # a stale entry is not used
+        os.utime(os.path.join(repo_path, "pyfoo"), (0, 12345))
+        repo.clear_caches()
+        self.assertIsNone(repo.get_indexed_requires("pyfoo"))
+        self.assertEqual(_rdeps(), _rdeps(use_index=False))
+
 
 class TestMemoryPackages(TestBase):
     def test_1_memory_variant_parent(self):
@@ -8,7 +8,9 @@ test rezplugins manager behaviors
 from rez.tests.util import TestBase, TempdirMixin, restore_sys_path
 from rez.plugin_managers import plugin_manager, uncache_rezplugins_module_paths
 from rez.package_repository import package_repository_manager
+import json
 import sys
+import os
 import unittest
 
 
@@ -39,11 +41,13 @@ class TestPluginManagers(TestBase, TempdirMixin):
 
     @classmethod
     def setUpClass(cls):
+        TempdirMixin.setUpClass()
         cls.settings = {"debug_plugins": True}
 
     @classmethod
     def tearDownClass(cls):
         cls._reset_plugin_manager()
+        TempdirMixin.tearDownClass()
 
     def setUp(self):
         TestBase.setUp(self)
@@ -101,6 +105,74 @@ class TestPluginManagers(TestBase, TempdirMixin):
                 "package_repository", "memory")
             self.assertEqual("bar", mem_cls.on_test)
 
+    def test_plugin_manifest(self):
+        """Test plugins found via a cached plugin manifest"""
+        plugin_path = os.path.join(self.root, "manifest_plugins")
+        type_path = os.path.join(plugin_path, "rezplugins", "package_repository")
+        os.makedirs(type_path)
+
+        for filepath in (os.path.join(plugin_path, "rezplugins", "__init__.py"),
+                         os.path.join(type_path, "__init__.py")):
+            open(filepath, 'w').close()
+
+        def _add_plugin(name):
+            with open(os.path.join(type_path, name + ".py"), 'w') as f:
+                f.write(
+                    "from rez.package_repository import PackageRepository\n"
+                    "class Repo(PackageRepository):\n"
+                    "    @classmethod\n"
+                    "    def name(cls):\n"
+                    "        return %r\n"
+                    "def register_plugin():\n"
+                    "    return Repo\n" % name
+                )
+
+            # ensure the change is visible in the directory mtime
+            st = os.stat(type_path)
+            os.utime(type_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+        _add_plugin("manifest_one")
+
+        cache_path = os.path.join(self.root, "plugin_cache")
+        self.update_settings(dict(
+            plugin_path=[plugin_path],
+            plugin_cache_path=cache_path
+        ))
+
+        names = plugin_manager.get_discovered_plugins("package_repository")
+        self.assertIn("manifest_one", names)
+        self.assertIn("memory", names)
+
+        # plugins are found without being imported
+        self.assertNotIn("rezplugins.package_repository.manifest_one",
+                         sys.modules)
+
+        filenames = [x for x in os.listdir(cache_path)
+                     if x.startswith("package_repository-")]
+        self.assertEqual(len(filenames), 1)
+        with open(os.path.join(cache_path, filenames[0])) as f:
+            manifest = json.load(f)
+        self.assertIn("manifest_one", [x[0] for x in manifest["plugins"]])
+
+        # the manifest is used, and only the plugin asked for is imported
+        self._reset_plugin_manager()
+        cls = plugin_manager.get_plugin_class("package_repository",
+                                              "manifest_one")
+        self.assertEqual(cls.name(), "manifest_one")
+        self.assertIn("rezplugins.package_repository.manifest_one",
+                      sys.modules)
+        self.assertNotIn("rezplugins.package_repository.memory", sys.modules)
+
+        # a new plugin invalidates the manifest
+        _add_plugin("manifest_two")
+        self._reset_plugin_manager()
+        names = plugin_manager.get_discovered_plugins("package_repository")
+        self.assertIn("manifest_two", names)
+        self.assertEqual(
+            set(plugin_manager.get_plugins("package_repository")) & set(names),
+            set(names)
+        )
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -390,6 +390,33 @@ class TestRex(TestBase):
         _test(_rex_2, env={"A": "foo"}, expected={"A": True, "B": False})
         _test(_rex_3, env={}, expected="not b")
 
+    def test_record_replay(self):
+        """Test recording and replaying of commands."""
+        def _rex():
+            env.FOO = "foo"
+            appendenv("PATH", "/tmp")
+            alias("thing", "thang")
+
+        ex = self._create_executor({"PATH": "/usr/bin"})
+        with ex.manager.record() as recording:
+            ex.execute_function(_rex)
+        self.assertTrue(recording.replayable)
+
+        ex2 = self._create_executor({"PATH": "/usr/bin"})
+        ex2.manager.replay(recording.calls)
+        self.assertEqual(ex2.actions, ex.actions)
+        self.assertEqual(ex2.get_output(), ex.get_output())
+
+        # environment queries make a recording unsafe to replay
+        def _rex2():
+            if defined("FOO"):
+                env.BAH = "bah"
+
+        ex = self._create_executor({})
+        with ex.manager.record() as recording:
+            ex.execute_function(_rex2)
+        self.assertFalse(recording.replayable)
+
     def test_version_binding(self):
         """Test the Rex binding of the Version class."""
         v = VersionBinding(Version("1.2.3alpha"))
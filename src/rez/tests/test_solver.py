@@ -7,7 +7,11 @@ test dependency resolving algorithm
 """
 import rez.exceptions
 from rez.version import Requirement
-from rez.solver import Solver, Cycle, SolverStatus
+from rez.solver import Solver, SolverSeed, Cycle, SolverStatus, \
+    _ReductionQueue, _PackageVariantList, shared_package_variant_cache
+from rez.resolved_context import ResolvedContext
+from rez.package_repository import package_repository_manager
+from rez.version import VersionRange
 from rez.config import config
 import unittest
 from rez.tests.util import TestBase
@@ -256,6 +260,144 @@ class TestSolver(TestBase):
         config.override("error_on_missing_variant_requires", False)
         self._solve(["missing_variant_requires"], ["nada[]", "missing_variant_requires-1[1]"])
 
+    def _solve_seeded(self, seed_packages, packages, expected_resolve):
+        print()
+        seed_solver = Solver([Requirement(x) for x in seed_packages],
+                             self.packages_path,
+                             verbosity=solver_verbosity)
+        seed_solver.solve()
+        seed = SolverSeed.from_solver(seed_solver)
+
+        s = Solver([Requirement(x) for x in packages],
+                   self.packages_path,
+                   verbosity=solver_verbosity,
+                   seed=seed)
+        s.solve()
+        self.assertEqual(s.status, SolverStatus.solved)
+
+        resolve = [str(x) for x in s.resolved_packages]
+        print("request: %s (seeded from: %s)"
+              % (' '.join(packages), ' '.join(seed_packages)))
+        print("result: %s" % ' '.join(resolve))
+        self.assertEqual(resolve, expected_resolve)
+        return s
+
+    def test_13_incremental_solve(self):
+        """Solves seeded from a previous solve."""
+        s = self._solve_seeded(["pyfoo"], ["pyfoo", "nada"],
+                               ["python-2.6.8[]", "pyfoo-3.1.0[]", "nada[]"])
+        self.assertTrue(s.seeded)
+        self.assertFalse(s.seed_fallback)
+
+        # seeded python conflicts with the new request
+        s = self._solve_seeded(["python"], ["python", "pyfoo-3.0"],
+                               ["python-2.5.2[]", "pyfoo-3.0.0[]"])
+        self.assertFalse(s.seeded)
+        self.assertTrue(s.seed_fallback)
+
+        # a removed request cannot be seeded
+        s = self._solve_seeded(["nada", "nopy"], ["nopy"],
+                               ["nopy-2.1[]"])
+        self.assertFalse(s.seeded)
+        self.assertFalse(s.seed_fallback)
+
+        # changed requests are re-scoped rather than kept from the seed
+        s = self._solve_seeded(["python-2.6"], ["python", "nada"],
+                               ["python-2.7.0[]", "nada[]"])
+        self.assertTrue(s.seeded)
+
+    def test_14_reduction_queue(self):
+        """Pending reductions are deduplicated and popped in order."""
+        queue = _ReductionQueue([], optimised=True)
+        for x, y in ((0, 2), (3, 1), (0, 2), (3, 0), (1, 1), (0, 1)):
+            queue.add(x, y)
+
+        pairs = []
+        while True:
+            pair = queue.pop()
+            if pair is None:
+                break
+            pairs.append(pair)
+
+        self.assertEqual(pairs, [(3, 1), (3, 0), (0, 2), (0, 1)])
+
+    def test_15_profile(self):
+        """Solve profiling."""
+        reqs = [Requirement(x) for x in ["test_variant_split_start"]]
+        s = Solver(reqs, self.packages_path, profile=True)
+        s.solve()
+        self.assertEqual(s.status, SolverStatus.solved)
+
+        data = s.profile.to_dict()
+        operations = data["operations"]
+        self.assertEqual(operations["solve"]["count"], s.num_solves)
+        self.assertEqual(operations["finalise"]["count"], 1)
+        self.assertGreater(operations["split"]["count"], 0)
+
+        families = data["families"]
+        self.assertEqual(families["test_variant_split_start"]["add"]["count"], 1)
+        self.assertIn("test_variant_split_end", families)
+        self.assertIn("1", data["depths"])
+
+        for line in data["folded_stacks"]:
+            stack, usecs = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith("depth "))
+            self.assertGreater(int(usecs), 0)
+
+        # profiling is disabled by default
+        s = Solver(reqs, self.packages_path)
+        s.solve()
+        self.assertIsNone(s.profile)
+
+    def test_16_variant_list_intersection(self):
+        """Bisected variant list lookups match a linear scan."""
+        s = Solver([], self.packages_path)
+        variant_list = _PackageVariantList("python", s)
+
+        versions = [x.version for x, _ in variant_list.entries]
+        self.assertEqual(versions, sorted(versions))
+
+        for range_str in ("", "2", "2.6", "2.6+", ">2.6", "<2.6.8", "<=2.6.8",
+                          "2.5|2.7", "2.5.2|2.6.8+", "==2.6.0", "3+", "<2"):
+            range_ = VersionRange(range_str)
+            expected = [x for x in versions if x in range_]
+            result = [x.version for x, _ in variant_list.iter_entries(range_)]
+            self.assertEqual(result, expected, range_str)
+
+    def test_17_shared_variant_cache(self):
+        """Variant lists shared between solvers."""
+        self.update_settings({"shared_variant_caching": True})
+        shared_package_variant_cache.clear()
+
+        self._solve(["pyfoo", "python"],
+                    ["python-2.6.8[]", "pyfoo-3.1.0[]"])
+        self._solve(["python", "python-0+<2.6.8"],
+                    ["python-2.6.0[]"])
+        self.assertGreater(len(shared_package_variant_cache), 0)
+
+        reqs = [Requirement("python")]
+        s1 = Solver(reqs, self.packages_path)
+        s1.solve()
+        s2 = Solver(reqs, self.packages_path)
+        s2.solve()
+        self.assertIs(s1.package_cache.variant_lists["python"],
+                      s2.package_cache.variant_lists["python"])
+
+        # late bound requires are still evaluated per context
+        def _resolve(request):
+            r = ResolvedContext(request, package_paths=self.packages_path,
+                                add_implicit_packages=False)
+            return [x.qualified_package_name for x in r.resolved_packages]
+
+        self.assertEqual(_resolve(["pylate", "nada"]),
+                         ["python-2.6.8", "pylate-1.0.0", "nada"])
+        self.assertEqual(_resolve(["pylate"]),
+                         ["python-2.7.0", "pylate-1.0.0"])
+
+        # invalidated along with repository caches
+        package_repository_manager.clear_caches()
+        self.assertEqual(len(shared_package_variant_cache), 0)
+
 
 if __name__ == '__main__':
     unittest.main()
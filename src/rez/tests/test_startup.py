@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+test startup time of the rez command line tools
+"""
+from rez.tests.util import TestBase, TempdirMixin
+from rez import module_root_path
+import subprocess
+import unittest
+import json
+import time
+import sys
+import os
+import os.path
+
+
+# Code that runs a rez command line tool, then prints the rez modules that were
+# imported
+_run_cli_code = """
+import sys, json
+from rez.cli._main import run
+sys.argv = ["rez"] + %r
+try:
+    run()
+except SystemExit:
+    pass
+sys.stdout.write("\\n" + json.dumps(sorted(sys.modules)))
+"""
+
+
+class TestStartup(TestBase, TempdirMixin):
+    """Startup time tests.
+
+    Shell prompts and wrapper scripts often run a rez tool on every command,
+    so rez startup time is very noticeable. These tests fail if modules that
+    are slow to import are imported where they aren't needed, or if startup
+    time exceeds a budget.
+    """
+
+    # Maximum time for 'rez --version' to run, in excess of the time taken to
+    # start the python interpreter. This is far above the expected time
+    # (around 20ms), to allow for slow test hosts.
+    version_budget = 0.15
+
+    @classmethod
+    def setUpClass(cls):
+        TempdirMixin.setUpClass()
+        cls.settings = dict()
+
+        # time with byte-compiled modules, as in a typical install
+        cls.environ = os.environ.copy()
+        cls.environ.pop("PYTHONDONTWRITEBYTECODE", None)
+        cls.environ["PYTHONPYCACHEPREFIX"] = os.path.join(cls.root, "pycache")
+        cls.environ["PYTHONPATH"] = os.path.dirname(module_root_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        TempdirMixin.tearDownClass()
+
+    def _run(self, code):
+        start = time.time()
+        output = subprocess.check_output(
+            [sys.executable, "-c", code],
+            env=self.environ,
+            stderr=subprocess.DEVNULL,
+            universal_newlines=True
+        )
+        return output, time.time() - start
+
+    def _run_cli(self, args):
+        output, _ = self._run(_run_cli_code % (args,))
+        return set(json.loads(output.rsplit('\n', 1)[-1]))
+
+    def _best_time(self, code, repeats=5):
+        self._run(code)  # write .pyc files
+        return min(self._run(code)[1] for _ in range(repeats))
+
+    def test_lazy_imports(self):
+        """Test that trivial commands do not import heavy modules."""
+        heavy_modules = set([
+            "rez.config",
+            "rez.packages",
+            "rez.plugin_managers",
+            "rez.resolved_context",
+            "rez.solver",
+            "rez.vendor.colorama",
+            "rez.vendor.yaml"
+        ])
+
+        modules = self._run_cli(["--version"])
+        self.assertIn("rez.cli._main", modules)
+        self.assertEqual(modules & heavy_modules, set())
+
+    def test_version_budget(self):
+        """Test that 'rez --version' runs within its startup time budget."""
+        base_time = self._best_time("pass")
+        version_time = self._best_time(_run_cli_code % (["--version"],))
+
+        self.assertLess(
+            version_time - base_time, self.version_budget,
+            "'rez --version' took %.1fms (budget is %.1fms)"
+            % ((version_time - base_time) * 1000, self.version_budget * 1000)
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
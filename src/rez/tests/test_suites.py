@@ -9,8 +9,12 @@ from rez.tests.util import TestBase, TempdirMixin, \
     per_available_shell, install_dependent
 from rez.resolved_context import ResolvedContext
 from rez.suite import Suite
+from rez import suite_launch
+from rez.package_cache import PackageCache
 from rez.config import config
 from rez.system import system
+from rez.utils.platform_ import platform_
+from unittest import mock
 import subprocess
 import unittest
 import uuid
@@ -141,6 +145,67 @@ class TestRezSuites(TestBase, TempdirMixin):
 
         self._test_serialization(s)
 
+    def test_fast_launch(self):
+        """Test suite tools launched from the suite's launch manifest."""
+        self.update_settings(dict(suite_fast_launch=True))
+
+        s = Suite()
+        s.add_context("pooh", ResolvedContext(["pooh"]))
+        suite_path = os.path.join(self.root, "test_fast_launch")
+        s.save(suite_path)
+
+        manifest = suite_launch._load_manifest(suite_path)
+        self.assertIsNotNone(manifest)
+
+        tool = manifest["tools"]["hunny"]
+        self.assertEqual(tool["context_name"], "pooh")
+        self.assertEqual(tool["prefix_char"], '+')
+
+        # the suite's bin path is visible in the parent environ, so is added
+        # back to PATH (suite_visibility is 'always' by default)
+        bin_path = os.path.join(suite_path, "bin")
+        parent_environ = {"PATH": os.pathsep.join([bin_path, "/bin"])}
+
+        environ = suite_launch.get_launch_environ(
+            manifest["contexts"]["pooh"],
+            suite_visibility=manifest["suite_visibility"],
+            parent_suite_path=manifest["parent_suite_path"],
+            parent_environ=parent_environ
+        )
+
+        paths = environ["PATH"].split(os.pathsep)
+        self.assertEqual(os.path.dirname(tool["argv"][0]), paths[0])
+        self.assertIn(bin_path, paths)
+        self.assertFalse(any('\x00' in x for x in environ.values()))
+
+        if platform_.name != "windows":
+            output = subprocess.check_output(
+                tool["argv"], env=environ, universal_newlines=True)
+            self.assertTrue("yum yum" in output)
+
+        # rez args are handled by the full wrapper
+        self.assertIsNone(suite_launch.launch_suite_tool(
+            os.path.join(bin_path, "hunny"), ["+a"]))
+
+    def test_fast_launch_package_cache(self):
+        """Test that launch manifests do not refer to package cache roots."""
+        cache_path = os.path.join(self.root, "package_cache")
+        os.makedirs(cache_path)
+        self.update_settings(dict(
+            suite_fast_launch=True,
+            cache_packages_path=cache_path,
+            read_package_cache=True))
+
+        context = ResolvedContext(["pooh"])
+        cached_root = os.path.join(self.root, "cached_pooh")
+
+        with mock.patch.object(PackageCache, "get_cached_root",
+                               return_value=cached_root):
+            self.assertIn(cached_root, context.get_environ()["PATH"])
+
+            environ, _ = context.get_launch_environ()
+            self.assertNotIn(cached_root, environ["PATH"])
+
     @per_available_shell()
     @install_dependent()
     def test_executable(self, shell):
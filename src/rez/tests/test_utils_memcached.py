@@ -0,0 +1,141 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright Contributors to the Rez Project
+
+
+"""
+unit tests for 'utils.memcached' module
+"""
+from rez.tests.util import TestBase
+from rez.utils.memcached import memcached, DoNotCache
+from rez.package_repository import package_repository_manager
+from unittest import mock
+
+
+class _FakeMemcacheClient(object):
+    """In-memory stand-in for `memcache.Client`, which records its calls."""
+    store = {}
+    calls = []
+
+    def __init__(self, servers):
+        pass
+
+    def get(self, key):
+        self.calls.append("get")
+        return self.store.get(key)
+
+    def get_multi(self, keys):
+        self.calls.append("get_multi")
+        return dict((k, self.store[k]) for k in keys if k in self.store)
+
+    def set(self, key, val, time=0, min_compress_len=0):
+        self.calls.append("set")
+        self.store[key] = val
+
+    def set_multi(self, mapping, time=0, min_compress_len=0):
+        self.calls.append("set_multi")
+        self.store.update(mapping)
+
+    def disconnect_all(self):
+        pass
+
+
+class TestMemcached(TestBase):
+    def setUp(self):
+        super(TestMemcached, self).setUp()
+
+        _FakeMemcacheClient.store = {}
+        _FakeMemcacheClient.calls = []
+
+        patcher = mock.patch("rez.utils.memcached.Client_", _FakeMemcacheClient)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.computed = []
+
+    def _memcached_func(self):
+        @memcached(servers="127.0.0.1:11211")
+        def func(n):
+            self.computed.append(n)
+            if n % 2:
+                return DoNotCache(n * 10)
+            return n * 10
+
+        return func
+
+    def test_prefetch_hit(self):
+        """Test that a prefetched hit is consumed by the next matching call."""
+        func = self._memcached_func()
+        self.assertEqual(func(2), 20)
+        self.assertEqual(self.computed, [2])
+
+        _FakeMemcacheClient.calls = []
+        func.prefetch([(2,)])
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi"])
+
+        # served from the prefetched entry
+        self.assertEqual(func(2), 20)
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi"])
+        self.assertEqual(self.computed, [2])
+
+        # the prefetched entry was consumed
+        self.assertEqual(func(2), 20)
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "get"])
+        self.assertEqual(self.computed, [2])
+
+    def test_prefetch_miss(self):
+        """Test that prefetched misses are computed once, and stored at once."""
+        func = self._memcached_func()
+        func.prefetch([(2,), (4,), (4,)])
+
+        self.assertEqual(self.computed, [2, 4])
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "set_multi"])
+        self.assertEqual(len(_FakeMemcacheClient.store), 2)
+
+        self.assertEqual(func(2), 20)
+        self.assertEqual(func(4), 40)
+        self.assertEqual(self.computed, [2, 4])
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "set_multi"])
+
+    def test_prefetch_do_not_cache(self):
+        """Test that DoNotCache results are not stored by prefetch."""
+        func = self._memcached_func()
+        func.prefetch([(1,), (2,)])
+
+        self.assertEqual(self.computed, [1, 2])
+        self.assertEqual(len(_FakeMemcacheClient.store), 1)
+
+        # computed again, since it was not stored
+        self.assertEqual(func(1), 10)
+        self.assertEqual(self.computed, [1, 2, 1])
+        self.assertEqual(len(_FakeMemcacheClient.store), 1)
+
+    def test_forget_prefetched(self):
+        """Test that forget() drops prefetched entries."""
+        func = self._memcached_func()
+        func.prefetch([(2,)])
+        func.forget()
+
+        _FakeMemcacheClient.calls = []
+        self.assertEqual(func(2), 20)
+        self.assertEqual(_FakeMemcacheClient.calls, ["get"])
+
+    def test_repository_prefetch(self):
+        """Test that families already loaded by a repository are not
+        prefetched again."""
+        packages_path = self.data_path("solver", "packages")
+        self.update_settings(dict(memcached_uri=["127.0.0.1:11211"],
+                                  packages_path=[packages_path]))
+
+        package_repository_manager.clear_caches()
+        self.addCleanup(package_repository_manager.clear_caches)
+        repo = package_repository_manager.get_repository(packages_path)
+
+        repo.prefetch_package_families(["pyfoo"])
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "set_multi"])
+
+        family = repo.get_package_family("pyfoo")
+        self.assertTrue(list(repo.iter_packages(family)))
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "set_multi"])
+
+        repo.prefetch_package_families(["pyfoo"])
+        self.assertEqual(_FakeMemcacheClient.calls, ["get_multi", "set_multi"])
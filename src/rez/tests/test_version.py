@@ -169,6 +169,58 @@ class TestVersionSchema(unittest.TestCase):
         _eq2(set([b, c]) | set([c, d]), set([b, c, d]))
         _eq2(set([b, c]) & set([c, d]), set([c]))
 
+    def test_interning(self):
+        # versions and ranges created from the same string are shared
+        self.assertIs(Version("1.2.3"), Version("1.2.3"))
+        self.assertIsNot(Version("1.2.3"), Version("1-2-3"))
+        self.assertIs(VersionRange("1+<2"), VersionRange("1+<2"))
+        self.assertIsNot(VersionRange("1+<2"),
+                         VersionRange("1+<2", invalid_bound_error=False))
+
+        # derived versions are distinct objects
+        v = Version("1.2")
+        self.assertIsNot(v.copy(), v)
+        self.assertIsNot(v.trim(1), Version("1"))
+        self.assertEqual(v.trim(1), Version("1"))
+
+        # changing a copy of an interned range does not affect it
+        range_ = VersionRange("1+<2")
+        range_copy = range_.copy()
+        range_copy.visit_versions(lambda v: Version(str(v) + ".5"))
+        self.assertEqual(str(range_copy), "1.5+<2.5")
+        self.assertEqual(str(VersionRange("1+<2")), "1+<2")
+
+        # interned ranges cannot be changed in place
+        range_ = VersionRange("1+")
+        self.assertRaises(VersionError, range_.visit_versions,
+                          lambda v: Version("3"))
+        self.assertEqual(str(VersionRange("1+")), "1+")
+
+        # nor can ranges that share bounds with them
+        range_ = VersionRange("1+<2|4+<5")
+        range_span = range_.span()
+        range_span.visit_versions(lambda v: Version(str(v) + ".5"))
+        self.assertEqual(str(range_span), "1.5+<5.5")
+        self.assertEqual(str(VersionRange("1+<2|4+<5")), "1+<2|4+<5")
+        self.assertEqual(str(range_), "1+<2|4+<5")
+
+    def test_sort_keys(self):
+        # sort keys compare the same way as the objects they come from
+        versions = [self._create_random_version() for _ in range(50)]
+        versions += [Version(""), Version.inf]
+        for a in versions:
+            for b in versions:
+                self.assertEqual(a < b, a.sort_key() < b.sort_key())
+                self.assertEqual(a == b, a.sort_key() == b.sort_key())
+
+        ranges = [VersionRange(x) for x in
+                  ("", "1", "1+", ">1", "<=1", "<1", "1+<2", "==1", "1|3+<4",
+                   "1.0", "1..2", "01", "alpha")]
+        for a in ranges:
+            for b in ranges:
+                self.assertEqual(a < b, a.sort_key() < b.sort_key())
+                self.assertEqual(a == b, a.sort_key() == b.sort_key())
+
     def test_version_range(self):
         def _eq(a, b):
             _print("'%s' == '%s'" % (a, b))
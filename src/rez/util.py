@@ -11,6 +11,7 @@ import atexit
 import os
 import os.path
 import re
+import sys
 from rez.exceptions import RezError
 from rez.vendor.progress.bar import Bar
 
@@ -143,9 +144,14 @@ def find_last_sublist(list_, sublist):
 
 @atexit.register
 def _atexit():
+    # if no context was created there is nothing to clean up, and importing
+    # resolved_context here would only slow down exit
+    module = sys.modules.get("rez.resolved_context")
+    if module is None:
+        return
+
     try:
-        from rez.resolved_context import ResolvedContext
-        ResolvedContext.tmpdir_manager.clear()
+        module.ResolvedContext.tmpdir_manager.clear()
     except RezError:
         pass
 
@@ -4,7 +4,6 @@
 
 import sys
 import logging
-from rez.vendor import colorama
 
 # Important - we don't want to init Colorama at startup,
 # because colorama prints a RESET_ALL character at exit. This in turn adds
@@ -12,10 +11,14 @@ from rez.vendor import colorama
 # ResolvedContext, for example.
 # While we're not initializing colorama at all anymore, this comment is left
 # in case someone thought about putting it back: Make sure to do it lazily.
+#
+# Colorama is also imported lazily, since this module is imported at rez
+# startup.
 
 
 def colorama_wrap(stream):
     """ Wrap the stream with colorama so that it can display colors on any OS """
+    from rez.vendor import colorama
     return colorama.initialise.wrap_stream(stream, convert=None, strip=None, autoreset=False, wrap=True)
 
 
@@ -222,6 +225,8 @@ def _color(str_, fore_color=None, back_color=None, styles=None):
     if not config.get("color_enabled", False):
         return str_
 
+    from rez.vendor import colorama
+
     colored = ""
     if not styles:
         styles = []
@@ -266,7 +271,9 @@ class ColorizedStreamHandler(logging.StreamHandler):
 
     def __init__(self, stream=None):
         super(ColorizedStreamHandler, self).__init__(stream)
-        self.stream = colorama_wrap(self.stream)
+
+        # the stream is wrapped on first use, see `emit`
+        self._stream_wrapped = False
 
     @property
     def is_tty(self):
@@ -294,6 +301,10 @@ class ColorizedStreamHandler(logging.StreamHandler):
         appropriate styling.
         """
         try:
+            if not self._stream_wrapped:
+                self.stream = colorama_wrap(self.stream)
+                self._stream_wrapped = True
+
             message = self.format(record)
 
             if not self.is_colorized:
@@ -6,7 +6,6 @@
 Utilities related to process/script execution.
 """
 
-from rez.utils.yaml import dump_yaml
 from contextlib import contextmanager
 from enum import Enum
 import subprocess
@@ -225,6 +224,7 @@ def create_forwarding_script(filepath, module, func_name, *nargs, **kwargs):
     even though the parent environment may not be configured to do so.
     """
     from rez.utils.platform_ import platform_
+    from rez.utils.yaml import dump_yaml
 
     if platform_.name == "windows" and \
             os.path.splitext(filepath)[-1].lower() != ".cmd":
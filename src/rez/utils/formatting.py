@@ -8,7 +8,6 @@ Utilities related to formatting output or translating input.
 from string import Formatter
 from rez.version import Requirement
 from rez.exceptions import PackageRequestError
-from pprint import pformat
 from enum import Enum
 import os
 import os.path
@@ -276,6 +275,8 @@ def dict_to_attributes_code(dict_):
     Returns:
         str.
     """
+    from pprint import pformat
+
     lines = []
     for key, value in dict_.items():
         if isinstance(value, dict):
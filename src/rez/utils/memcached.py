@@ -117,6 +117,60 @@ class Client(object):
         self.logger("MISS: %s", key)
         return self.miss
 
+    def get_multi(self, keys):
+        """See memcache.Client.
+
+        Retrieves multiple keys in a single round trip to the server(s).
+
+        Returns:
+            dict: Values of the keys that were cached. Keys that missed are not
+            present in the dict.
+        """
+        if not self.servers:
+            return {}
+
+        qualified_keys = {}  # {hashed_key: (key, qualified_key)}
+        for key in keys:
+            qualified_key = self._qualified_key(key)
+            hashed_key = self.key_hasher(qualified_key)
+            qualified_keys[hashed_key] = (key, qualified_key)
+
+        entries = self.client.get_multi(list(qualified_keys.keys()))
+        results = {}
+
+        for hashed_key, entry in entries.items():
+            key, qualified_key = qualified_keys[hashed_key]
+            if isinstance(entry, tuple) and len(entry) == 2:
+                key_, result = entry
+                if key_ == qualified_key:
+                    results[key] = result
+
+        self.logger("MULTI-GET: %d hits, %d misses", len(results),
+                    len(qualified_keys) - len(results))
+        return results
+
+    def set_multi(self, mapping, time=0, min_compress_len=0):
+        """See memcache.Client.
+
+        Stores multiple keys in a single round trip to the server(s).
+
+        Args:
+            mapping (dict): Values to store, keyed by cache key.
+        """
+        if not self.servers or not mapping:
+            return
+
+        entries = {}
+        for key, val in mapping.items():
+            qualified_key = self._qualified_key(key)
+            hashed_key = self.key_hasher(qualified_key)
+            entries[hashed_key] = (qualified_key, val)
+
+        self.client.set_multi(entries,
+                              time=time,
+                              min_compress_len=min_compress_len)
+        self.logger("MULTI-SET: %d keys", len(entries))
+
     def delete(self, key):
         """See memcache.Client."""
         if self.servers:
@@ -286,6 +340,15 @@ def memcached(servers, key=None, from_cache=None, to_cache=None, time=0,
         If using the default key function, ensure that repr() is implemented on
         all your arguments and that they are hashable.
 
+    Note:
+        The wrapped function has a `prefetch` function attribute, which takes a
+        list of argument tuples. It fetches the entries for all of these calls
+        from memcached in a single round trip, runs the target function for any
+        that missed (storing those in a single round trip also), and holds the
+        results in memory until the matching call is made. Calls whose key
+        cannot be computed (the key function raises `EnvironmentError`, for
+        example because a path does not exist) are skipped.
+
     Note:
         `from_cache` and `to_cache` both accept the value as first parameter,
         then the target function's arguments follow.
@@ -350,16 +413,25 @@ def memcached(servers, key=None, from_cache=None, to_cache=None, time=0,
     to_cache = to_cache or identity
 
     def decorator(func):
+        # {cache_key: cached value}, see prefetch()
+        prefetched = {}
+
+        def get_key(*nargs, **kwargs):
+            if key:
+                return key(*nargs, **kwargs)
+            else:
+                return default_key(func, *nargs, **kwargs)
+
         if servers:
             def wrapper(*nargs, **kwargs):
                 with memcached_client(servers, debug=debug) as client:
-                    if key:
-                        cache_key = key(*nargs, **kwargs)
-                    else:
-                        cache_key = default_key(func, *nargs, **kwargs)
+                    cache_key = get_key(*nargs, **kwargs)
+
+                    # get, unless already prefetched
+                    result = prefetched.pop(cache_key, client.miss)
+                    if result is client.miss:
+                        result = client.get(cache_key)
 
-                    # get
-                    result = client.get(cache_key)
                     if result is not client.miss:
                         return from_cache(result, *nargs, **kwargs)
 
@@ -375,6 +447,42 @@ def memcached(servers, key=None, from_cache=None, to_cache=None, time=0,
                                time=time,
                                min_compress_len=min_compress_len)
                     return result
+
+            def prefetch(nargs_list):
+                """Fetch (or compute and store) the entries for several calls
+                at once. See `memcached`."""
+                cache_keys = {}
+                for nargs in nargs_list:
+                    try:
+                        cache_key = get_key(*nargs)
+                    except EnvironmentError:
+                        continue
+                    if cache_key not in prefetched:
+                        cache_keys[cache_key] = nargs
+
+                if not cache_keys:
+                    return
+
+                with memcached_client(servers, debug=debug) as client:
+                    results = client.get_multi(list(cache_keys.keys()))
+                    prefetched.update(results)
+
+                    # cache misses - run target function
+                    cache_results = {}
+                    for cache_key, nargs in cache_keys.items():
+                        if cache_key in results:
+                            continue
+
+                        result = func(*nargs)
+                        if isinstance(result, DoNotCache):
+                            continue
+
+                        cache_results[cache_key] = to_cache(result, *nargs)
+
+                    prefetched.update(cache_results)
+                    client.set_multi(cache_results,
+                                     time=time,
+                                     min_compress_len=min_compress_len)
         else:
             def wrapper(*nargs, **kwargs):
                 result = func(*nargs, **kwargs)
@@ -382,6 +490,9 @@ def memcached(servers, key=None, from_cache=None, to_cache=None, time=0,
                     return result.result
                 return result
 
+            def prefetch(nargs_list):
+                pass
+
         def forget():
             """Forget entries in the cache.
 
@@ -390,10 +501,12 @@ def memcached(servers, key=None, from_cache=None, to_cache=None, time=0,
             that entries set by the current process will no longer be seen during
             this process.
             """
+            prefetched.clear()
             with memcached_client(servers, debug=debug) as client:
                 client.flush()
 
         wrapper.forget = forget
+        wrapper.prefetch = prefetch
         wrapper.__wrapped__ = func
         return update_wrapper(wrapper, func)
     return decorator
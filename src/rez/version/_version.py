@@ -5,6 +5,7 @@
 from rez.version._util import VersionError, ParseException, _Common, \
     dedup
 from bisect import bisect_left
+from weakref import WeakValueDictionary
 import copy
 import string
 import re
@@ -90,6 +91,18 @@ class VersionToken(_Comparable):
     def __str__(self):
         raise NotImplementedError
 
+    def sort_key(self):
+        """Get a key that compares the same way as the token.
+
+        Versions compare by comparing the sort keys of their tokens. Token
+        classes can return a builtin type (such as a tuple) here, which
+        compares faster than the token itself.
+
+        Returns:
+            object: The token itself by default.
+        """
+        return self
+
     def __lt__(self, other):
         return self.less_than(other)
 
@@ -182,6 +195,8 @@ class AlphanumericVersionToken(VersionToken):
     regex = re.compile(r"[a-zA-Z0-9_]+\Z")
 
     def __init__(self, token):
+        self._key = None
+
         if token is None:
             self.subtokens = None
         elif not self.regex.match(token):
@@ -199,11 +214,20 @@ class AlphanumericVersionToken(VersionToken):
     def __str__(self):
         return ''.join(map(str, self.subtokens))
 
+    def sort_key(self):
+        # alphas sort before numbers, see class docstring
+        if self._key is None:
+            self._key = tuple(
+                (0, x.s) if x.n is None else (1, x.n, x.s)
+                for x in self.subtokens
+            )
+        return self._key
+
     def __eq__(self, other):
-        return (self.subtokens == other.subtokens)
+        return (self.sort_key() == other.sort_key())
 
     def less_than(self, other):
-        return (self.subtokens < other.subtokens)
+        return (self.sort_key() < other.sort_key())
 
     def __next__(self):
         other = AlphanumericVersionToken(None)
@@ -268,9 +292,24 @@ class Version(_Comparable):
 
     The empty version ``''`` is the smallest possible version, and can be used to
     represent an unversioned resource.
+
+    Versions created from a string are interned - constructing a version from
+    a string that is already in use returns the existing instance. Versions
+    must therefore not be modified once created.
     """
     inf = None
 
+    # interned instances, keyed on version string
+    _instances = WeakValueDictionary()
+
+    def __new__(cls, ver_str='', make_token=AlphanumericVersionToken):
+        if ver_str and cls is Version and make_token is AlphanumericVersionToken:
+            instance = cls._instances.get(ver_str)
+            if instance is not None:
+                return instance
+
+        return super(Version, cls).__new__(cls)
+
     def __init__(self, ver_str='', make_token=AlphanumericVersionToken):
         """
         Args:
@@ -278,10 +317,14 @@ class Version(_Comparable):
             make_token (typing.Callable[[str], None]): Callable that creates a VersionToken subclass from a
                 string.
         """
+        if "tokens" in self.__dict__:
+            return  # interned instance, already initialised
+
         self.tokens = []
         self.seps = []
         self._str = None
         self._hash = None
+        self._key = None
 
         if ver_str:
             toks = re_token.findall(ver_str)
@@ -301,6 +344,9 @@ class Version(_Comparable):
 
             self.seps = seps[1:-1]
 
+            if type(self) is Version and make_token is AlphanumericVersionToken:
+                Version._instances[ver_str] = self
+
     def copy(self):
         """
         Returns a copy of the version.
@@ -396,16 +442,40 @@ class Version(_Comparable):
 
     __bool__ = __nonzero__  # py3 compat
 
+    def sort_key(self):
+        """Get a key that compares the same way as the version.
+
+        Comparing keys is much faster than comparing versions, since the key
+        is typically a tuple of builtin types. The key is calculated once and
+        then cached.
+
+        Returns:
+            tuple:
+        """
+        key = self._key
+        if key is None:
+            if self.tokens is None:
+                key = (1,)  # the infinite version, greater than any other
+            else:
+                key = (0, tuple(x.sort_key() for x in self.tokens))
+            self._key = key
+        return key
+
     def __eq__(self, other):
-        return isinstance(other, Version) and self.tokens == other.tokens
+        return self is other or (
+            isinstance(other, Version) and self.sort_key() == other.sort_key())
 
     def __lt__(self, other):
-        if self.tokens is None:
-            return False
-        elif other.tokens is None:
-            return True
-        else:
-            return (self.tokens < other.tokens)
+        return self.sort_key() < other.sort_key()
+
+    def __gt__(self, other):
+        return self.sort_key() > other.sort_key()
+
+    def __le__(self, other):
+        return self.sort_key() <= other.sort_key()
+
+    def __ge__(self, other):
+        return self.sort_key() >= other.sort_key()
 
     def __hash__(self):
         if self._hash is None:
@@ -421,7 +491,7 @@ class Version(_Comparable):
 
 
 # internal use only
-Version.inf = Version()
+Version.inf = Version(None)
 Version.inf.tokens = None
 
 
@@ -444,13 +514,15 @@ class _LowerBound(_Comparable):
             and (self.inclusive == other.inclusive)
 
     def __lt__(self, other):
-        return (self.version < other.version) \
-            or ((self.version == other.version)
-                and (self.inclusive and not other.inclusive))
+        return self.sort_key() < other.sort_key()
 
     def __hash__(self):
         return hash((self.version, self.inclusive))
 
+    def sort_key(self):
+        # inclusive sorts before exclusive
+        return (self.version.sort_key(), not self.inclusive)
+
     def contains_version(self, version):
         return (version > self.version) \
             or (self.inclusive and (version == self.version))
@@ -477,13 +549,15 @@ class _UpperBound(_Comparable):
             and (self.inclusive == other.inclusive)
 
     def __lt__(self, other):
-        return (self.version < other.version) \
-            or ((self.version == other.version)
-                and (not self.inclusive and other.inclusive))
+        return self.sort_key() < other.sort_key()
 
     def __hash__(self):
         return hash((self.version, self.inclusive))
 
+    def sort_key(self):
+        # exclusive sorts before inclusive
+        return (self.version.sort_key(), self.inclusive)
+
     def contains_version(self, version):
         return (version < self.version) \
             or (self.inclusive and (version == self.version))
@@ -528,11 +602,14 @@ class _Bound(_Comparable):
         return (self.lower == other.lower) and (self.upper == other.upper)
 
     def __lt__(self, other):
-        return (self.lower, self.upper) < (other.lower, other.upper)
+        return self.sort_key() < other.sort_key()
 
     def __hash__(self):
         return hash((self.lower, self.upper))
 
+    def sort_key(self):
+        return (self.lower.sort_key(), self.upper.sort_key())
+
     def lower_bounded(self):
         return (self.lower != _LowerBound.min)
 
@@ -865,7 +942,24 @@ class VersionRange(_Comparable):
     also be used as an upper or lower bound, leading to some odd but perfectly
     valid version range syntax. For example, ``>`` is a valid range - read like
     ``>''``, it means ``any version greater than the empty version``.
+
+    Like versions, version ranges created from a string are interned, and must
+    not be modified once created.
     """
+
+    # interned instances, keyed on (range string, invalid_bound_error)
+    _instances = WeakValueDictionary()
+
+    def __new__(cls, range_str='', make_token=AlphanumericVersionToken,
+                invalid_bound_error=True):
+        if range_str and cls is VersionRange \
+                and make_token is AlphanumericVersionToken:
+            instance = cls._instances.get((range_str, invalid_bound_error))
+            if instance is not None:
+                return instance
+
+        return super(VersionRange, cls).__new__(cls)
+
     def __init__(self, range_str='', make_token=AlphanumericVersionToken,
                  invalid_bound_error=True):
         """
@@ -877,7 +971,12 @@ class VersionRange(_Comparable):
             invalid_bound_error (bool): If True, raise an exception if an
                 impossible range is given, such as '3+<2'.
         """
+        if "bounds" in self.__dict__:
+            return  # interned instance, already initialised
+
         self._str = None
+        self._key = None
+        self._intern_key = None
         self.bounds = []  # note: kept in ascending order
         if range_str is None:
             return
@@ -898,6 +997,11 @@ class VersionRange(_Comparable):
         else:
             self.bounds.append(_Bound.any)
 
+        if range_str and type(self) is VersionRange \
+                and make_token is AlphanumericVersionToken:
+            self._intern_key = (range_str, invalid_bound_error)
+            VersionRange._instances[self._intern_key] = self
+
     def is_any(self):
         """
         Returns:
@@ -1189,6 +1293,29 @@ class VersionRange(_Comparable):
             self, iterable, key, descending, mode=_ContainsVersionIterator.MODE_NON_INTERSECTING
         )
 
+    def copy(self):
+        """
+        Returns a copy of the range, which is safe to modify (see
+        :meth:`visit_versions`).
+
+        Returns:
+            VersionRange:
+        """
+        def _copy_bound(bound):
+            lower = bound.lower
+            if lower is not _LowerBound.min:
+                lower = _LowerBound(lower.version, lower.inclusive)
+
+            upper = bound.upper
+            if upper is not _UpperBound.inf:
+                upper = _UpperBound(upper.version, upper.inclusive)
+
+            return _Bound(lower, upper, invalid_bound_error=False)
+
+        other = VersionRange(None)
+        other.bounds = [_copy_bound(x) for x in self.bounds]
+        return other
+
     def span(self):
         """Return a contiguous range that is a superset of this range.
 
@@ -1201,8 +1328,6 @@ class VersionRange(_Comparable):
         other.bounds = [bound]
         return other
 
-    # TODO have this return a new VersionRange instead - this currently breaks
-    # VersionRange immutability, and could invalidate __str__.
     def visit_versions(self, func):
         """Visit each version in the range, and apply a function to each.
 
@@ -1215,6 +1340,10 @@ class VersionRange(_Comparable):
         example setting an upper bound to a smaller version than the lower bound.
         Use at your own risk.
 
+        Ranges created from a string are interned, and so may be shared (by
+        requirements, for example). These cannot be changed in place - call
+        this on a :meth:`copy` of such a range instead.
+
         Args:
             func (typing.Callable[[Version], typing.Optional[Version]]): Takes a
                 version, and is applied to every version in the range.
@@ -1223,17 +1352,43 @@ class VersionRange(_Comparable):
 
         Returns:
             None:
+
+        Raises:
+            VersionError: If this range is interned.
         """
+        if self._is_interned():
+            raise VersionError(
+                "Cannot change interned version range '%s' in place, visit a "
+                "copy of it instead" % str(self))
+
+        # bounds may be shared with other ranges (see `span`), so replace them
+        # rather than changing them in place
+        bounds = []
+
         for bound in self.bounds:
-            if bound.lower is not _LowerBound.min:
-                result = func(bound.lower.version)
-                if isinstance(result, Version):
-                    bound.lower.version = result
+            lower = bound.lower
+            if lower is not _LowerBound.min:
+                result = func(lower.version)
+                version = result if isinstance(result, Version) else lower.version
+                lower = _LowerBound(version, lower.inclusive)
+
+            upper = bound.upper
+            if upper is not _UpperBound.inf:
+                result = func(upper.version)
+                version = result if isinstance(result, Version) else upper.version
+                upper = _UpperBound(version, upper.inclusive)
 
-            if bound.upper is not _UpperBound.inf:
-                result = func(bound.upper.version)
-                if isinstance(result, Version):
-                    bound.upper.version = result
+            bounds.append(_Bound(lower, upper, invalid_bound_error=False))
+
+        self.bounds = bounds
+        self._str = None
+        self._key = None
+
+    def _is_interned(self):
+        return (
+            self._intern_key is not None
+            and VersionRange._instances.get(self._intern_key) is self
+        )
 
     def __contains__(self, version_or_range):
         if isinstance(version_or_range, Version):
@@ -1265,11 +1420,32 @@ class VersionRange(_Comparable):
             self._str = '|'.join(map(str, self.bounds))
         return self._str
 
+    def sort_key(self):
+        """Get a key that compares the same way as the range.
+
+        Returns:
+            tuple:
+        """
+        key = self._key
+        if key is None:
+            key = self._key = tuple(x.sort_key() for x in self.bounds)
+        return key
+
     def __eq__(self, other):
-        return isinstance(other, VersionRange) and self.bounds == other.bounds
+        return self is other or (
+            isinstance(other, VersionRange) and self.sort_key() == other.sort_key())
 
     def __lt__(self, other):
-        return (self.bounds < other.bounds)
+        return self.sort_key() < other.sort_key()
+
+    def __gt__(self, other):
+        return self.sort_key() > other.sort_key()
+
+    def __le__(self, other):
+        return self.sort_key() <= other.sort_key()
+
+    def __ge__(self, other):
+        return self.sort_key() >= other.sort_key()
 
     def __hash__(self):
         return hash(tuple(self.bounds))
@@ -20,9 +20,12 @@ from rez.utils.sourcecode import IncludeModuleManager
 from rez.utils.filesystem import TempDirs
 from rez.package_test import PackageTestRunner, PackageTestResults
 
+from contextlib import contextmanager, ExitStack
 from hashlib import sha1
+import multiprocessing
 import json
 import shutil
+import sys
 import os
 import os.path
 
@@ -30,7 +33,8 @@ import os.path
 class LocalBuildProcess(BuildProcessHelper):
     """The default build process.
 
-    This process builds a package's variants sequentially and on localhost.
+    This process builds a package's variants on localhost, either sequentially
+    or (with `parallel_variants`) concurrently.
     """
 
     # see `self._run_tests`
@@ -45,13 +49,21 @@ class LocalBuildProcess(BuildProcessHelper):
         self.ran_test_names = set()
         self.all_test_results = PackageTestResults()
 
-    def build(self, install_path=None, clean=False, install=False, variants=None):
+        # set while variant payloads are built in parallel, see
+        # `_visit_variants_parallel`
+        self._install_paths_writable = False
+
+    def build(self, install_path=None, clean=False, install=False, variants=None,
+              parallel_variants=None):
         self._print_header("Building %s..." % self.package.qualified_name)
 
         # build variants
-        num_visited, build_env_scripts = self.visit_variants(
+        num_visited, build_env_scripts = self._visit_variants(
             self._build_variant,
+            self._build_variant_payload,
+            self._install_built_variant,
             variants=variants,
+            parallel_variants=parallel_variants,
             install_path=install_path,
             clean=clean,
             install=install)
@@ -71,7 +83,8 @@ class LocalBuildProcess(BuildProcessHelper):
 
         return num_visited
 
-    def release(self, release_message=None, variants=None):
+    def release(self, release_message=None, variants=None,
+                parallel_variants=None):
         self._print_header("Releasing %s..." % self.package.qualified_name)
 
         # test that we're in a state to release
@@ -93,9 +106,13 @@ class LocalBuildProcess(BuildProcessHelper):
                        previous_revision=previous_revision)
 
         # release variants
-        num_visited, released_variants = self.visit_variants(
+        num_visited, released_variants = self._visit_variants(
             self._release_variant,
+            self._release_variant_payload,
+            self._install_released_variant,
             variants=variants,
+            parallel_variants=parallel_variants,
+            install_path=release_path,
             release_message=release_message)
 
         # ignore skipped variants
@@ -156,7 +173,8 @@ class LocalBuildProcess(BuildProcessHelper):
         last_dir = get_existing_path(variant_install_path,
                                      topmost_path=install_path)
 
-        if last_dir and config.make_package_temporarily_writable:
+        if last_dir and config.make_package_temporarily_writable \
+                and not self._install_paths_writable:
             ctxt = make_path_writable(last_dir)
         else:
             ctxt = with_noop()
@@ -317,8 +335,161 @@ class LocalBuildProcess(BuildProcessHelper):
         except Exception as e:
             print_warning("Failed to delete %s - %s", path, e)
 
+    def _visit_variants(self, func, payload_func, install_func, variants=None,
+                        parallel_variants=None, **kwargs):
+        """Build and install variants.
+
+        Variants are visited by `func` one at a time, unless `parallel_variants`
+        is more than one. In that case, variant payloads are built and
+        installed concurrently by `payload_func`, and their output is printed
+        in variant order as each completes. The variants are then installed
+        into the package repository (ie package.py is updated) one at a time,
+        in order, by `install_func`. Fewer than two variants are always
+        visited by `func`.
+        """
+        num_variants = len(set(variants)) if variants \
+            else self.package.num_variants
+
+        if parallel_variants and parallel_variants > 1 and num_variants > 1:
+            if "fork" in multiprocessing.get_all_start_methods():
+                return self._visit_variants_parallel(
+                    payload_func,
+                    install_func,
+                    variants=variants,
+                    parallel_variants=parallel_variants,
+                    **kwargs)
+
+            print_warning("Variants cannot be built in parallel on this "
+                          "platform; they will be built one at a time.")
+
+        return self.visit_variants(func, variants=variants, **kwargs)
+
+    def _visit_variants_parallel(self, payload_func, install_func, variants,
+                                 parallel_variants, **kwargs):
+        self._print("\nBuilding up to %d variants in parallel...",
+                    parallel_variants)
+
+        # The workers install into the same directories, so these are made
+        # writable here, for the duration of all the builds, rather than by
+        # each worker (see `_build_variant_base`)
+        #
+        install_path = kwargs.get("install_path") \
+            or self.package.config.local_packages_path
+
+        def discard_payloads(visits_, reason):
+            for visit in visits_:
+                if visit.success:
+                    self._discard_variant_payload(
+                        visit.variant, visit.result, reason, **kwargs)
+
+        with self._variant_install_paths_writable(variants, install_path):
+            visits = self.visit_variants_parallel(
+                payload_func,
+                variants=variants,
+                max_workers=parallel_variants,
+                on_error=lambda x: discard_payloads(x, "the build was interrupted"),
+                **kwargs)
+
+        # Install in variant order. Once a variant fails, later variants are
+        # discarded, so that the result is the same as a sequential build.
+        #
+        results = []
+        error = None
+
+        for i, visit in enumerate(visits):
+            if visit.cancelled:
+                continue
+
+            sys.stdout.write(visit.get_log())
+            self._print("\n(build log: %s)", visit.log_filepath)
+
+            if error is not None:
+                discard_payloads([visit], "an earlier variant failed")
+                continue
+
+            if visit.exception is not None:
+                error = visit.exception
+                continue
+
+            try:
+                result = install_func(visit.variant, visit.result, **kwargs)
+            except Exception as e:
+                error = e
+                continue
+            except BaseException:
+                # eg KeyboardInterrupt
+                discard_payloads(visits[i + 1:], "the build was interrupted")
+                raise
+
+            results.append(result)
+
+        if error is not None:
+            raise error
+
+        return len(results), results
+
+    @contextmanager
+    def _variant_install_paths_writable(self, variants, install_path):
+        if not config.make_package_temporarily_writable:
+            yield
+            return
+
+        package_install_path = self.get_package_install_path(install_path)
+        last_dirs = set()
+
+        for variant in self.package.iter_variants():
+            if variants and variant.index not in variants:
+                continue
+
+            if variant.index is None:
+                variant_install_path = package_install_path
+            else:
+                variant_install_path = os.path.join(
+                    package_install_path, variant._non_shortlinked_subpath)
+
+            last_dir = get_existing_path(variant_install_path,
+                                         topmost_path=install_path)
+            if last_dir:
+                last_dirs.add(last_dir)
+
+        with ExitStack() as stack:
+            for path in sorted(last_dirs):
+                stack.enter_context(make_path_writable(path))
+
+            self._install_paths_writable = True
+            try:
+                yield
+            finally:
+                self._install_paths_writable = False
+
+    def _discard_variant_payload(self, variant, build_result, reason,
+                                 install=True, **kwargs):
+        # undo a payload installation, for a variant that is not going to be
+        # installed into the package repository
+        if not (install and build_result):
+            return
+
+        print_warning("Discarding variant %s (%s), %s",
+                      variant.index, self._n_of_m(variant), reason)
+
+        self._rmtree(build_result["variant_install_path"])
+        self._cancel_variant_install(variant, build_result["install_path"])
+
+    def _cancel_variant_install(self, variant, install_path):
+        # indicate to repo that the variant install is cancelled
+        pkg_repo = package_repository_manager.get_repository(install_path)
+        pkg_repo.on_variant_install_cancelled(variant.resource)
+
     def _build_variant(self, variant, install_path=None, clean=False,
                        install=False, **kwargs):
+        build_result = self._build_variant_payload(
+            variant, install_path=install_path, clean=clean, install=install)
+
+        return self._install_built_variant(
+            variant, build_result, install_path=install_path, install=install)
+
+    def _build_variant_payload(self, variant, install_path=None, clean=False,
+                               install=False, **kwargs):
         if variant.index is not None:
             self._print_header(
                 "Building variant %s (%s)..."
@@ -327,11 +498,6 @@ class LocalBuildProcess(BuildProcessHelper):
         # build and possibly install variant (ie the payload, not package.py)
         install_path = install_path or self.package.config.local_packages_path
 
-        def cancel_variant_install():
-            if install:
-                pkg_repo = package_repository_manager.get_repository(install_path)
-                pkg_repo.on_variant_install_cancelled(variant.resource)
-
         try:
             build_result = self._build_variant_base(
                 build_type=BuildType.local,
@@ -340,11 +506,17 @@ class LocalBuildProcess(BuildProcessHelper):
                 clean=clean,
                 install=install)
         except BuildError:
-            # indicate to repo that the variant install is cancelled
-            cancel_variant_install()
-
+            if install:
+                self._cancel_variant_install(variant, install_path)
             raise
 
+        build_result["install_path"] = install_path
+        return build_result
+
+    def _install_built_variant(self, variant, build_result, install=False,
+                               **kwargs):
+        install_path = build_result["install_path"]
+
         if install:
             # run any tests that are configured to run pre-install
             try:
@@ -358,7 +530,7 @@ class LocalBuildProcess(BuildProcessHelper):
                 self._rmtree(build_result["variant_install_path"])
 
                 # indicate to repo that the variant install is cancelled
-                cancel_variant_install()
+                self._cancel_variant_install(variant, install_path)
 
                 raise
 
@@ -368,6 +540,12 @@ class LocalBuildProcess(BuildProcessHelper):
         return build_result.get("build_env_script")
 
     def _release_variant(self, variant, release_message=None, **kwargs):
+        build_result = self._release_variant_payload(variant)
+
+        return self._install_released_variant(
+            variant, build_result, release_message=release_message)
+
+    def _release_variant_payload(self, variant, **kwargs):
         release_path = self.package.config.release_packages_path
 
         # test if variant has already been released
@@ -379,10 +557,6 @@ class LocalBuildProcess(BuildProcessHelper):
             )
             return None
 
-        def cancel_variant_install():
-            pkg_repo = package_repository_manager.get_repository(release_path)
-            pkg_repo.on_variant_install_cancelled(variant.resource)
-
         if variant.index is not None:
             self._print_header("Releasing variant %s..." % self._n_of_m(variant))
 
@@ -395,11 +569,19 @@ class LocalBuildProcess(BuildProcessHelper):
                 clean=True,
                 install=True)
         except BuildError:
-            # indicate to repo that the variant install is cancelled
-            cancel_variant_install()
-
+            self._cancel_variant_install(variant, release_path)
             raise
 
+        build_result["install_path"] = release_path
+        return build_result
+
+    def _install_released_variant(self, variant, build_result,
+                                  release_message=None, **kwargs):
+        if build_result is None:
+            return None  # skipped, already released
+
+        release_path = build_result["install_path"]
+
         # run any tests that are configured to run pre-install
         try:
             self._run_tests(
@@ -412,7 +594,7 @@ class LocalBuildProcess(BuildProcessHelper):
             self._rmtree(build_result["variant_install_path"])
 
             # indicate to repo that the variant install is cancelled
-            cancel_variant_install()
+            self._cancel_variant_install(variant, release_path)
 
             raise
 
@@ -8,12 +8,13 @@ Filesystem-based package repository
 from contextlib import contextmanager
 import os.path
 import os
+import json
 import stat
 import errno
 import time
 import shutil
 
-from rez.package_repository import PackageRepository
+from rez.package_repository import PackageRepository, package_repo_stats
 from rez.package_resources import PackageFamilyResource, VariantResourceHelper, \
     PackageResourceHelper, package_pod_schema, \
     package_release_keys, package_build_only_keys
@@ -34,7 +35,7 @@ from rez.utils.yaml import load_yaml
 from rez.config import config
 from rez.backport.lru_cache import lru_cache
 from rez.vendor.schema.schema import Schema, Optional, And, Use, Or
-from rez.version import Version, VersionRange
+from rez.version import Version, VersionRange, VersionError
 
 
 debug_print = config.debug_printer("resources")
@@ -189,11 +190,12 @@ class FileSystemPackageResource(PackageResourceHelper):
             raise PackageDefinitionFileMissing(
                 "Missing package definition file: %r" % self)
 
-        data = load_from_file(
-            self.filepath,
-            self.file_format,
-            disable_memcache=self._repository.disable_memcache
-        )
+        with package_repo_stats.package_loading():
+            data = load_from_file(
+                self.filepath,
+                self.file_format,
+                disable_memcache=self._repository.disable_memcache
+            )
 
         check_format_version(self.filepath, data)
 
@@ -334,11 +336,12 @@ class FileSystemCombinedPackageFamilyResource(PackageFamilyResource):
     def _load(self):
         # TODO: Deprecate: What is self.ext?
         format_ = FileFormat[self.ext]
-        data = load_from_file(
-            self.filepath,
-            format_,
-            disable_memcache=self._repository.disable_memcache
-        )
+        with package_repo_stats.package_loading():
+            data = load_from_file(
+                self.filepath,
+                format_,
+                disable_memcache=self._repository.disable_memcache
+            )
 
         check_format_version(self.filepath, data)
         return data
@@ -468,11 +471,16 @@ class FileSystemPackageRepository(PackageRepository):
     schema_dict = {"file_lock_timeout": int,
                    "file_lock_dir": Or(None, str),
                    "file_lock_type": Or("default", "link", "mkdir"),
-                   "package_filenames": [str]}
+                   "package_filenames": [str],
+                   "use_package_index": bool}
 
     building_prefix = ".building"
     ignore_prefix = ".ignore"
 
+    # see `update_package_index`
+    index_filename = ".rez-index.json"
+    index_version = 1
+
     package_file_mode = (
         None if os.name == "nt" else
 
@@ -532,6 +540,14 @@ class FileSystemPackageRepository(PackageRepository):
         self.get_variants = lru_cache(maxsize=None)(self._get_variants)
         self.get_file = lru_cache(maxsize=None)(self._get_file)
 
+        # names of the families whose packages have been loaded (and cached
+        # by get_packages) - these are not prefetched again
+        self._loaded_families = set()
+
+        # package index, loaded on first use
+        self._index = None
+        self._index_entries = {}
+
         # decorate with memcachemed memoizers unless told otherwise
         if not self.disable_memcache:
             decorator1 = memcached(
@@ -560,6 +576,18 @@ class FileSystemPackageRepository(PackageRepository):
     def get_package_family(self, name):
         return self.get_family(name)
 
+    def prefetch_package_families(self, names):
+        # batches the memcached gets/sets of the version listings of all the
+        # given families into a single round trip
+        if self.disable_memcache:
+            return
+
+        nargs_list = [
+            (os.path.join(self.location, x),) for x in names
+            if x not in self._loaded_families
+        ]
+        self._get_version_dirs.prefetch(nargs_list)
+
     @pool_memcached_connections
     def iter_package_families(self):
         for family in self.get_families():
@@ -1008,14 +1036,132 @@ class FileSystemPackageRepository(PackageRepository):
         self.get_packages.cache_clear()
         self.get_variants.cache_clear()
         self.get_file.cache_clear()
+        self._loaded_families = set()
 
         if not self.disable_memcache:
             self._get_family_dirs.forget()
             self._get_version_dirs.forget()
 
+        self._index = None
+        self._index_entries = {}
+
         # unfortunately we need to clear file cache across the board
         clear_file_caches()
 
+    @property
+    def index_filepath(self):
+        return os.path.join(self.location, self.index_filename)
+
+    def update_package_index(self, family_names=None):
+        """Create or update the package index of this repository.
+
+        The package index is a single file in the repository root that records
+        the version directories and package definition files of each package
+        family. When it is present, the directory listings and file stats that
+        are otherwise needed to find the packages in a family are replaced by
+        a single read of the index file. The index also records the
+        requirements of the latest package in each family, for fast reverse
+        dependency lookups (see `get_indexed_requires`).
+
+        Each family entry stores the mtime of the family directory it was
+        created from. An entry is ignored if the family directory has changed
+        since - in that case the family is read from disk as usual. Once the
+        index exists, it is updated whenever a package is installed, removed or
+        (un)ignored.
+
+        Note that combined-style packages are not indexed.
+
+        Args:
+            family_names (list of str): Families to update. If None, the index
+                is rebuilt from all families in the repository.
+
+        Returns:
+            int: Number of families indexed.
+        """
+        if family_names is None:
+            families = {}
+            family_names = [
+                name for name, ext in self._get_family_dirs()
+                if ext is None
+            ]
+        else:
+            families = self._read_index_file()
+
+        for name in family_names:
+            entry = self._create_index_entry(name)
+            if entry is None:
+                families.pop(name, None)
+            else:
+                families[name] = entry
+
+        data = {
+            "index_version": self.index_version,
+            "families": families
+        }
+
+        # write to a tmpfile and rename, so readers never see a partially
+        # written index
+        filepath = self.index_filepath
+        tmp_filepath = "%s.%d.tmp" % (filepath, os.getpid())
+
+        try:
+            with open(tmp_filepath, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+
+            os.replace(tmp_filepath, filepath)
+        finally:
+            if os.path.exists(tmp_filepath):
+                os.remove(tmp_filepath)
+
+        self._index = None
+        self._index_entries = {}
+        return len(families)
+
+    def remove_package_index(self):
+        """Delete the package index of this repository, if present.
+
+        Returns:
+            bool: True if the index was removed.
+        """
+        try:
+            os.remove(self.index_filepath)
+        except OSError as e:
+            if e.errno != errno.ENOENT:
+                raise
+            return False
+
+        self._index = None
+        self._index_entries = {}
+        return True
+
+    def get_indexed_requires(self, name):
+        # the indexed latest package is the latest non-ignored one
+        if self.disable_pkg_ignore:
+            return None
+
+        entry = self._get_index_entry(os.path.join(self.location, name))
+        if entry is None or entry.get("latest") is None:
+            return None
+
+        try:
+            version = self._get_indexed_latest_version(entry)
+        except VersionError:
+            return None
+
+        latest = entry["latest"]
+
+        # guards against an index written with different settings
+        # (eg check_package_definition_files)
+        if latest["version"] != (None if version is None else str(version)):
+            return None
+
+        return {
+            "version": version,
+            "requires": latest["requires"],
+            "build_requires": latest["build_requires"],
+            "private_build_requires": latest["private_build_requires"]
+        }
+
     def get_package_payload_path(self, package_name, package_version=None):
         path = os.path.join(self.location, package_name)
 
@@ -1059,6 +1205,10 @@ class FileSystemPackageRepository(PackageRepository):
         return str(("listdir", root, int(st.st_ino), st.st_mtime))
 
     def _get_version_dirs(self, root):
+        entry = self._get_index_entry(root)
+        if entry is not None:
+            return self._get_indexed_version_dirs(entry)
+
         # Ignore a version if there is a .ignore<version> file next to it
         def ignore_dir(name):
             if self.disable_pkg_ignore:
@@ -1170,12 +1320,38 @@ class FileSystemPackageRepository(PackageRepository):
         return None
 
     def _get_packages(self, package_family_resource):
-        return [x for x in package_family_resource.iter_packages()]
+        packages = [x for x in package_family_resource.iter_packages()]
+        self._loaded_families.add(package_family_resource.name)
+        return packages
 
     def _get_variants(self, package_resource):
         return [x for x in package_resource.iter_variants()]
 
+    def _get_indexed_version_dirs(self, entry):
+        dirs = []
+
+        for name, (filename, ignored, building) in entry["versions"].items():
+            if ignored and not self.disable_pkg_ignore:
+                continue
+
+            # as in `_get_version_dirs`, 'building' dirs are always checked
+            # for validity
+            if filename is None and \
+                    (building or _settings.check_package_definition_files):
+                continue
+
+            dirs.append(name)
+
+        return dirs
+
     def _get_file(self, path, package_filename=None):
+        result = self._get_indexed_file(path, package_filename)
+        if result is not None:
+            return result
+
+        return self._find_file(path, package_filename)
+
+    def _find_file(self, path, package_filename=None):
         if package_filename:
             package_filenames = [package_filename]
         else:
@@ -1190,6 +1366,185 @@ class FileSystemPackageRepository(PackageRepository):
                     return filepath, format_
         return None, None
 
+    def _get_indexed_file(self, path, package_filename=None):
+        # Returns None if `path` is not covered by the package index. Note
+        # that the index only records the first of `package_filenames` found
+        if package_filename and package_filename not in _settings.package_filenames:
+            return None
+
+        family_path, name = os.path.split(path)
+
+        if family_path == self.location:
+            # unversioned package
+            entry = self._get_index_entry(path)
+            if entry is None:
+                return None
+            filename = entry["file"]
+        else:
+            entry = self._get_index_entry(family_path)
+            if entry is None or name not in entry["versions"]:
+                return None
+            filename = entry["versions"][name][0]
+
+        if filename is None:
+            return None, None
+
+        name_, ext = os.path.splitext(filename)
+        if package_filename and name_ != package_filename:
+            return None
+
+        format_ = FileFormat.py if ext == ".py" else FileFormat.yaml
+        return os.path.join(path, filename), format_
+
+    def _get_indexed_latest_version(self, entry):
+        # as in `FileSystemPackageFamilyResource.iter_packages`
+        if config.allow_unversioned_packages and entry["file"] is not None:
+            return Version()
+
+        version_strs = self._get_indexed_version_dirs(entry)
+        if not version_strs:
+            return None
+        return max(Version(x) for x in version_strs)
+
+    def _get_index_entry(self, family_path):
+        # Returns the package index entry of the given family dir, or None if
+        # there is no up-to-date entry
+        if not _settings.use_package_index:
+            return None
+
+        parent_path, name = os.path.split(family_path)
+        if parent_path != self.location:
+            return None
+
+        try:
+            return self._index_entries[name]
+        except KeyError:
+            pass
+
+        if self._index is None:
+            self._index = self._read_index_file()
+
+        entry = self._index.get(name)
+
+        if entry is not None:
+            try:
+                mtime = os.stat(family_path).st_mtime
+            except OSError:
+                mtime = None
+
+            if entry["mtime"] != mtime:
+                debug_print("Package index entry for %r is stale", family_path)
+                entry = None
+
+        self._index_entries[name] = entry
+        return entry
+
+    def _read_index_file(self):
+        filepath = self.index_filepath
+
+        try:
+            with open(filepath) as f:
+                data = json.load(f)
+        except (IOError, OSError):
+            return {}
+        except ValueError as e:
+            print_warning("Ignoring invalid package index %r: %s", filepath, e)
+            return {}
+
+        if data.get("index_version") != self.index_version:
+            debug_print("Ignoring package index %r: index version mismatch",
+                        filepath)
+            return {}
+
+        return data["families"]
+
+    def _create_index_entry(self, name):
+        family_path = os.path.join(self.location, name)
+
+        # the mtime is read before the listing, so that a change made during
+        # the listing causes the entry to be ignored
+        try:
+            mtime = os.stat(family_path).st_mtime
+            names = os.listdir(family_path)
+        except OSError:
+            return None
+
+        names_set = set(names)
+        versions = {}
+
+        for name_ in names:
+            if name_.startswith('.'):
+                continue
+
+            path = os.path.join(family_path, name_)
+            if not os.path.isdir(path):
+                continue
+
+            filepath, _ = self._find_file(path)
+
+            # compact form of (filename, ignored, building)
+            versions[name_] = [
+                os.path.basename(filepath) if filepath else None,
+                (self.ignore_prefix + name_) in names_set,
+                (self.building_prefix + name_) in names_set
+            ]
+
+        filepath, _ = self._find_file(family_path)
+
+        entry = {
+            "mtime": mtime,
+            "file": os.path.basename(filepath) if filepath else None,
+            "versions": versions
+        }
+
+        entry["latest"] = self._create_index_latest_entry(name, entry)
+        return entry
+
+    def _create_index_latest_entry(self, name, entry):
+        # Records the requirements of the latest package in the family. Returns
+        # None if the package cannot be loaded - the family then isn't
+        # available to `get_indexed_requires`
+        from rez.packages import Package
+
+        try:
+            version = self._get_indexed_latest_version(entry)
+        except VersionError:
+            return None
+
+        if version is None:
+            return {
+                "version": None,
+                "requires": [],
+                "build_requires": [],
+                "private_build_requires": []
+            }
+
+        version_str = str(version)
+        variables = {"version": version_str} if version_str else {}
+        resource = self.get_resource(
+            FileSystemPackageResource.key,
+            location=self.location,
+            name=name,
+            **variables)
+
+        keys = ("requires", "build_requires", "private_build_requires")
+        requires = dict((key, set()) for key in keys)
+
+        try:
+            for variant in Package(resource).iter_variants():
+                for key in keys:
+                    for req in (getattr(variant, key) or []):
+                        if not req.conflict:
+                            requires[key].add(req.name)
+        except (ResourceError, PackageMetadataError) as e:
+            debug_print("Not indexing requirements of %s-%s: %s",
+                        name, version_str, e)
+            return None
+
+        latest = dict((key, sorted(value)) for key, value in requires.items())
+        latest["version"] = version_str
+        return latest
+
     def _create_family(self, name):
         path = os.path.join(self.location, name)
         if not os.path.exists(path):
@@ -1502,6 +1857,15 @@ class FileSystemPackageRepository(PackageRepository):
         # clear internal caches, otherwise change may not be visible
         self.clear_caches()
 
+        # keep the package index up to date, if there is one. Failing to do so
+        # is not an error - the now stale index entry is just not used
+        if os.path.exists(self.index_filepath):
+            try:
+                self.update_package_index([pkg_name])
+            except (IOError, OSError) as e:
+                print_warning("Could not update package index %r: %s",
+                              self.index_filepath, e)
+
     def _delete_stale_build_tagfiles(self, family_path):
         now = time.time()
 